@@ -0,0 +1,118 @@
+"""Initial schema
+
+Creates the tables as they existed before migrations moved to Alembic. Databases that
+were created by the old create_all() call at startup already have them, so each table
+is only created when missing and the later revisions bring it up to date.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    def create(name, *columns):
+        if name not in existing:
+            op.create_table(name, *columns)
+
+    create(
+        'startups',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('industry', sa.String(100)),
+        sa.Column('stage', sa.String(50)),
+        sa.Column('website_url', sa.String(200)),
+        sa.Column('target_market', sa.String(200)),
+        sa.Column('revenue_arr', sa.String(100)),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    create(
+        'skills',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('name', sa.String(100), unique=True, nullable=False),
+        sa.Column('category', sa.String(50)),
+        sa.Column('description', sa.Text()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    create(
+        'hobbies',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('name', sa.String(100), unique=True, nullable=False),
+        sa.Column('category', sa.String(50)),
+        sa.Column('description', sa.Text()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    create(
+        'founders',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('email', sa.String(100), unique=True, nullable=False),
+        sa.Column('bio', sa.Text()),
+        sa.Column('location', sa.String(100)),
+        sa.Column('linkedin_url', sa.String(200), nullable=False),
+        sa.Column('twitter_url', sa.String(200)),
+        sa.Column('github_url', sa.String(200)),
+        sa.Column('profile_image_url', sa.String(500)),
+        sa.Column('profile_visible', sa.Boolean(), nullable=False),
+        sa.Column('auth0_user_id', sa.String(100), unique=True, nullable=True),
+        sa.Column('startup_id', sa.Integer(), sa.ForeignKey('startups.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    create(
+        'founder_skills',
+        sa.Column('founder_id', sa.Integer(), sa.ForeignKey('founders.id'), primary_key=True),
+        sa.Column('skill_id', sa.Integer(), sa.ForeignKey('skills.id'), primary_key=True),
+    )
+    create(
+        'founder_hobbies',
+        sa.Column('founder_id', sa.Integer(), sa.ForeignKey('founders.id'), primary_key=True),
+        sa.Column('hobby_id', sa.Integer(), sa.ForeignKey('hobbies.id'), primary_key=True),
+    )
+    create(
+        'help_requests',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('founder_id', sa.Integer(), sa.ForeignKey('founders.id'), nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(50)),
+        sa.Column('urgency', sa.String(20)),
+        sa.Column('status', sa.String(20)),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    create(
+        'events',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('date_time', sa.DateTime(), nullable=False),
+        sa.Column('location', sa.String(200)),
+        sa.Column('attendees', sa.Text()),
+        sa.Column('theme', sa.String(50)),
+        sa.Column('link', sa.String(500)),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    for table in ['events', 'help_requests', 'founder_hobbies', 'founder_skills',
+                  'founders', 'hobbies', 'skills', 'startups']:
+        op.drop_table(table)
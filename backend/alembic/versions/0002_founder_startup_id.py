@@ -0,0 +1,54 @@
+"""Move founder/startup links from startup_founders to founders.startup_id
+
+Port of migrate_startup_relationship.py. Founders with several startups keep the
+lowest startup id. Only does anything on databases that still have startup_founders.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'startup_founders' not in inspector.get_table_names():
+        return
+
+    if 'startup_id' not in [col['name'] for col in inspector.get_columns('founders')]:
+        with op.batch_alter_table('founders') as batch_op:
+            batch_op.add_column(sa.Column('startup_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_founders_startup_id', 'startups', ['startup_id'], ['id'])
+
+    # One set-based UPDATE instead of a round trip per founder
+    op.execute("""
+        UPDATE founders SET startup_id = (
+            SELECT MIN(sf.startup_id) FROM startup_founders sf WHERE sf.founder_id = founders.id
+        )
+        WHERE startup_id IS NULL
+          AND EXISTS (SELECT 1 FROM startup_founders sf WHERE sf.founder_id = founders.id)
+    """)
+    op.drop_table('startup_founders')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'startup_founders',
+        sa.Column('founder_id', sa.Integer(), sa.ForeignKey('founders.id'), primary_key=True),
+        sa.Column('startup_id', sa.Integer(), sa.ForeignKey('startups.id'), primary_key=True),
+    )
+    op.execute("""
+        INSERT INTO startup_founders (founder_id, startup_id)
+        SELECT id, startup_id FROM founders WHERE startup_id IS NOT NULL
+    """)
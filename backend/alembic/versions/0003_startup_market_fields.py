@@ -0,0 +1,48 @@
+"""Replace startups.team_size/location with target_market/revenue_arr
+
+Port of migrate_startup_fields.py. Uses batch mode, so SQLite rebuilds the table
+once while Postgres gets plain ALTER TABLE statements. Only touches the columns
+that still differ from the current model.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = [col['name'] for col in sa.inspect(op.get_bind()).get_columns('startups')]
+    to_drop = [name for name in ('team_size', 'location') if name in columns]
+    to_add = [
+        sa.Column(name, sa.String(length))
+        for name, length in (('target_market', 200), ('revenue_arr', 100))
+        if name not in columns
+    ]
+    if not to_drop and not to_add:
+        return
+
+    with op.batch_alter_table('startups') as batch_op:
+        for name in to_drop:
+            batch_op.drop_column(name)
+        for column in to_add:
+            batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('startups') as batch_op:
+        batch_op.drop_column('revenue_arr')
+        batch_op.drop_column('target_market')
+        batch_op.add_column(sa.Column('location', sa.String(100)))
+        batch_op.add_column(sa.Column('team_size', sa.String(50)))
@@ -0,0 +1,42 @@
+"""Make founders.linkedin_url NOT NULL
+
+Port of migrate_linkedin_not_null.py. Founders without a LinkedIn URL are removed
+first, together with their skill/hobby links and help requests, then the column is
+altered in batch mode. Skipped when the column is already NOT NULL.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MISSING_LINKEDIN = "SELECT id FROM founders WHERE linkedin_url IS NULL OR linkedin_url = ''"
+
+
+def upgrade() -> None:
+    columns = {col['name']: col for col in sa.inspect(op.get_bind()).get_columns('founders')}
+    if not columns['linkedin_url']['nullable']:
+        return
+
+    for table in ('founder_skills', 'founder_hobbies', 'help_requests'):
+        op.execute(f"DELETE FROM {table} WHERE founder_id IN ({MISSING_LINKEDIN})")
+    op.execute("DELETE FROM founders WHERE linkedin_url IS NULL OR linkedin_url = ''")
+
+    with op.batch_alter_table('founders') as batch_op:
+        batch_op.alter_column('linkedin_url', existing_type=sa.String(200), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('founders') as batch_op:
+        batch_op.alter_column('linkedin_url', existing_type=sa.String(200), nullable=True)
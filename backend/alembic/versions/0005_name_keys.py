@@ -0,0 +1,86 @@
+"""Add normalized name_key columns to skills, hobbies and startups
+
+Port of migrate_name_keys.py. Case/spacing variants that share a key are merged into
+the oldest row (founder links are repointed first), then name_key is backfilled and
+gets a unique index.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models import normalize_name_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> how founders reference it: (link table, link column) or (None, founders column)
+NAME_KEY_TABLES = {
+    'skills': ('founder_skills', 'skill_id'),
+    'hobbies': ('founder_hobbies', 'hobby_id'),
+    'startups': (None, 'startup_id'),
+}
+
+
+def merge_duplicates(conn, table: str, groups: dict) -> None:
+    """Merge rows whose names share a key into the lowest id."""
+    link_table, link_column = NAME_KEY_TABLES[table]
+    for ids in groups.values():
+        if len(ids) < 2:
+            continue
+        keep, dupes = min(ids), sorted(ids)[1:]
+        params = {'keep': keep, 'dupes': dupes}
+        in_dupes = sa.bindparam('dupes', expanding=True)
+
+        if link_table:
+            conn.execute(sa.text(f"""
+                INSERT INTO {link_table} (founder_id, {link_column})
+                SELECT DISTINCT founder_id, :keep FROM {link_table}
+                WHERE {link_column} IN :dupes
+                  AND founder_id NOT IN (SELECT founder_id FROM {link_table} WHERE {link_column} = :keep)
+            """).bindparams(in_dupes), params)
+            conn.execute(sa.text(f"DELETE FROM {link_table} WHERE {link_column} IN :dupes").bindparams(in_dupes), params)
+        else:
+            conn.execute(sa.text(f"UPDATE founders SET {link_column} = :keep WHERE {link_column} IN :dupes").bindparams(in_dupes), params)
+
+        conn.execute(sa.text(f"DELETE FROM {table} WHERE id IN :dupes").bindparams(in_dupes), params)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    for table in NAME_KEY_TABLES:
+        columns = [col['name'] for col in inspector.get_columns(table)]
+        if 'name_key' not in columns:
+            op.add_column(table, sa.Column('name_key', sa.String(100), nullable=True))
+
+        groups = defaultdict(list)
+        for row_id, name in conn.execute(sa.text(f"SELECT id, name FROM {table}")):
+            groups[normalize_name_key(name)].append(row_id)
+        merge_duplicates(conn, table, groups)
+
+        keys = [{'id': min(ids), 'name_key': key} for key, ids in groups.items()]
+        if keys:
+            conn.execute(sa.text(f"UPDATE {table} SET name_key = :name_key WHERE id = :id"), keys)
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('name_key', existing_type=sa.String(100), nullable=False)
+        op.create_index(f'ix_{table}_name_key', table, ['name_key'], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table in NAME_KEY_TABLES:
+        op.drop_index(f'ix_{table}_name_key', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('name_key')
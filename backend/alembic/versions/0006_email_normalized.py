@@ -0,0 +1,54 @@
+"""Add founders.email_normalized with a unique index
+
+Port of migrate_email_normalized.py. Fails if two founders' emails differ only by
+case or whitespace, since those are separate profiles that must be merged by hand.
+On Postgres the unique index is built concurrently.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 09:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    collisions = conn.execute(sa.text("""
+        SELECT LOWER(TRIM(email)), COUNT(*) FROM founders
+        GROUP BY LOWER(TRIM(email)) HAVING COUNT(*) > 1
+    """)).fetchall()
+    if collisions:
+        details = ", ".join(f"{email_key} ({count} profiles)" for email_key, count in collisions)
+        raise RuntimeError(f"Founders share an email that differs only by case; merge them first: {details}")
+
+    columns = [col['name'] for col in sa.inspect(conn).get_columns('founders')]
+    if 'email_normalized' not in columns:
+        op.add_column('founders', sa.Column('email_normalized', sa.String(100), nullable=True))
+
+    op.execute("""
+        UPDATE founders SET email_normalized = LOWER(TRIM(email))
+        WHERE email_normalized IS NULL OR email_normalized <> LOWER(TRIM(email))
+    """)
+    with op.batch_alter_table('founders') as batch_op:
+        batch_op.alter_column('email_normalized', existing_type=sa.String(100), nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_founders_email_normalized', 'founders', ['email_normalized'],
+                        unique=True, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_founders_email_normalized', table_name='founders')
+    with op.batch_alter_table('founders') as batch_op:
+        batch_op.drop_column('email_normalized')
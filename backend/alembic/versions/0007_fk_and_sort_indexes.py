@@ -0,0 +1,56 @@
+"""Index foreign keys and sort columns used by crud queries
+
+Port of migrate_indexes.py. Postgres builds each index with CREATE INDEX CONCURRENTLY
+outside the migration transaction so the tables stay writable.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column)
+INDEXES = [
+    ('ix_founders_startup_id', 'founders', 'startup_id'),
+    ('ix_founders_profile_visible', 'founders', 'profile_visible'),
+    ('ix_help_requests_founder_id', 'help_requests', 'founder_id'),
+    ('ix_founder_skills_skill_id', 'founder_skills', 'skill_id'),
+    ('ix_founder_hobbies_hobby_id', 'founder_hobbies', 'hobby_id'),
+    ('ix_startups_created_at', 'startups', 'created_at'),
+    ('ix_events_date_time', 'events', 'date_time'),
+]
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    with op.get_context().autocommit_block():
+        for index_name, table, column in INDEXES:
+            if is_postgres:
+                # An interrupted concurrent build leaves an INVALID index behind; rebuild it
+                op.execute(sa.text(f"""
+                    DO $$ BEGIN
+                        IF EXISTS (SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                                   WHERE c.relname = '{index_name}' AND NOT i.indisvalid) THEN
+                            DROP INDEX {index_name};
+                        END IF;
+                    END $$;
+                """))
+            op.create_index(index_name, table, [column], if_not_exists=True, postgresql_concurrently=True)
+            op.execute(sa.text(f"ANALYZE {table}"))
+
+
+def downgrade() -> None:
+    for index_name, table, _ in INDEXES:
+        op.drop_index(index_name, table_name=table)
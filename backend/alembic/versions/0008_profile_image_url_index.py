@@ -0,0 +1,31 @@
+"""Index founders.profile_image_url
+
+Uploads are content-addressed and shared between founders, so releasing an image
+counts the founders that still reference its URL.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_founders_profile_image_url', 'founders', ['profile_image_url'],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_founders_profile_image_url', table_name='founders')
@@ -0,0 +1,47 @@
+"""Add the stored_images manifest
+
+One row per original in the upload store with its size, hash and how many founders
+reference it. Existing uploads are added by scripts/rebuild_image_manifest.py, since
+the store may be an S3 bucket that migrations cannot list.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'stored_images' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'stored_images',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('filename', sa.String(255), nullable=False),
+        sa.Column('url', sa.String(500), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(64)),
+        sa.Column('content_type', sa.String(100)),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('uploaded_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('orphaned_at', sa.DateTime()),
+    )
+    op.create_index('ix_stored_images_id', 'stored_images', ['id'])
+    op.create_index('ix_stored_images_filename', 'stored_images', ['filename'], unique=True)
+    op.create_index('ix_stored_images_url', 'stored_images', ['url'], unique=True)
+    op.create_index('ix_stored_images_orphaned_at', 'stored_images', ['orphaned_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('stored_images')
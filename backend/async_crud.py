@@ -0,0 +1,65 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+import models, tracing
+
+# Async sessions cannot lazy-load, so everything schemas.Founder serializes is loaded up front
+FOUNDER_LOAD_OPTIONS = (
+    selectinload(models.Founder.skills),
+    selectinload(models.Founder.hobbies),
+    selectinload(models.Founder.help_requests),
+    selectinload(models.Founder.startup),
+)
+
+# =========================
+# Founder reads
+# =========================
+
+async def get_founder(db: AsyncSession, founder_id: int) -> Optional[models.Founder]:
+    result = await db.execute(
+        select(models.Founder).options(*FOUNDER_LOAD_OPTIONS).where(models.Founder.id == founder_id)
+    )
+    return result.scalars().first()
+
+async def get_founders(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Founder]:
+    result = await db.execute(
+        select(models.Founder).options(*FOUNDER_LOAD_OPTIONS).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_founders_by_startup_id(db: AsyncSession, startup_id: int) -> List[models.Founder]:
+    """Get all founders associated with a specific startup."""
+    result = await db.execute(
+        select(models.Founder).options(*FOUNDER_LOAD_OPTIONS).where(models.Founder.startup_id == startup_id)
+    )
+    return result.scalars().all()
+
+# =========================
+# Startup / skill / hobby / event reads
+# =========================
+
+async def get_startup(db: AsyncSession, startup_id: int) -> Optional[models.Startup]:
+    result = await db.execute(select(models.Startup).where(models.Startup.id == startup_id))
+    return result.scalars().first()
+
+async def get_startups(db: AsyncSession, skip: int = 0, limit: int = 1000) -> List[models.Startup]:
+    result = await db.execute(
+        select(models.Startup).order_by(models.Startup.created_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_skills(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Skill]:
+    result = await db.execute(select(models.Skill).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_hobbies(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Hobby]:
+    result = await db.execute(select(models.Hobby).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_events(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Event]:
+    result = await db.execute(select(models.Event).offset(skip).limit(limit))
+    return result.scalars().all()
+
+# One span per crud call when tracing is enabled
+tracing.instrument_module(__name__)
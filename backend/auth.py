@@ -6,12 +6,16 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 import requests
 from dotenv import load_dotenv
+import tracing
 
 load_dotenv()
 
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN", "dev-example.auth0.com")
 AUTH0_AUDIENCE = os.getenv("AUTH0_AUDIENCE", "http://localhost:8000")
 AUTH0_ALGORITHMS = os.getenv("AUTH0_ALGORITHMS", "RS256").split(",")
+# Tenant URL for JWKS, issuer and /userinfo; AUTH0_DOMAIN may carry its own scheme (e.g. a local
+# http:// stand-in for load tests, see benchmarks/auth0_stub.py)
+AUTH0_BASE_URL = (AUTH0_DOMAIN if "://" in AUTH0_DOMAIN else f"https://{AUTH0_DOMAIN}").rstrip("/")
 
 # Hardcoded list of admin emails
 ADMIN_EMAILS = [
@@ -24,14 +28,15 @@ security = HTTPBearer()
 
 class Auth0JWTBearer:
     def __init__(self):
-        self.jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
+        self.jwks_url = f"{AUTH0_BASE_URL}/.well-known/jwks.json"
         self.algorithms = AUTH0_ALGORITHMS
         self.audience = AUTH0_AUDIENCE
-        self.issuer = f"https://{AUTH0_DOMAIN}/"
+        self.issuer = f"{AUTH0_BASE_URL}/"
 
     def get_signing_key(self, token: str) -> dict:
         try:
-            jwks = requests.get(self.jwks_url).json()
+            with tracing.span("auth.jwks_fetch", {"http.method": "GET", "http.url": self.jwks_url}, kind=tracing.SPAN_KIND_CLIENT):
+                jwks = requests.get(self.jwks_url).json()
             unverified_header = jwt.get_unverified_header(token)
             
             for key in jwks["keys"]:
@@ -50,6 +55,7 @@ class Auth0JWTBearer:
         except Exception as e:
             raise HTTPException(status_code=401, detail=f"Unable to parse authentication token: {str(e)}")
 
+    @tracing.traced(name="auth.verify_jwt")
     def verify_jwt(self, token: str) -> dict:
         try:
             signing_key = self.get_signing_key(token)
@@ -78,9 +84,10 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     # If email is not in JWT payload, fetch it from userinfo endpoint
     if 'email' not in payload:
         try:
-            userinfo_url = f"https://{AUTH0_DOMAIN}/userinfo"
+            userinfo_url = f"{AUTH0_BASE_URL}/userinfo"
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.get(userinfo_url, headers=headers)
+            with tracing.span("auth.userinfo_fetch", {"http.method": "GET", "http.url": userinfo_url}, kind=tracing.SPAN_KIND_CLIENT):
+                response = requests.get(userinfo_url, headers=headers)
             if response.status_code == 200:
                 userinfo = response.json()
                 payload['email'] = userinfo.get('email', '')
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Query plan audit for the crud layer.
+
+Runs the filtered/sorted crud reads (and the relationship loads the Founder response
+triggers) against a small seeded database, captures every SELECT they emit, and EXPLAINs it.
+Exits non-zero if any of them falls back to a full table scan; tests/test_query_plans.py runs the
+same audit against SQLite as part of the test suite.
+
+Usage:
+    python check_query_plans.py                      # scratch SQLite file
+    DATABASE_URL=postgresql://... python check_query_plans.py   # scratch Postgres DB (tables are created)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+import models, crud
+
+# Unfiltered list queries are expected to scan; everything else must use an index
+ALLOWED_SCANS = {"get_founders", "get_skills", "get_hobbies", "get_help_requests", "get_events"}
+
+def seed(db):
+    """Insert a handful of related rows so every query has something to plan against."""
+    startup = models.Startup(name="Plan Check Startup")
+    skill = models.Skill(name="Plan Check Skill")
+    hobby = models.Hobby(name="Plan Check Hobby")
+    founder = models.Founder(
+        name="Plan Check", email="plan.check@example.com", linkedin_url="https://linkedin.com/in/plan-check",
+        auth0_user_id="auth0|plan-check", startup=startup, skills=[skill], hobbies=[hobby],
+    )
+    db.add_all([startup, skill, hobby, founder])
+    db.flush()
+    db.add(models.HelpRequest(founder_id=founder.id, title="Plan", description="Check"))
+    db.add(models.Event(title="Plan Check", date_time=datetime(2030, 1, 1)))
+    db.commit()
+    return founder, startup, skill
+
+def crud_calls(founder, startup, skill):
+    """(label, callable(db)) pairs covering the crud reads that filter or sort."""
+    def load_founder_graph(db):
+        f = crud.get_founder(db, founder.id)
+        f.skills, f.hobbies, f.help_requests, f.startup
+
+    def load_skill_founders(db):
+        crud.get_skill(db, skill.id).founders
+
+    return [
+        ("get_founder", lambda db: crud.get_founder(db, founder.id)),
+        ("get_founders", lambda db: crud.get_founders(db)),
+        ("founder relationships", load_founder_graph),
+        ("skill.founders", load_skill_founders),
+        ("get_founder_by_email", lambda db: crud.get_founder_by_email(db, "PLAN.CHECK@example.com")),
+        ("get_unclaimed_founder_by_email", lambda db: crud.get_unclaimed_founder_by_email(db, "plan.check@example.com")),
+        ("get_founder_by_auth0_user_id", lambda db: crud.get_founder_by_auth0_user_id(db, "auth0|plan-check")),
+        ("get_founders_by_startup_id", lambda db: crud.get_founders_by_startup_id(db, startup.id)),
+        ("count_founders_with_image_url", lambda db: crud.count_founders_with_image_url(db, "/uploads/plan-check.jpg")),
+        ("get_startups", lambda db: crud.get_startups(db)),
+        ("get_startup", lambda db: crud.get_startup(db, startup.id)),
+        ("get_or_create_skill_id", lambda db: crud.get_or_create_skill_id(db, " plan check SKILL ")),
+        ("get_or_create_hobby_id", lambda db: crud.get_or_create_hobby_id(db, "plan check hobby")),
+        ("get_or_create_startup_id", lambda db: crud.get_or_create_startup_id(db, "plan check startup", {})),
+        ("get_stored_image_by_url", lambda db: crud.get_stored_image_by_url(db, "/uploads/plan-check.jpg")),
+        ("get_orphaned_images", lambda db: crud.get_orphaned_images(db, datetime.utcnow() - timedelta(hours=1))),
+        ("get_stored_images_page", lambda db: crud.get_stored_images_page(db, after="a")),
+        ("get_help_requests", lambda db: crud.get_help_requests(db)),
+        ("get_events", lambda db: crud.get_events(db)),
+    ]
+
+def full_scans(conn, statement, parameters) -> list:
+    """Return the plan lines that indicate a full table scan."""
+    if conn.dialect.name == "postgresql":
+        plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+        return [row[0] for row in plan if "Seq Scan" in row[0]]
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in plan if row[-1].startswith("SCAN") and " USING " not in row[-1]]
+
+def audit(engine) -> list:
+    """Seed the database behind engine, run every crud call and EXPLAIN what it emits.
+
+    Returns (label, statement, scan plan lines, allowed) for each SELECT.
+    """
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    results = []
+    try:
+        founder, startup, skill = seed(db)
+        crud.clear_name_cache()
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                # Small tables always favour a seq scan; make the planner show whether an index is usable
+                conn.execute(text("SET enable_seqscan = off"))
+            for label, call in crud_calls(founder, startup, skill):
+                db.expire_all()
+                captured.clear()
+                call(db)
+                for statement, parameters in list(captured):
+                    scans = full_scans(conn, statement, parameters)
+                    results.append((label, statement, scans, label in ALLOWED_SCANS))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+        db.close()
+    return results
+
+def unexpected_scans(results) -> list:
+    return [result for result in results if result[2] and not result[3]]
+
+def main():
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url or database_url.startswith("sqlite"):
+        database_url = f"sqlite:///{tempfile.mkdtemp()}/query_plans.db"
+
+    results = audit(create_engine(database_url))
+    for label, statement, scans, allowed in results:
+        if scans and not allowed:
+            print(f"FULL SCAN  {label}: {'; '.join(scans)}\n    {' '.join(statement.split())}")
+        else:
+            print(f"ok         {label}")
+
+    failures = len(unexpected_scans(results))
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} fell back to a full table scan")
+        sys.exit(1)
+    print("\nAll filtered crud queries use an index")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 import csv
 import io
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import and_, delete, exists, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Union
-import models, schemas
+import models, schemas, tracing
 
 # =========================
 # Founder CRUD operations
@@ -24,6 +30,8 @@ def create_founder(db: Session, founder: schemas.FounderCreate):
     )
     
     db.add(db_founder)
+    db.flush()
+    sync_image_refs(db, db_founder.profile_image_url)
     db.commit()
     db.refresh(db_founder)
     
@@ -52,6 +60,7 @@ def get_founders(db: Session, skip: int = 0, limit: int = 100):
 def update_founder(db: Session, founder_id: int, founder: schemas.FounderCreate):
     db_founder = db.query(models.Founder).filter(models.Founder.id == founder_id).first()
     if db_founder:
+        previous_image_url = db_founder.profile_image_url
         for key, value in founder.model_dump(exclude={'skill_ids', 'startup_id', 'hobby_ids'}).items():
             if value is not None:
                 setattr(db_founder, key, value)
@@ -76,6 +85,9 @@ def update_founder(db: Session, founder_id: int, founder: schemas.FounderCreate)
             else:
                 db_founder.hobbies = []
         
+        if db_founder.profile_image_url != previous_image_url:
+            db.flush()
+            sync_image_refs(db, previous_image_url, db_founder.profile_image_url)
         db.commit()
         db.refresh(db_founder)
     return db_founder
@@ -84,6 +96,8 @@ def delete_founder(db: Session, founder_id: int):
     db_founder = db.query(models.Founder).filter(models.Founder.id == founder_id).first()
     if db_founder:
         db.delete(db_founder)
+        db.flush()
+        sync_image_refs(db, db_founder.profile_image_url)
         db.commit()
     return db_founder
 
@@ -95,10 +109,16 @@ def get_founder_by_auth0_user_id(db: Session, auth0_user_id: str):
     """Get founder profile by Auth0 user ID (for claimed profiles)."""
     return db.query(models.Founder).filter(models.Founder.auth0_user_id == auth0_user_id).first()
 
+def get_founder_by_email(db: Session, email: str):
+    """Get founder profile by email (case-insensitive, via the email_normalized index)."""
+    return db.query(models.Founder).filter(
+        models.Founder.email_normalized == models.normalize_email(email)
+    ).first()
+
 def get_unclaimed_founder_by_email(db: Session, email: str):
     """Get unclaimed founder profile by email."""
     return db.query(models.Founder).filter(
-        models.Founder.email.ilike(email),
+        models.Founder.email_normalized == models.normalize_email(email),
         models.Founder.auth0_user_id.is_(None)
     ).first()
 
@@ -115,6 +135,10 @@ def get_founders_by_startup_id(db: Session, startup_id: int):
     """Get all founders associated with a specific startup."""
     return db.query(models.Founder).filter(models.Founder.startup_id == startup_id).all()
 
+def count_founders_with_image_url(db: Session, url: str) -> int:
+    """Number of founders whose profile points at this image URL (uploads are shared after dedup)."""
+    return db.query(func.count(models.Founder.id)).filter(models.Founder.profile_image_url == url).scalar()
+
 # =========================
 # CSV helpers / import
 # =========================
@@ -151,39 +175,233 @@ def extract_linkedin_url(row: Dict[str, str]) -> str:
             return normalize_url(v)
     return ""
 
+# =========================
+# Name -> id lookup cache
+# =========================
+
+# Process-wide cache of (table, name_key) -> id for skills, hobbies and startups.
+# Entries expire so ids deleted by another process are eventually re-resolved.
+NAME_CACHE_TTL_SECONDS = 300
+_name_id_cache: Dict[tuple, tuple] = {}
+_name_id_cache_lock = threading.Lock()
+
+def _cache_get_id(model, key: str) -> Optional[int]:
+    entry = _name_id_cache.get((model.__tablename__, key))
+    if entry is None or entry[1] < time.monotonic():
+        return None
+    return entry[0]
+
+def _cache_set_id(model, key: str, obj_id: int):
+    with _name_id_cache_lock:
+        _name_id_cache[(model.__tablename__, key)] = (obj_id, time.monotonic() + NAME_CACHE_TTL_SECONDS)
+
+def _cache_forget(model, *names: str):
+    with _name_id_cache_lock:
+        for name in names:
+            _name_id_cache.pop((model.__tablename__, models.normalize_name_key(name)), None)
+
+def clear_name_cache():
+    with _name_id_cache_lock:
+        _name_id_cache.clear()
+
+class DuplicateNameError(ValueError):
+    """A skill/hobby/startup name matches an existing row's name_key (case/whitespace-insensitive)."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        super().__init__(f"A {type(existing).__name__.lower()} named '{existing.name}' already exists (id {existing.id})")
+
+def _commit_named(db: Session, obj):
+    """Commit a new or renamed skill/hobby/startup; DuplicateNameError if the name is taken."""
+    model, key, obj_id = type(obj), obj.name_key, obj.id
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        query = db.query(model).filter(model.name_key == key)
+        if obj_id is not None:
+            query = query.filter(model.id != obj_id)
+        existing = query.first()
+        if existing is None:
+            raise
+        raise DuplicateNameError(existing)
+
+def _get_or_create_id(db: Session, model, name: str, create) -> int:
+    """Resolve a skill/hobby/startup id by normalized name, creating the row if needed."""
+    key = models.normalize_name_key(name)
+    obj_id = _cache_get_id(model, key)
+    if obj_id is not None:
+        return obj_id
+
+    obj = db.query(model).filter(model.name_key == key).first()
+    if not obj:
+        try:
+            obj = create()
+        except DuplicateNameError as e:
+            # Another request created the same name first
+            obj = e.existing
+    _cache_set_id(model, key, obj.id)
+    return obj.id
+
+def get_or_create_skill_id(db: Session, skill_name: str) -> int:
+    return _get_or_create_id(
+        db, models.Skill, skill_name,
+        lambda: create_skill(db, schemas.SkillCreate(name=skill_name.strip())),
+    )
+
+def get_or_create_hobby_id(db: Session, hobby_name: str) -> int:
+    return _get_or_create_id(
+        db, models.Hobby, hobby_name,
+        lambda: create_hobby(db, schemas.HobbyCreate(name=hobby_name.strip())),
+    )
+
+def get_or_create_startup_id(db: Session, startup_name: str, startup_details: Dict) -> int:
+    return _get_or_create_id(
+        db, models.Startup, startup_name,
+        lambda: create_startup(db, schemas.StartupCreate(**startup_details)),
+    )
+
 def get_or_create_skill(db: Session, skill_name: str) -> models.Skill:
     """Helper function to get a skill by name or create it if it doesn't exist."""
-    skill = db.query(models.Skill).filter(models.Skill.name.ilike(skill_name.strip())).first()
-    if not skill:
-        skill_schema = schemas.SkillCreate(name=skill_name.strip())
-        skill = create_skill(db, skill_schema)
-    return skill
+    return db.get(models.Skill, get_or_create_skill_id(db, skill_name))
 
 def get_or_create_hobby(db: Session, hobby_name: str) -> models.Hobby:
     """Helper function to get a hobby by name or create it if it doesn't exist."""
-    hobby = db.query(models.Hobby).filter(models.Hobby.name.ilike(hobby_name.strip())).first()
-    if not hobby:
-        hobby_schema = schemas.HobbyCreate(name=hobby_name.strip())
-        hobby = create_hobby(db, hobby_schema)
-    return hobby
+    return db.get(models.Hobby, get_or_create_hobby_id(db, hobby_name))
 
 def get_or_create_startup(db: Session, startup_name: str, startup_details: Dict) -> models.Startup:
     """Helper function to get a startup by name or create it if it doesn't exist."""
-    startup = db.query(models.Startup).filter(models.Startup.name.ilike(startup_name.strip())).first()
-    if not startup:
-        startup_schema = schemas.StartupCreate(**startup_details)
-        startup = create_startup(db, startup_schema)
-    return startup
+    return db.get(models.Startup, get_or_create_startup_id(db, startup_name, startup_details))
+
+# Founder columns a CSV row can set; everything else is left untouched on upsert
+FOUNDER_CSV_COLUMNS = ("name", "location", "linkedin_url", "twitter_url", "startup_id")
+UPSERT_BATCH_SIZE = 500
+CSV_IMPORT_MODES = ("create", "upsert")
+
+def _chunks(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _dialect_insert(db: Session):
+    """Return the dialect-specific insert() construct that supports ON CONFLICT."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Upsert is not supported for the '{dialect}' dialect")
+
+def _merge_links(db: Session, insert, table, column: str, founder_links: Dict[int, List[int]]) -> set:
+    """Add missing (founder, skill/hobby) links, never removing existing ones. Returns founder ids that gained links."""
+    founder_ids = list(founder_links)
+    existing = set()
+    for chunk in _chunks(founder_ids, UPSERT_BATCH_SIZE):
+        existing.update(db.execute(
+            select(table.c.founder_id, table.c[column]).where(table.c.founder_id.in_(chunk))
+        ).all())
+
+    new_links = [
+        {"founder_id": founder_id, column: link_id}
+        for founder_id, link_ids in founder_links.items()
+        for link_id in link_ids
+        if (founder_id, link_id) not in existing
+    ]
+    if new_links:
+        db.execute(insert(table).on_conflict_do_nothing(), new_links)
+    return {link["founder_id"] for link in new_links}
+
+def upsert_founders(db: Session, rows: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Insert or update founders in one pass with INSERT ... ON CONFLICT (email_normalized) DO UPDATE.
+    `rows` maps normalized email -> {"values": {...}, "skill_ids": [...], "hobby_ids": [...]}.
+    Empty CSV values never overwrite stored data, unchanged rows are not written,
+    and skill/hobby links are merged. Returns created/updated/unchanged counts.
+    """
+    insert = _dialect_insert(db)
+    founders = models.Founder.__table__
+
+    # Preload the current state of every founder referenced by the file
+    existing = {}
+    for chunk in _chunks(list(rows), UPSERT_BATCH_SIZE):
+        result = db.execute(
+            select(founders.c.id, founders.c.email_normalized, *[founders.c[c] for c in FOUNDER_CSV_COLUMNS])
+            .where(founders.c.email_normalized.in_(chunk))
+        )
+        for current in result.mappings():
+            existing[current["email_normalized"]] = current
+
+    to_write = []
+    changed_keys = set()
+    for key, row in rows.items():
+        values = row["values"]
+        current = existing.get(key)
+        if current is None:
+            values["name"] = values["name"] or ""
+            values["profile_visible"] = True
+            to_write.append(values)
+            continue
+        if any(values[c] is not None and values[c] != current[c] for c in FOUNDER_CSV_COLUMNS):
+            to_write.append(values)
+            changed_keys.add(key)
+
+    if to_write:
+        stmt = insert(founders)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[founders.c.email_normalized],
+            set_={
+                **{c: func.coalesce(excluded[c], founders.c[c]) for c in FOUNDER_CSV_COLUMNS},
+                "updated_at": func.now(),
+            },
+            where=or_(*[
+                and_(excluded[c].isnot(None), excluded[c].is_distinct_from(founders.c[c]))
+                for c in FOUNDER_CSV_COLUMNS
+            ]),
+        )
+        for chunk in _chunks(to_write, UPSERT_BATCH_SIZE):
+            db.execute(stmt, chunk)
+
+    # Resolve ids for new founders, then merge their skill/hobby links
+    ids = {key: current["id"] for key, current in existing.items()}
+    new_keys = [key for key in rows if key not in existing]
+    for chunk in _chunks(new_keys, UPSERT_BATCH_SIZE):
+        result = db.execute(
+            select(founders.c.id, founders.c.email_normalized).where(founders.c.email_normalized.in_(chunk))
+        )
+        for founder_id, email_normalized in result:
+            ids[email_normalized] = founder_id
+
+    linked_ids = _merge_links(
+        db, insert, models.founder_skills, "skill_id",
+        {ids[key]: row["skill_ids"] for key, row in rows.items() if row["skill_ids"]},
+    )
+    linked_ids |= _merge_links(
+        db, insert, models.founder_hobbies, "hobby_id",
+        {ids[key]: row["hobby_ids"] for key, row in rows.items() if row["hobby_ids"]},
+    )
+    db.commit()
 
-def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
+    updated = sum(1 for key in existing if key in rows and (key in changed_keys or ids[key] in linked_ids))
+    return {
+        "created": len(new_keys),
+        "updated": updated,
+        "unchanged": len(existing) - updated,
+    }
+
+def create_founders_from_csv(db: Session, csv_input: Union[bytes, str], mode: str = "create"):
     """
     Parses a CSV (bytes or decoded text) and creates founders, startups (optional), skills, and hobbies.
     - Startup is OPTIONAL
     - LinkedIn берётся из любой колонки с "linkedin" в названии или из любого значения, где встречается "linkedin.com"
     - На ошибке строки делаем db.rollback(), чтобы следующие строки продолжали создаваться
+    - mode="create" rejects existing emails; mode="upsert" updates them in a single bulk pass
     Returns a dict compatible with schemas.FounderUploadResponse.
     """
+    if mode not in CSV_IMPORT_MODES:
+        raise ValueError(f"Unknown import mode '{mode}'. Expected one of: {', '.join(CSV_IMPORT_MODES)}")
+
     created_founders = []
+    upsert_rows: Dict[str, Dict] = {}
     errors: List[str] = []
 
     # --- decode if needed ---
@@ -231,7 +449,7 @@ def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
             if not founder_email:
                 errors.append(f"Row {rownum}: '{COL_EMAIL}' is required.")
                 continue
-            if db.query(models.Founder).filter(models.Founder.email.ilike(founder_email)).first():
+            if mode == "create" and get_founder_by_email(db, founder_email):
                 errors.append(f"Row {rownum}: Founder with email '{founder_email}' already exists.")
                 continue
 
@@ -254,8 +472,7 @@ def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
                     "revenue_arr": row.get(COL_STARTUP_REVENUE, ""),
                     "website_url": row.get(COL_STARTUP_WEBSITE, ""),
                 }
-                startup = get_or_create_startup(db, startup_name, startup_data)
-                startup_id = startup.id
+                startup_id = get_or_create_startup_id(db, startup_name, startup_data)
 
             # --- Skills ---
             skill_ids: List[int] = []
@@ -264,20 +481,19 @@ def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
             all_skills = [s.strip() for s in (help_offered + "," + help_wanted).split(",") if s.strip()]
             seen = set()
             for sname in all_skills:
-                key = sname.lower()
+                key = models.normalize_name_key(sname)
                 if key in seen:
                     continue
                 seen.add(key)
-                skill = get_or_create_skill(db, sname)
-                skill_ids.append(skill.id)
+                skill_ids.append(get_or_create_skill_id(db, sname))
 
             # --- Hobbies ---
             hobby_ids: List[int] = []
             hobbies_str = row.get(COL_HOBBY, "")
             for hname in [h.strip() for h in hobbies_str.split(",") if h.strip()]:
-                hobby = get_or_create_hobby(db, hname)
-                if hobby.id not in hobby_ids:
-                    hobby_ids.append(hobby.id)
+                hobby_id = get_or_create_hobby_id(db, hname)
+                if hobby_id not in hobby_ids:
+                    hobby_ids.append(hobby_id)
 
             # --- Create founder ---
             founder_data = schemas.FounderCreate(
@@ -292,6 +508,20 @@ def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
                 profile_visible=True,
             )
 
+            if mode == "upsert":
+                # Later rows win when the same email appears twice in one file
+                email_normalized = models.normalize_email(founder_data.email)
+                upsert_rows[email_normalized] = {
+                    "values": {
+                        "email": founder_data.email,
+                        "email_normalized": email_normalized,
+                        **{c: getattr(founder_data, c) or None for c in FOUNDER_CSV_COLUMNS},
+                    },
+                    "skill_ids": skill_ids,
+                    "hobby_ids": hobby_ids,
+                }
+                continue
+
             created = create_founder(db, founder_data)
             created_founders.append(created)
 
@@ -299,6 +529,22 @@ def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
             db.rollback()  # критично: не блокируем следующие строки
             errors.append(f"Row {rownum}: Unexpected error - {e}")
 
+    if mode == "upsert":
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        if upsert_rows:
+            try:
+                counts = upsert_founders(db, upsert_rows)
+            except Exception as e:
+                db.rollback()
+                errors.append(f"Upsert failed: {e}")
+        return {
+            "message": f"Imported {counts['created']} founders, updated {counts['updated']}, unchanged {counts['unchanged']}",
+            "created_count": counts["created"],
+            "updated_count": counts["updated"],
+            "unchanged_count": counts["unchanged"],
+            "errors": errors,
+        }
+
     return {
         "message": f"Imported {len(created_founders)} founders",
         "created_count": len(created_founders),
@@ -312,7 +558,7 @@ def create_founders_from_csv(db: Session, csv_input: Union[bytes, str]):
 def create_skill(db: Session, skill: schemas.SkillCreate):
     db_skill = models.Skill(**skill.model_dump())
     db.add(db_skill)
-    db.commit()
+    _commit_named(db, db_skill)
     db.refresh(db_skill)
     return db_skill
 
@@ -325,17 +571,21 @@ def get_skills(db: Session, skip: int = 0, limit: int = 100):
 def update_skill(db: Session, skill_id: int, skill: schemas.SkillCreate):
     db_skill = db.query(models.Skill).filter(models.Skill.id == skill_id).first()
     if db_skill:
+        old_name = db_skill.name
         for key, value in skill.model_dump().items():
             setattr(db_skill, key, value)
-        db.commit()
+        _commit_named(db, db_skill)
         db.refresh(db_skill)
+        _cache_forget(models.Skill, old_name, db_skill.name)
     return db_skill
 
 def delete_skill(db: Session, skill_id: int):
     db_skill = db.query(models.Skill).filter(models.Skill.id == skill_id).first()
     if db_skill:
+        name = db_skill.name
         db.delete(db_skill)
         db.commit()
+        _cache_forget(models.Skill, name)
     return db_skill
 
 # =========================
@@ -345,7 +595,7 @@ def delete_skill(db: Session, skill_id: int):
 def create_startup(db: Session, startup: schemas.StartupCreate):
     db_startup = models.Startup(**startup.model_dump())
     db.add(db_startup)
-    db.commit()
+    _commit_named(db, db_startup)
     db.refresh(db_startup)
     return db_startup
 
@@ -358,17 +608,21 @@ def get_startups(db: Session, skip: int = 0, limit: int = 1000):
 def update_startup(db: Session, startup_id: int, startup: schemas.StartupCreate):
     db_startup = db.query(models.Startup).filter(models.Startup.id == startup_id).first()
     if db_startup:
+        old_name = db_startup.name
         for key, value in startup.model_dump().items():
             setattr(db_startup, key, value)
-        db.commit()
+        _commit_named(db, db_startup)
         db.refresh(db_startup)
+        _cache_forget(models.Startup, old_name, db_startup.name)
     return db_startup
 
 def delete_startup(db: Session, startup_id: int):
     db_startup = db.query(models.Startup).filter(models.Startup.id == startup_id).first()
     if db_startup:
+        name = db_startup.name
         db.delete(db_startup)
         db.commit()
+        _cache_forget(models.Startup, name)
     return db_startup
 
 # =========================
@@ -411,7 +665,7 @@ def delete_help_request(db: Session, help_request_id: int):
 def create_hobby(db: Session, hobby: schemas.HobbyCreate):
     db_hobby = models.Hobby(**hobby.model_dump())
     db.add(db_hobby)
-    db.commit()
+    _commit_named(db, db_hobby)
     db.refresh(db_hobby)
     return db_hobby
 
@@ -424,17 +678,21 @@ def get_hobbies(db: Session, skip: int = 0, limit: int = 100):
 def update_hobby(db: Session, hobby_id: int, hobby: schemas.HobbyCreate):
     db_hobby = db.query(models.Hobby).filter(models.Hobby.id == hobby_id).first()
     if db_hobby:
+        old_name = db_hobby.name
         for key, value in hobby.model_dump().items():
             setattr(db_hobby, key, value)
-        db.commit()
+        _commit_named(db, db_hobby)
         db.refresh(db_hobby)
+        _cache_forget(models.Hobby, old_name, db_hobby.name)
     return db_hobby
 
 def delete_hobby(db: Session, hobby_id: int):
     db_hobby = db.query(models.Hobby).filter(models.Hobby.id == hobby_id).first()
     if db_hobby:
+        name = db_hobby.name
         db.delete(db_hobby)
         db.commit()
+        _cache_forget(models.Hobby, name)
     return db_hobby
 
 # =========================
@@ -469,3 +727,100 @@ def delete_event(db: Session, event_id: int):
         db.delete(db_event)
         db.commit()
     return db_event
+
+# =========================
+# Stored image manifest
+# =========================
+
+def get_stored_image_by_url(db: Session, url: str):
+    return db.query(models.StoredImage).filter(models.StoredImage.url == url).first()
+
+def record_stored_image(db: Session, filename: str, url: str, size: int, sha256: Optional[str], content_type: Optional[str]):
+    """Add an upload to the manifest, or refresh uploaded_at when identical content is uploaded again."""
+    now = datetime.utcnow()
+    ref_count = count_founders_with_image_url(db, url)
+    insert = _dialect_insert(db)
+    stmt = insert(models.StoredImage).values(
+        filename=filename, url=url, size=size, sha256=sha256, content_type=content_type,
+        ref_count=ref_count, uploaded_at=now, orphaned_at=None if ref_count else now,
+    )
+    # Usually unreferenced until a profile is saved with it; the upload time restarts the GC grace period
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[models.StoredImage.filename],
+        set_={"uploaded_at": now},
+    ))
+    db.commit()
+
+def sync_image_refs(db: Session, *urls: Optional[str]):
+    """Recount founder references for the manifest rows behind these URLs (caller commits)."""
+    for url in {url for url in urls if url}:
+        image = get_stored_image_by_url(db, url)
+        if image is None:
+            continue
+        image.ref_count = count_founders_with_image_url(db, url)
+        if image.ref_count:
+            image.orphaned_at = None
+        elif image.orphaned_at is None:
+            image.orphaned_at = datetime.utcnow()
+
+def get_orphaned_images(db: Session, cutoff: datetime, limit: int = 100):
+    """Images unreferenced since before cutoff and not re-uploaded since, oldest first."""
+    return db.query(models.StoredImage).filter(
+        models.StoredImage.ref_count == 0,
+        models.StoredImage.orphaned_at < cutoff,
+        models.StoredImage.uploaded_at < cutoff,
+    ).order_by(models.StoredImage.orphaned_at).limit(limit).all()
+
+def delete_stored_image_if_orphaned(db: Session, image_id: int, uploaded_before: datetime) -> bool:
+    """Delete a manifest row only if it is still unreferenced and was not re-uploaded since
+    uploaded_before (caller commits after removing the files).
+
+    ref_count is checked against the founders table as well, since concurrent profile edits
+    can leave it at 0 for an image that is still in use.
+    """
+    still_referenced = exists().where(models.Founder.profile_image_url == models.StoredImage.url)
+    result = db.execute(delete(models.StoredImage).where(
+        models.StoredImage.id == image_id,
+        models.StoredImage.ref_count == 0,
+        models.StoredImage.uploaded_at < uploaded_before,
+        ~still_referenced,
+    ))
+    return result.rowcount == 1
+
+def get_stored_images_page(db: Session, after: str = "", limit: int = 100):
+    """Manifest rows ordered by filename, starting after the given filename (keyset pagination)."""
+    return db.query(models.StoredImage).filter(models.StoredImage.filename > after).order_by(
+        models.StoredImage.filename
+    ).limit(limit).all()
+
+def get_image_referrers(db: Session, urls: List[str]) -> Dict[str, List[int]]:
+    """Founder ids per profile image URL, for one page of the consistency report."""
+    referrers = {url: [] for url in urls}
+    if urls:
+        rows = db.query(models.Founder.profile_image_url, models.Founder.id).filter(
+            models.Founder.profile_image_url.in_(urls)
+        ).order_by(models.Founder.id)
+        for url, founder_id in rows:
+            referrers[url].append(founder_id)
+    return referrers
+
+def get_unmanifested_image_refs(db: Session, url_prefix: str, after_founder_id: int = 0, limit: int = 100):
+    """Founders pointing at an uploaded image that has no manifest row (missing or never recorded)."""
+    return db.query(models.Founder).outerjoin(
+        models.StoredImage, models.StoredImage.url == models.Founder.profile_image_url
+    ).filter(
+        models.Founder.profile_image_url.startswith(url_prefix),
+        models.StoredImage.id.is_(None),
+        models.Founder.id > after_founder_id,
+    ).order_by(models.Founder.id).limit(limit).all()
+
+def get_manifest_summary(db: Session) -> Dict[str, int]:
+    images, total_bytes, orphaned = db.query(
+        func.count(models.StoredImage.id),
+        func.coalesce(func.sum(models.StoredImage.size), 0),
+        func.count(models.StoredImage.orphaned_at),
+    ).one()
+    return {"images": images, "bytes": total_bytes, "orphaned": orphaned}
+
+# One span per crud call when tracing is enabled
+tracing.instrument_module(__name__)
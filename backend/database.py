@@ -1,19 +1,501 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+import contextvars
+import logging
 import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
+import query_stats
+import tracing
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./founders_crm.db")
 
-# Handle SQLite and PostgreSQL differently
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+# Connection pool settings for server databases (Postgres). Tune against /admin/metrics/pool.
+POOL_SETTINGS = {
+    "pool_size": _env_int("DB_POOL_SIZE", 5),
+    "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+    "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),        # seconds to wait for a free connection
+    "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),      # seconds; drop connections before the server does
+    "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),   # test connections on checkout
+    "pool_use_lifo": _env_bool("DB_POOL_USE_LIFO", True),   # reuse hot connections so idle ones can expire
+}
+
+# SQLite tuning applied to every new connection (see apply_sqlite_profile)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),       # readers no longer block the writer
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),      # durable in WAL mode, fsync only at checkpoints
+    "mmap_size": _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024),  # bytes
+    "cache_size": _env_int("SQLITE_CACHE_SIZE", -64 * 1024),       # negative = KiB, i.e. 64 MiB per connection
+    "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT", 5000),         # ms to wait on a locked database
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+SQLITE_OPTIMIZE_INTERVAL = _env_int("SQLITE_OPTIMIZE_INTERVAL", 3600)  # seconds between PRAGMA optimize runs; 0 disables
+
+def apply_sqlite_profile(dbapi_connection, pragmas: dict = SQLITE_PRAGMAS):
+    """Apply the SQLite performance PRAGMAs to a raw DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        # Recommended for long-lived connections: only analyzes tables that need it
+        cursor.execute("PRAGMA optimize=0x10002")
+    finally:
+        cursor.close()
+
+def _is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") not in ("sqlite:", "sqlite+pysqlite:")
+
+def start_sqlite_optimizer(target_engine=None, interval: int = SQLITE_OPTIMIZE_INTERVAL):
+    """Run PRAGMA optimize periodically in a daemon thread so query planner stats stay fresh."""
+    target_engine = target_engine or engine
+    if interval <= 0 or not _is_sqlite_file(str(target_engine.url)):
+        return None
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with target_engine.connect() as conn:
+                    conn.exec_driver_sql("PRAGMA optimize")
+            except Exception as e:
+                logger.warning("SQLite PRAGMA optimize failed: %s", e)
+
+    thread = threading.Thread(target=run, name="sqlite-optimize", daemon=True)
+    thread.start()
+    return thread
+
+class PoolMetrics:
+    """Counters for one engine's connection pool, fed by pool events."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checkout_waits = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.connect_time_total = 0.0
+        self.connect_time_max = 0.0
+        self.checked_out_peak = 0
+        self.overflow_peak = 0
+
+    def attach(self, engine):
+        """Register the pool event listeners on an engine."""
+        if isinstance(engine.pool, _CheckoutTimingMixin):
+            engine.pool.metrics = self
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            pool = engine.pool
+            with self._lock:
+                self.checkouts += 1
+                if isinstance(pool, QueuePool):
+                    self.checked_out_peak = max(self.checked_out_peak, pool.checkedout())
+                    self.overflow_peak = max(self.overflow_peak, pool.overflow())
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def record_connect_time(self, seconds: float):
+        with self._lock:
+            self.connect_time_total += seconds
+            self.connect_time_max = max(self.connect_time_max, seconds)
+
+    def record_checkout_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkout_waits += 1
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, engine) -> dict:
+        pool = engine.pool
+        with self._lock:
+            data = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checkout_wait_seconds_total": round(self.checkout_wait_total, 6),
+                "checkout_wait_seconds_avg": round(self.checkout_wait_total / self.checkout_waits, 6) if self.checkout_waits else 0.0,
+                "checkout_wait_seconds_max": round(self.checkout_wait_max, 6),
+                "connect_seconds_total": round(self.connect_time_total, 6),
+                "connect_seconds_max": round(self.connect_time_max, 6),
+                "checked_out_peak": self.checked_out_peak,
+                "overflow_peak": self.overflow_peak,
+            }
+        data["pool_class"] = type(pool).__name__
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return data
+
+# Nesting depth of _CheckoutTimingMixin._do_get (QueuePool._do_get retries by calling itself)
+_do_get_depth = contextvars.ContextVar("pool_do_get_depth", default=0)
+
+class _CheckoutTimingMixin:
+    """Times how long callers wait for the pool to hand out a connection.
+
+    Only the time in the pool's queue counts as checkout wait. Opening a new connection (for
+    overflow) happens inside _do_get too and is recorded as connect time instead; the pre-ping
+    runs after _do_get and is not counted.
+    """
+
+    metrics = None
+
+    def _do_get(self):
+        depth = _do_get_depth.get()
+        token = _do_get_depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None and depth == 0:
+                self.metrics.record_checkout_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        finally:
+            _do_get_depth.reset(token)
+        if depth == 0:
+            connect_seconds = record.__dict__.pop("_connect_seconds", 0.0)
+            if self.metrics is not None:
+                self.metrics.record_checkout_wait(max(time.perf_counter() - start - connect_seconds, 0.0))
+        return record
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        record = super()._create_connection()
+        record._connect_seconds = time.perf_counter() - start
+        if self.metrics is not None:
+            self.metrics.record_connect_time(record._connect_seconds)
+        return record
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def make_engine(url: str, name: str):
+    """Create an engine for `url` with pool settings, pool metrics, query stats and SQL spans attached."""
+    # Handle SQLite and PostgreSQL differently
+    if url.startswith("sqlite"):
+        new_engine = create_engine(url, connect_args={"check_same_thread": False})
+        if _is_sqlite_file(url):
+            event.listen(new_engine, "connect", lambda dbapi_connection, connection_record: apply_sqlite_profile(dbapi_connection))
+    else:
+        new_engine = create_engine(url, poolclass=InstrumentedQueuePool, **POOL_SETTINGS)
+    metrics = PoolMetrics(name)
+    metrics.attach(new_engine)
+    query_stats.instrument_engine(new_engine)
+    tracing.instrument_engine(new_engine)
+    pool_metrics[name] = (new_engine, metrics)
+    return new_engine
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its async driver (aiosqlite / asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    driver = {
+        "sqlite": "sqlite+aiosqlite",
+        "sqlite+pysqlite": "sqlite+aiosqlite",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+    }.get(scheme, scheme)
+    return f"{driver}{sep}{rest}"
+
+def make_async_engine(url: str, name: str):
+    """Async counterpart of make_engine, sharing the same pool settings, SQLite profile and metrics."""
+    async_url = to_async_url(url)
+    if url.startswith("sqlite"):
+        new_engine = create_async_engine(async_url, poolclass=InstrumentedAsyncQueuePool)
+        if _is_sqlite_file(url):
+            event.listen(new_engine.sync_engine, "connect", lambda dbapi_connection, connection_record: apply_sqlite_profile(dbapi_connection))
+    else:
+        new_engine = create_async_engine(async_url, poolclass=InstrumentedAsyncQueuePool, **POOL_SETTINGS)
+    metrics = PoolMetrics(name)
+    metrics.attach(new_engine.sync_engine)
+    query_stats.instrument_engine(new_engine.sync_engine)
+    tracing.instrument_engine(new_engine.sync_engine)
+    pool_metrics[name] = (new_engine.sync_engine, metrics)
+    return new_engine
+
+# engine name -> (engine, PoolMetrics)
+pool_metrics = {}
+
+def pool_metrics_snapshot() -> dict:
+    """Live pool state and counters for every engine, plus the configured settings."""
+    return {
+        "settings": POOL_SETTINGS,
+        "engines": {name: metrics.snapshot(eng) for name, (eng, metrics) in pool_metrics.items()},
+    }
+
+# Pool counters exported as gauges on /metrics, one series per engine
+POOL_GAUGES = {
+    "connects": "Connections opened by the pool.",
+    "checkouts": "Connections checked out of the pool.",
+    "invalidations": "Connections invalidated (e.g. after a disconnect).",
+    "timeouts": "Checkouts that timed out waiting for a connection.",
+    "checkout_wait_seconds_total": "Total time callers waited in the pool queue for a connection.",
+    "checkout_wait_seconds_max": "Longest wait in the pool queue for a connection.",
+    "connect_seconds_total": "Total time spent opening new pool connections.",
+    "connect_seconds_max": "Longest time to open a new pool connection.",
+    "checked_out": "Connections currently checked out.",
+    "checked_in": "Idle connections in the pool.",
+    "overflow": "Overflow connections currently open.",
+    "size": "Configured pool size.",
+}
+
+def pool_metric_samples():
+    """(name, help, labels, value) samples for metrics.Registry.add_collector."""
+    for name, (eng, metrics) in pool_metrics.items():
+        snapshot = metrics.snapshot(eng)
+        for key, documentation in POOL_GAUGES.items():
+            if key in snapshot:
+                yield f"db_pool_{key}", documentation, {"engine": name}, snapshot[key]
+    if replica_monitor is not None:
+        status = replica_monitor.status()
+        yield "db_replica_healthy", "1 if reads are being routed to the replica.", {}, int(bool(status["healthy"]))
+        if status["lag_seconds"] is not None:
+            yield "db_replica_lag_seconds", "Last measured replica lag.", {}, status["lag_seconds"]
+
+engine = make_engine(DATABASE_URL, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Async engine for the async read endpoints
+async_engine = make_async_engine(DATABASE_URL, "primary_async")
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# =========================
+# Optional read replica
+# =========================
+
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+READ_STICKY_SECONDS = _env_int("DATABASE_READ_STICKY_SECONDS", 5)      # read-your-writes window after a client's write
+READ_MAX_LAG_SECONDS = _env_int("DATABASE_READ_MAX_LAG", 10)           # fall back to the primary beyond this lag
+READ_CHECK_INTERVAL = _env_int("DATABASE_READ_CHECK_INTERVAL", 5)      # seconds between replica health checks
+
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+class ReplicaSession(Session):
+    """Session bound to the read replica; refuses to flush.
+
+    If a statement fails on the replica, the replica is marked down and the statement is retried
+    on the primary (``info["primary_bind"]``), where the rest of the session's reads then go.
+    """
+
+    def _on_primary(self, error: OperationalError) -> bool:
+        primary = self.info.get("primary_bind")
+        if primary is None or self.bind is primary:
+            return False
+        if replica_monitor is not None:
+            replica_monitor.mark_down(error)
+        logger.warning("Replica read failed, retrying on the primary: %s", error)
+        self.rollback()
+        self.bind = primary
+        return True
+
+    def execute(self, *args, **kwargs):
+        try:
+            return super().execute(*args, **kwargs)
+        except OperationalError as e:
+            if not self._on_primary(e):
+                raise
+            return super().execute(*args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        try:
+            return super().scalar(*args, **kwargs)
+        except OperationalError as e:
+            if not self._on_primary(e):
+                raise
+            return super().scalar(*args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        try:
+            return super().scalars(*args, **kwargs)
+        except OperationalError as e:
+            if not self._on_primary(e):
+                raise
+            return super().scalars(*args, **kwargs)
+
+@event.listens_for(ReplicaSession, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    raise ReadOnlySessionError("Read-replica sessions are read-only; use get_db for writes")
+
+class ReplicaMonitor:
+    """Tracks whether the read replica is reachable and within the allowed replication lag."""
+
+    # Lag is 0 when the replica has replayed everything it received; otherwise time since the last replayed commit
+    POSTGRES_LAG_SQL = """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """
+
+    def __init__(self, read_engine, max_lag: float, interval: float):
+        self.engine = read_engine
+        self.max_lag = max_lag
+        self.interval = interval
+        self.healthy = False
+        self.lag_seconds = None
+        self.last_error = None
+        self.checked_at = None
+        self._thread = None
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    lag = float(conn.exec_driver_sql(self.POSTGRES_LAG_SQL).scalar() or 0)
+                else:
+                    conn.exec_driver_sql("SELECT 1")
+                    lag = 0.0
+            self.lag_seconds = lag
+            self.last_error = None if lag <= self.max_lag else f"replication lag {lag:.1f}s exceeds {self.max_lag}s"
+            self.healthy = lag <= self.max_lag
+        except Exception as e:
+            self.mark_down(e)
+        self.checked_at = time.time()
+        return self.healthy
+
+    def mark_down(self, error: Exception):
+        """Route reads to the primary until the next successful check."""
+        self.healthy = False
+        self.last_error = str(error)
+
+    def start(self):
+        if self._thread is not None:
+            return self._thread
+        self.check()
+
+        def run():
+            while True:
+                time.sleep(self.interval)
+                self.check()
+
+        self._thread = threading.Thread(target=run, name="replica-monitor", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def status(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at,
+        }
+
+read_engine = None
+ReadSessionLocal = None
+AsyncReadSessionLocal = None
+replica_monitor = None
+
+if DATABASE_READ_URL:
+    read_engine = make_engine(DATABASE_READ_URL, "replica")
+    if read_engine.dialect.name == "postgresql":
+        read_engine = read_engine.execution_options(postgresql_readonly=True)
+    ReadSessionLocal = sessionmaker(
+        class_=ReplicaSession, autocommit=False, autoflush=False, bind=read_engine, info={"primary_bind": engine}
+    )
+    async_read_engine = make_async_engine(DATABASE_READ_URL, "replica_async")
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, sync_session_class=ReplicaSession, autoflush=False, expire_on_commit=False,
+        info={"primary_bind": async_engine.sync_engine},
+    )
+    replica_monitor = ReplicaMonitor(read_engine, READ_MAX_LAG_SECONDS, READ_CHECK_INTERVAL)
+
+# client key -> monotonic time until which that client's reads stay on the primary
+_recent_writers = {}
+_recent_writers_lock = threading.Lock()
+
+def mark_recent_write(client_key: str):
+    """Pin a client's reads to the primary for READ_STICKY_SECONDS after it writes."""
+    if read_engine is None or not client_key:
+        return
+    now = time.monotonic()
+    with _recent_writers_lock:
+        _recent_writers[client_key] = now + READ_STICKY_SECONDS
+        if len(_recent_writers) > 10000:
+            for key in [k for k, until in _recent_writers.items() if until < now]:
+                del _recent_writers[key]
+
+def use_replica(client_key: str) -> bool:
+    """True if this client's read can go to the replica right now."""
+    if replica_monitor is None or not replica_monitor.healthy:
+        return False
+    until = _recent_writers.get(client_key)
+    return until is None or until < time.monotonic()
+
+def start_replica_monitor():
+    if replica_monitor is not None:
+        replica_monitor.start()
+
+def replica_status() -> Optional[dict]:
+    return replica_monitor.status() if replica_monitor is not None else None
+
+Base = declarative_base()
+
+ALEMBIC_INI = Path(__file__).resolve().parent / "alembic.ini"
+
+def check_schema_revision():
+    """Fail fast if the database is not at the latest Alembic revision (run `alembic upgrade head`)."""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    head = ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current or 'none'}, expected {head}. "
+            f"Run `alembic upgrade head` from the backend directory."
+        )
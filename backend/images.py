@@ -0,0 +1,263 @@
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+from fastapi import Request, Response
+from PIL import Image, ImageOps, features
+from sqlalchemy.orm import Session
+import crud
+import database
+import storage
+import uploads
+
+logger = logging.getLogger(__name__)
+
+# Square avatar sizes generated for every upload; requests snap up to the nearest one
+DERIVATIVE_SIZES = (64, 256, 512)
+DERIVATIVE_PREFIX = "derived/"
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# The same ?size= URL returns AVIF, WebP or JPEG depending on the Accept header
+VARY_ACCEPT = {"Vary": "Accept"}
+# Used while derivatives are still being generated, so caches pick up the real variant soon after
+PENDING_CACHE_CONTROL = "public, max-age=60"
+
+# A just-uploaded image is unreferenced until the profile form is saved; don't delete it in that window
+RELEASE_GRACE_SECONDS = int(os.getenv("UPLOAD_RELEASE_GRACE_SECONDS", "3600"))
+# Orphan garbage collection over the stored_images manifest (0 disables the background thread)
+IMAGE_GC_INTERVAL = int(os.getenv("IMAGE_GC_INTERVAL", "3600"))
+IMAGE_GC_BATCH_SIZE = int(os.getenv("IMAGE_GC_BATCH_SIZE", "100"))
+
+# Preferred first. AVIF needs a Pillow build with the AVIF plugin; JPEG is the universal fallback
+FORMATS = [
+    ("avif", "image/avif", "AVIF", {"quality": 55}),
+    ("webp", "image/webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "image/jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+]
+
+def _format_supported(pil_format: str) -> bool:
+    if pil_format == "AVIF":
+        return "AVIF" in Image.SAVE
+    if pil_format == "WEBP":
+        return features.check("webp")
+    return True
+
+ENABLED_FORMATS = [fmt for fmt in FORMATS if _format_supported(fmt[2])]
+
+# Pillow releases the GIL while decoding/resizing/encoding, so threads parallelise the work
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-derivatives")
+
+def derivative_name(filename: str, size: int, ext: str) -> str:
+    return f"{Path(filename).stem}-{size}.{ext}"
+
+def derivative_key(filename: str, size: int, ext: str) -> str:
+    return f"{DERIVATIVE_PREFIX}{derivative_name(filename, size, ext)}"
+
+def snap_size(requested: int) -> int:
+    """Smallest generated size that is at least `requested` (the largest if none is)."""
+    for size in DERIVATIVE_SIZES:
+        if size >= requested:
+            return size
+    return DERIVATIVE_SIZES[-1]
+
+def is_complete(filename: str) -> bool:
+    return all(
+        storage.backend.exists(derivative_key(filename, size, ext))
+        for size in DERIVATIVE_SIZES
+        for ext, _, _, _ in ENABLED_FORMATS
+    )
+
+def _store(image: Image.Image, key: str, media_type: str, pil_format: str, options: dict):
+    """Encode to a temp file and hand it to the store, which moves it into place atomically."""
+    fd, temp_path = uploads.open_temp()
+    try:
+        with os.fdopen(fd, "wb") as out:
+            image.save(out, pil_format, **options)
+        storage.backend.put_file(temp_path, key, media_type)
+    except BaseException:
+        uploads.discard(temp_path)
+        raise
+
+def generate_derivatives(filename: str, force: bool = False) -> List[str]:
+    """Write every size/format derivative of one original; returns the names written."""
+    # Deduplicated re-uploads already have theirs; skip decoding the original again
+    if not force and is_complete(filename):
+        return []
+    written = []
+    with Image.open(io.BytesIO(storage.backend.read(filename))) as original:
+        # Phone photos store rotation in EXIF; bake it in before cropping
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        for size in DERIVATIVE_SIZES:
+            resized = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            for ext, media_type, pil_format, options in ENABLED_FORMATS:
+                key = derivative_key(filename, size, ext)
+                if not force and storage.backend.exists(key):
+                    continue
+                # JPEG has no alpha channel; flatten onto white
+                if pil_format == "JPEG" and resized.mode == "RGBA":
+                    flattened = Image.new("RGB", resized.size, (255, 255, 255))
+                    flattened.paste(resized, mask=resized.getchannel("A"))
+                    _store(flattened, key, media_type, pil_format, options)
+                else:
+                    _store(resized, key, media_type, pil_format, options)
+                written.append(key)
+    return written
+
+def _log_failure(filename: str, future: Future):
+    error = future.exception()
+    if error is not None:
+        logger.error("Derivative generation failed for %s", filename, exc_info=error)
+
+def schedule_derivatives(filename: str) -> Future:
+    """Queue derivative generation on the worker pool without waiting for it."""
+    future = _executor.submit(generate_derivatives, filename)
+    future.add_done_callback(lambda f: _log_failure(filename, f))
+    return future
+
+def parse_accept(accept: str) -> dict:
+    """Media ranges of an Accept header mapped to their q-values (entries with a malformed q are dropped)."""
+    ranges = {}
+    for part in accept.split(","):
+        media_range, *params = [item.strip() for item in part.split(";")]
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    quality = None
+        if quality is not None:
+            media_range = media_range.lower()
+            ranges[media_range] = max(quality, ranges.get(media_range, 0.0))
+    return ranges
+
+def accept_quality(ranges: dict, media_type: str) -> float:
+    """q-value an Accept header gives a derivative format.
+
+    AVIF and WebP must be named explicitly (clients send */* without being able to decode them);
+    JPEG also matches image/* and */*, and is assumed acceptable when there is no Accept header.
+    """
+    if media_type in ranges:
+        return ranges[media_type]
+    if media_type != "image/jpeg":
+        return 0.0
+    if not ranges:
+        return 1.0
+    return ranges.get("image/*", ranges.get("*/*", 0.0))
+
+def negotiate(filename: str, size: int, accept: str) -> Optional[tuple]:
+    """Pick the best existing derivative for an Accept header: (key, media_type) or None.
+
+    Formats are tried by the client's q-value, then in FORMATS order; q=0 excludes a format.
+    """
+    ranges = parse_accept(accept)
+    qualities = {media_type: accept_quality(ranges, media_type) for _, media_type, _, _ in ENABLED_FORMATS}
+    # sorted() is stable, so equal q-values keep the FORMATS preference order
+    candidates = sorted((fmt for fmt in ENABLED_FORMATS if qualities[fmt[1]] > 0), key=lambda fmt: -qualities[fmt[1]])
+    for ext, media_type, _, _ in candidates:
+        key = derivative_key(filename, size, ext)
+        if storage.backend.exists(key):
+            return key, media_type
+    return None
+
+async def serve_derivative(request: Request, filename: str, size: int) -> Response:
+    """Serve the `size` px variant of an upload in the best format the client accepts."""
+    uploads.check_filename(filename)
+    found = await uploads.call_storage(negotiate, filename, snap_size(size), request.headers.get("accept", ""))
+    if found:
+        key, media_type = found
+        return await uploads.serve_key(request, key, media_type, extra_headers=VARY_ACCEPT)
+
+    # Not generated yet (or the original could not be decoded): fall back to the original
+    return await uploads.serve_key(request, filename, uploads.content_type_for(filename),
+                                   cache_control=PENDING_CACHE_CONTROL, extra_headers=VARY_ACCEPT)
+
+def delete_upload(filename: str):
+    """Remove an original and all of its derivatives."""
+    keys = [filename] + [derivative_key(filename, size, ext) for size in DERIVATIVE_SIZES for ext, _, _, _ in FORMATS]
+    for key in keys:
+        storage.backend.delete(key)
+
+def _grace_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=RELEASE_GRACE_SECONDS)
+
+def _delete_if_orphaned(db: Session, image, cutoff: datetime) -> bool:
+    # The manifest row goes in the same transaction as the file removal, so a failed delete is retried
+    if not crud.delete_stored_image_if_orphaned(db, image.id, cutoff):
+        db.rollback()
+        # Still in use despite ref_count 0 (a lost concurrent update): repair the count so the
+        # row drops out of get_orphaned_images instead of being refetched forever
+        crud.sync_image_refs(db, image.url)
+        db.commit()
+        return False
+    try:
+        delete_upload(image.filename)
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    return True
+
+def release_image(db: Session, url: Optional[str]) -> bool:
+    """Delete an upload right away if no founder references it any more; returns True if removed.
+
+    Called after a founder's profile_image_url changes or the founder is deleted (crud has
+    already updated the manifest's ref_count). Images uploaded within RELEASE_GRACE_SECONDS
+    are left for the garbage collector, since their profile may not be saved yet.
+    """
+    if not url:
+        return False
+    image = crud.get_stored_image_by_url(db, url)
+    if image is None or image.ref_count > 0:
+        return False
+    cutoff = _grace_cutoff()
+    if image.uploaded_at >= cutoff:
+        return False
+    return _delete_if_orphaned(db, image, cutoff)
+
+def collect_orphans(db: Session, batch_size: int = IMAGE_GC_BATCH_SIZE) -> int:
+    """Delete unreferenced uploads that have been orphaned for longer than the grace period, in batches."""
+    cutoff = _grace_cutoff()
+    deleted = 0
+    while True:
+        batch = crud.get_orphaned_images(db, cutoff, limit=batch_size)
+        for image in batch:
+            if _delete_if_orphaned(db, image, cutoff):
+                deleted += 1
+        if len(batch) < batch_size:
+            return deleted
+
+def start_image_gc(interval: int = IMAGE_GC_INTERVAL):
+    """Run collect_orphans periodically in a daemon thread."""
+    if interval <= 0:
+        return None
+
+    def run():
+        while True:
+            time.sleep(interval)
+            db = database.SessionLocal()
+            try:
+                deleted = collect_orphans(db)
+                if deleted:
+                    logger.info("Image GC removed %s orphaned upload(s)", deleted)
+            except Exception:
+                logger.exception("Image GC failed")
+            finally:
+                db.close()
+
+    thread = threading.Thread(target=run, name="image-gc", daemon=True)
+    thread.start()
+    return thread
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,223 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# LOG_FORMAT: "json" (one object per line, for log shippers) or "text"; scripts default to "console"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "")
+# Per-module overrides, e.g. "query_stats=DEBUG,sqlalchemy.engine=INFO"; applied after QUIET_LOGGERS
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Libraries that are chatty at INFO (SQLAlchemy names pool loggers after our pool subclasses)
+QUIET_LOGGERS = (
+    "sqlalchemy=WARNING,database.InstrumentedQueuePool=WARNING,database.InstrumentedAsyncQueuePool=WARNING,"
+    "alembic=WARNING,httpx=WARNING,urllib3=WARNING,botocore=WARNING,boto3=WARNING,s3transfer=WARNING"
+)
+# uvicorn installs its own synchronous handlers; they are re-routed through the queue
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+# Each message template may log LOG_RATE_LIMIT times per LOG_RATE_WINDOW seconds; after that only
+# every LOG_SAMPLE_EVERY-th occurrence is kept (with a count of what was dropped). Errors always pass.
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "20"))
+LOG_RATE_WINDOW = float(os.getenv("LOG_RATE_WINDOW", "60"))
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+# Loggers that are never sampled (one line per request is the point of an access log)
+LOG_RATE_LIMIT_EXEMPT = {name.strip() for name in os.getenv("LOG_RATE_LIMIT_EXEMPT", "uvicorn.access").split(",") if name.strip()}
+# Records queued for the writer thread; when full, new records are dropped rather than blocking
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Client-supplied request ids are echoed only if they look like an id, not arbitrary text
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+# Attributes every LogRecord has; anything else came from `extra=` and is emitted as a JSON field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "suppressed"}
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the id of the request being served (None outside requests)."""
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+class RateLimitFilter(logging.Filter):
+    """Samples repetitive messages: keyed by logger and unformatted template, so use %-style args."""
+
+    def __init__(self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW, sample_every: int = LOG_SAMPLE_EVERY, exempt=LOG_RATE_LIMIT_EXEMPT):
+        super().__init__()
+        self.limit = limit
+        self.exempt = set(exempt)
+        self.window = window
+        self.sample_every = max(sample_every, 1)
+        # key -> [window start, seen in window, dropped since last emitted]
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR or self.limit <= 0 or record.name in self.exempt:
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg).__name__)
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                dropped = state[2] if state else 0
+                state = self._state[key] = [now, 0, dropped]
+                if len(self._state) > 10_000:
+                    self._state = {key: state}
+            state[1] += 1
+            seen = state[1]
+            if seen > self.limit and (seen - self.limit) % self.sample_every:
+                state[2] += 1
+                return False
+            dropped, state[2] = state[2], 0
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request_id and any `extra` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "suppressed", None):
+            entry["suppressed"] = record.suppressed
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class TextFormatter(logging.Formatter):
+    """Human-readable line with the request id and a note when repeats were sampled away."""
+
+    def __init__(self, console: bool = False):
+        super().__init__("%(message)s" if console else "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        line = super().format(record)
+        if getattr(record, "suppressed", None):
+            line += f" (+{record.suppressed} similar suppressed)"
+        return line
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking the caller."""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Render the message and traceback here, in the calling thread, so the writer thread
+        # never touches request objects; keep the record's other attributes for the formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def metric_samples():
+    """Gauge samples for /metrics (see metrics.Registry.add_collector)."""
+    yield "log_records_dropped", "Log records dropped because the log queue was full.", {}, NonBlockingQueueHandler.dropped
+
+def _apply_levels(spec: str):
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+def setup_logging(default_format: str = "json"):
+    """Route the root logger through a bounded queue to a writer thread on stdout (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+    fmt = (LOG_FORMAT or default_format).lower()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(console=fmt == "console"))
+
+    handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(LOG_LEVEL)
+    _apply_levels(QUIET_LOGGERS)
+    _apply_levels(LOG_LEVELS)
+    for name in UVICORN_LOGGERS:
+        logging.getLogger(name).handlers[:] = []
+        logging.getLogger(name).propagate = True
+
+    _listener = logging.handlers.QueueListener(handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+class RequestIdMiddleware:
+    """Pure ASGI middleware giving each request an id (incoming X-Request-ID or a new one).
+
+    The id is attached to every log record written while serving the request and echoed back
+    in the X-Request-ID response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next((value.decode("latin-1") for name, value in scope.get("headers", ()) if name == REQUEST_ID_HEADER), "")
+        request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(REQUEST_ID_HEADER, request_id.encode())]}
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_id.reset(token)
@@ -1,54 +1,36 @@
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Response
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import models, schemas, database, crud
+import models, schemas, database, crud, async_crud, storage, uploads, images, metrics, query_stats, profiling, logging_setup, tracing
 # --- IMPORT is_admin_user for the new endpoint ---
-from auth import get_current_user, get_current_user_optional, is_admin_user
+from auth import get_current_user, get_current_user_optional, is_admin_user, get_admin_user
+import logging
 import os
-import uuid
+import hashlib
 import requests
 import json
-from pathlib import Path
 from pydantic import BaseModel
 
+logging_setup.setup_logging()
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Scrappy Founders Knowledge Base")
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+# Uploads live in storage.backend: UPLOAD_DIR locally, or an S3-compatible bucket (STORAGE_BACKEND=s3)
+UPLOAD_DIR = uploads.UPLOAD_DIR
 
-# Custom endpoint to serve uploaded images with CORS headers
+# Serve uploaded images with CORS and cache headers (see uploads.py)
+# ?size=N returns the nearest square derivative in the best format the client accepts (see images.py)
 @app.get("/uploads/{filename}")
-async def serve_uploaded_file(filename: str):
-    file_path = UPLOAD_DIR / filename
-    print(f"Looking for file: {file_path}")
-    print(f"File exists: {file_path.exists()}")
-    print(f"Upload directory contents: {list(UPLOAD_DIR.glob('*')) if UPLOAD_DIR.exists() else 'Directory does not exist'}")
-    
-    if not file_path.exists():
-        # For now, return a 404 but with CORS headers so the frontend can handle it gracefully
-        raise HTTPException(
-            status_code=404, 
-            detail="File not found",
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET",
-                "Access-Control-Allow-Headers": "*",
-            }
-        )
-    
-    # Return file with proper CORS headers
-    return FileResponse(
-        path=file_path,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
+async def serve_uploaded_file(filename: str, request: Request, size: Optional[int] = None):
+    if size is not None:
+        return await images.serve_derivative(request, filename, size)
+    return await uploads.serve_upload(request, filename)
 
 # CORS middleware
 app.add_middleware(
@@ -57,10 +39,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-DB-Query-Count", "X-Profile-Id", "X-Request-ID", "traceresponse"],
 )
 
-# Create tables
-models.Base.metadata.create_all(bind=database.engine)
+# Schema changes are applied by `alembic upgrade head`; startup only verifies the revision
+@app.on_event("startup")
+def prepare_database():
+    database.check_schema_revision()
+    database.start_sqlite_optimizer()
+    database.start_replica_monitor()
+    images.start_image_gc()
+
+@app.on_event("shutdown")
+async def close_database():
+    await database.async_engine.dispose()
+
+@app.on_event("shutdown")
+def stop_image_workers():
+    images.shutdown()
 
 # Dependency
 def get_db():
@@ -70,11 +66,67 @@ def get_db():
     finally:
         db.close()
 
+def client_key(request: Request) -> str:
+    """Identify a client for read-your-writes stickiness (bearer token if present, else IP)."""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    return request.client.host if request.client else ""
+
+def get_read_db(request: Request):
+    """Read-only session on the replica when it is healthy and this client has not just written; else the primary."""
+    if database.use_replica(client_key(request)):
+        # ReplicaSession retries a failed replica read on the primary
+        db = database.ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    else:
+        yield from get_db()
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db for the async read endpoints."""
+    use_replica = database.use_replica(client_key(request))
+    session_factory = database.AsyncReadSessionLocal if use_replica else database.AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+# Caps the /upload-image/ body while it streams, before the multipart parser spools it
+app.add_middleware(uploads.UploadSizeLimitMiddleware)
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        database.mark_recent_write(client_key(request))
+    return response
+
+# Admin opt-in sampling profiler (X-Profile header or ?_profile=1), see /admin/profiles
+if profiling.PROFILER_ENABLED:
+    app.add_middleware(profiling.ProfilerMiddleware)
+# Per-request SQL counts and timing (Server-Timing / X-DB-Query-Count headers, N+1 warnings)
+app.add_middleware(query_stats.QueryStatsMiddleware)
+# Per-route request metrics, exposed on /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+# Request span continuing the caller's W3C traceparent; exported when TRACING_EXPORTER is set
+if tracing.ENABLED:
+    app.add_middleware(tracing.TracingMiddleware)
+# Request ids for log records and the X-Request-ID header; added last so it wraps every other middleware
+app.add_middleware(logging_setup.RequestIdMiddleware)
+metrics.REGISTRY.add_collector(database.pool_metric_samples)
+metrics.REGISTRY.add_collector(logging_setup.metric_samples)
+
 # Health check endpoint (no auth required)
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "message": "API is running"}
 
+# Prometheus scrape endpoint (no auth, like /health; keep it off the public ingress)
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Root endpoint
 @app.get("/")
 def read_root():
@@ -87,74 +139,111 @@ def image_storage_info(db: Session = Depends(get_db)):
     Documents how image storage works in this application
     """
     
-    # Get all founders with their image URLs
-    founders_with_images = db.query(models.Founder).filter(models.Founder.profile_image_url.isnot(None)).all()
-    
-    # Check what's actually on disk
-    disk_files = []
-    if UPLOAD_DIR.exists():
-        for file_path in UPLOAD_DIR.glob('*'):
-            if file_path.is_file():
-                disk_files.append(file_path.name)
-    
-    # Analyze the founders' image URLs
-    db_image_info = []
-    for founder in founders_with_images:
-        if founder.profile_image_url:
-            # Check if it's a relative path or absolute URL
-            url = founder.profile_image_url
-            is_relative = url.startswith('/uploads/')
-            is_absolute = url.startswith('http')
-            
-            # Extract filename if possible
-            filename = None
-            if '/' in url:
-                filename = url.split('/')[-1]
-            
-            db_image_info.append({
-                "founder_id": founder.id,
-                "founder_name": founder.name,
-                "profile_image_url": url,
-                "is_relative_path": is_relative,
-                "is_absolute_url": is_absolute,
-                "extracted_filename": filename,
-                "file_exists_on_disk": filename in disk_files if filename else False
-            })
+    # Totals come from the stored_images manifest; per-file detail is paged by /admin/images/consistency
+    summary = crud.get_manifest_summary(db)
     
     return {
         "documentation": {
             "image_upload_process": {
                 "1": "Images are uploaded via POST /upload-image/ endpoint",
-                "2": "Files are saved to UPLOAD_DIR (./uploads/)",  
-                "3": "Unique filename is generated using uuid.uuid4()",
+                "2": "Files are saved to the upload store (UPLOAD_DIR locally, or an S3 bucket)",
+                "3": "Filename is the sha256 of the content, so identical uploads share one file",
                 "4": "Endpoint returns {'image_url': '/uploads/filename.ext'}",
-                "5": "Frontend stores this URL in founder.profile_image_url"
+                "5": "Frontend stores this URL in founder.profile_image_url",
+                "6": "The file is recorded in the stored_images manifest; unreferenced files are garbage collected"
             },
             "image_serving_process": {
-                "1": "Images served via GET /uploads/{filename} endpoint",
+                "1": "Images served via GET /uploads/{filename} endpoint (a redirect to the bucket on S3)",
                 "2": "Frontend calls getImageUrl() helper function",
                 "3": "If URL starts with 'http', returns as-is (absolute URL)",
                 "4": "If URL is relative, prepends API_URL to make it absolute"
             },
             "storage_locations": {
-                "backend_directory": str(UPLOAD_DIR.absolute()) if UPLOAD_DIR.exists() else "Directory does not exist",
+                "storage_backend": storage.STORAGE_BACKEND,
+                "backend_directory": str(UPLOAD_DIR.absolute()) if storage.backend.is_local else f"s3://{storage.S3_BUCKET}/{storage.S3_PREFIX}",
                 "served_via": "Custom FastAPI endpoint at /uploads/{filename}",
                 "cors_headers": "Added via custom endpoint (not StaticFiles)"
             }
         },
         "current_state": {
-            "upload_directory_exists": UPLOAD_DIR.exists(),
-            "files_on_disk": {
-                "count": len(disk_files),
-                "filenames": sorted(disk_files)
-            },
-            "database_records": {
-                "founders_with_images": len(founders_with_images),
-                "image_details": db_image_info
-            }
+            "manifest": summary,
+            "consistency_report": "/admin/images/consistency"
+        }
+    }
+
+# Paginated image/DB consistency report built from the stored_images manifest
+@app.get("/admin/images/consistency")
+def image_consistency_report(
+    after: str = "",
+    after_founder_id: int = 0,
+    limit: int = 100,
+    check_storage: bool = True,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_admin_user),
+):
+    """
+    One page of manifest rows (keyset-paginated by filename) with the founders referencing each,
+    plus founders whose upload URL has no manifest row. Pass the returned cursors to fetch the next page.
+    """
+    limit = max(1, min(limit, 500))
+    page = crud.get_stored_images_page(db, after=after, limit=limit)
+    referrers = crud.get_image_referrers(db, [image.url for image in page])
+    items = []
+    for image in page:
+        founder_ids = referrers[image.url]
+        item = {
+            "filename": image.filename,
+            "url": image.url,
+            "size": image.size,
+            "sha256": image.sha256,
+            "ref_count": image.ref_count,
+            "founder_ids": founder_ids,
+            "uploaded_at": image.uploaded_at,
+            "orphaned_at": image.orphaned_at,
+            "ref_count_matches": image.ref_count == len(founder_ids),
         }
+        if check_storage:
+            item["in_storage"] = storage.backend.exists(image.filename)
+        items.append(item)
+
+    dangling = crud.get_unmanifested_image_refs(db, uploads.URL_PREFIX, after_founder_id=after_founder_id, limit=limit)
+    return {
+        "images": items,
+        "next_after": page[-1].filename if len(page) == limit else None,
+        "unmanifested_references": [
+            {"founder_id": founder.id, "founder_name": founder.name, "profile_image_url": founder.profile_image_url}
+            for founder in dangling
+        ],
+        "next_after_founder_id": dangling[-1].id if len(dangling) == limit else None,
     }
 
+# Connection pool metrics for tuning DB_POOL_* settings
+@app.get("/admin/metrics/pool")
+def pool_metrics(current_user: dict = Depends(get_admin_user)):
+    return {**database.pool_metrics_snapshot(), "replica": database.replica_status()}
+
+# Recent statements slower than SQL_SLOW_QUERY_MS, newest first
+@app.get("/admin/metrics/slow-queries")
+def slow_queries(limit: int = 50, current_user: dict = Depends(get_admin_user)):
+    return {
+        "threshold_ms": query_stats.SLOW_QUERY_SECONDS * 1000,
+        "n_plus_one_threshold": query_stats.N_PLUS_ONE_THRESHOLD,
+        "queries": list(reversed(query_stats.slow_queries))[:max(limit, 0)],
+    }
+
+# Stored request profiles, newest first
+@app.get("/admin/profiles")
+def list_profiles(current_user: dict = Depends(get_admin_user)):
+    return profiling.list_profiles()
+
+# One request profile as folded stacks (load into speedscope or pipe to flamegraph.pl)
+@app.get("/admin/profiles/{profile_id}")
+def get_profile(profile_id: str, current_user: dict = Depends(get_admin_user)):
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile["folded"], headers={"Content-Disposition": f'inline; filename="profile-{profile_id}.folded"'})
+
 # Protected endpoint to verify authentication
 @app.get("/protected")
 def protected_route(current_user: dict = Depends(get_current_user)):
@@ -162,43 +251,36 @@ def protected_route(current_user: dict = Depends(get_current_user)):
 
 # Image upload endpoint
 @app.post("/upload-image/")
-async def upload_image(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
-    # Validate file type
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="File must be an image")
-    
-    # Generate unique filename
-    file_extension = file.filename.split(".")[-1] if file.filename else "jpg"
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # Save file
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+async def upload_image(file: UploadFile = File(...), current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    # Type comes from the file's magic bytes and size is capped while streaming (see uploads.save_upload)
+    # Identical images share one content-addressed file and URL
+    saved = await uploads.save_upload(file)
+    image_url = uploads.upload_url(saved.filename)
+    await run_in_threadpool(crud.record_stored_image, db, saved.filename, image_url, saved.size, saved.sha256, saved.content_type)
+    # Thumbnails are generated in the background; ?size= falls back to the original until they exist
+    if saved.created:
+        images.schedule_derivatives(saved.filename)
     
     # Return the URL that can be used to access the image
-    return {"image_url": f"/uploads/{unique_filename}"}
+    return {"image_url": image_url}
 
 # Founder endpoints
 @app.post("/founders/", response_model=schemas.Founder)
 def create_founder(founder: schemas.FounderCreate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     try:
-        print(f"Creating founder with data: {founder.dict()}")
-        print(f"Current user: {current_user}")
+        logger.debug("Creating founder %s for user %s", founder.email, current_user.get('sub') if current_user else None)
         
         # Only set auth0_user_id from current user if not provided AND user is creating their own profile
         # For admin-created profiles, leave auth0_user_id as None until the actual user logs in
         if not founder.auth0_user_id and current_user and founder.email == current_user.get('email'):
             founder.auth0_user_id = current_user.get('sub')
-            print(f"Set auth0_user_id to: {founder.auth0_user_id}")
+            logger.debug("Set auth0_user_id to %s", founder.auth0_user_id)
         else:
-            print(f"Not setting auth0_user_id (admin creating profile for someone else)")
+            logger.debug("Not setting auth0_user_id (admin creating profile for someone else)")
         
         return crud.create_founder(db=db, founder=founder)
     except Exception as e:
-        print(f"Error creating founder: {str(e)}")
-        print(f"Error type: {type(e)}")
+        logger.warning("Error creating founder: %s (%s)", e, type(e).__name__)
         
         # Handle specific database errors
         error_str = str(e)
@@ -219,11 +301,13 @@ def create_founder(founder: schemas.FounderCreate, db: Session = Depends(get_db)
 @app.post("/founders/upload-csv", response_model=schemas.FounderUploadResponse)
 async def upload_founders_csv(
     file: UploadFile = File(...), 
+    mode: str = "create",
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     (Admin Only) Allows bulk creation of founders from a CSV file.
+    Pass mode=upsert to update existing founders (matched by email) instead of rejecting them.
     """
     # 1. Admin Authorization Check
     user_email = current_user.get('email', '')
@@ -233,11 +317,13 @@ async def upload_founders_csv(
     # 2. File Type Validation
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a CSV file.")
+    if mode not in crud.CSV_IMPORT_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Use one of: {', '.join(crud.CSV_IMPORT_MODES)}")
     
     try:
         # 3. Read file content and pass to CRUD function
         csv_file_content = await file.read()
-        result = crud.create_founders_from_csv(db, csv_file_content)
+        result = crud.create_founders_from_csv(db, csv_file_content, mode=mode)
         return result
     except Exception as e:
         # 4. Handle unexpected errors
@@ -259,12 +345,12 @@ def check_user_profile(db: Session = Depends(get_db), current_user: dict = Depen
         if not user_email:
             raise HTTPException(status_code=400, detail="User email not found in token")
         
-        print(f"Checking profile for user: {user_email}, auth0_id: {auth0_user_id}")
+        logger.debug("Checking profile for user %s, auth0_id %s", user_email, auth0_user_id)
         
         # Check if user already has a linked profile
         existing_by_auth0 = db.query(models.Founder).filter(models.Founder.auth0_user_id == auth0_user_id).first()
         if existing_by_auth0:
-            print(f"Found existing profile linked to Auth0 ID: {existing_by_auth0.name}")
+            logger.debug("Found existing profile %s linked to the Auth0 ID", existing_by_auth0.id)
             return {
                 "has_profile": True,
                 "profile_linked": True,
@@ -272,14 +358,14 @@ def check_user_profile(db: Session = Depends(get_db), current_user: dict = Depen
             }
         
         # Check if there's an unlinked profile with matching email
-        existing_by_email = db.query(models.Founder).filter(models.Founder.email == user_email).first()
+        existing_by_email = crud.get_unclaimed_founder_by_email(db, user_email)
         if existing_by_email:
-            print(f"Found unlinked profile with matching email: {existing_by_email.name}")
+            logger.debug("Found unlinked profile %s with matching email", existing_by_email.id)
             # Link the Auth0 account to the existing profile
             existing_by_email.auth0_user_id = auth0_user_id
             db.commit()
             db.refresh(existing_by_email)
-            print(f"Successfully linked Auth0 account to existing profile")
+            logger.info("Linked Auth0 account %s to existing profile %s", auth0_user_id, existing_by_email.id)
             
             return {
                 "has_profile": True,
@@ -288,7 +374,7 @@ def check_user_profile(db: Session = Depends(get_db), current_user: dict = Depen
             }
         
         # No existing profile found
-        print(f"No existing profile found for {user_email}")
+        logger.debug("No existing profile found for %s", user_email)
         return {
             "has_profile": False,
             "profile_linked": False,
@@ -296,21 +382,22 @@ def check_user_profile(db: Session = Depends(get_db), current_user: dict = Depen
         }
         
     except Exception as e:
-        print(f"Error checking user profile: {str(e)}")
+        logger.exception("Error checking user profile")
         raise HTTPException(status_code=500, detail=f"Error checking profile: {str(e)}")
 
 @app.get("/founders/", response_model=List[schemas.Founder])
-def read_founders(skip: int = 0, limit: int = 10000, db: Session = Depends(get_db)):
-    return crud.get_founders(db, skip=skip, limit=limit)
+async def read_founders(skip: int = 0, limit: int = 10000, db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_founders(db, skip=skip, limit=limit)
 
 @app.get("/debug/check-email/{email}")
 def debug_check_email(email: str, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """Debug endpoint to check if an email exists in the database"""
     try:
-        # Check for exact match
-        exact_match = db.query(models.Founder).filter(models.Founder.email == email).first()
-        # Check for case-insensitive match
-        case_insensitive = db.query(models.Founder).filter(models.Founder.email.ilike(email)).all()
+        # Case-insensitive match through the email_normalized index (unique, so at most one)
+        normalized_match = crud.get_founder_by_email(db, email)
+        case_insensitive = [normalized_match] if normalized_match else []
+        # Exact match is the same row when the stored spelling is identical
+        exact_match = normalized_match if normalized_match and normalized_match.email == email else None
         
         return {
             "email_searched": email,
@@ -333,25 +420,25 @@ def debug_check_email(email: str, db: Session = Depends(get_db), current_user: d
         return {"error": str(e)}
 
 @app.get("/founders/{founder_id}", response_model=schemas.Founder)
-def read_founder(founder_id: int, db: Session = Depends(get_db)):
-    founder = crud.get_founder(db, founder_id=founder_id)
+async def read_founder(founder_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    founder = await async_crud.get_founder(db, founder_id=founder_id)
     if founder is None:
         raise HTTPException(status_code=404, detail="Founder not found")
     return founder
 
 @app.put("/founders/{founder_id}", response_model=schemas.Founder)
 def update_founder(founder_id: int, founder: schemas.FounderCreate, db: Session = Depends(get_db)):
+    existing = crud.get_founder(db, founder_id=founder_id)
+    previous_image_url = existing.profile_image_url if existing else None
     updated_founder = crud.update_founder(db, founder_id=founder_id, founder=founder)
     if updated_founder is None:
         raise HTTPException(status_code=404, detail="Founder not found")
+    if previous_image_url != updated_founder.profile_image_url:
+        images.release_image(db, previous_image_url)
     return updated_founder
 
 @app.delete("/founders/{founder_id}")
 def delete_founder(founder_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     try:
         # Check if user is admin
         user_email = current_user.get('email', '')
@@ -362,7 +449,7 @@ def delete_founder(founder_id: int, db: Session = Depends(get_db), current_user:
         # Check if founder exists
         founder = crud.get_founder(db, founder_id=founder_id)
         if founder is None:
-            logger.warning(f"Attempt to delete non-existent founder {founder_id}")
+            logger.warning("Attempt to delete non-existent founder %s", founder_id)
             raise HTTPException(status_code=404, detail="Founder not found")
         
         # Cascade delete: Remove all associated help requests first
@@ -372,11 +459,13 @@ def delete_founder(founder_id: int, db: Session = Depends(get_db), current_user:
             db.delete(help_request)
         
         # Delete the founder (this will automatically handle the startup relationship and many-to-many relationships)
+        image_url = founder.profile_image_url
         deleted_founder = crud.delete_founder(db, founder_id=founder_id)
+        images.release_image(db, image_url)
         
         # Note: No need to explicitly commit here as crud.delete_founder already commits
         
-        logger.info(f"Successfully deleted founder {founder_id} and {help_requests_count} associated help requests by admin {user_email}")
+        logger.info("Deleted founder %s and %s associated help requests by admin %s", founder_id, help_requests_count, user_email)
         return {
             "message": "Founder deleted successfully", 
             "details": f"Also removed {help_requests_count} associated help requests"
@@ -386,20 +475,23 @@ def delete_founder(founder_id: int, db: Session = Depends(get_db), current_user:
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        logger.error(f"Unexpected error deleting founder {founder_id}: {str(e)}", exc_info=True)
+        logger.exception("Unexpected error deleting founder %s", founder_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 # Skill endpoints
 @app.post("/skills/", response_model=schemas.Skill)
 def create_skill(skill: schemas.SkillCreate, db: Session = Depends(get_db)):
-    return crud.create_skill(db=db, skill=skill)
+    try:
+        return crud.create_skill(db=db, skill=skill)
+    except crud.DuplicateNameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @app.get("/skills/", response_model=List[schemas.Skill])
-def read_skills(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_skills(db, skip=skip, limit=limit)
+async def read_skills(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_skills(db, skip=skip, limit=limit)
 
 @app.get("/skills/{skill_id}", response_model=schemas.Skill)
-def read_skill(skill_id: int, db: Session = Depends(get_db)):
+def read_skill(skill_id: int, db: Session = Depends(get_read_db)):
     skill = crud.get_skill(db, skill_id=skill_id)
     if skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
@@ -407,7 +499,10 @@ def read_skill(skill_id: int, db: Session = Depends(get_db)):
 
 @app.put("/skills/{skill_id}", response_model=schemas.Skill)
 def update_skill(skill_id: int, skill: schemas.SkillCreate, db: Session = Depends(get_db)):
-    updated_skill = crud.update_skill(db, skill_id=skill_id, skill=skill)
+    try:
+        updated_skill = crud.update_skill(db, skill_id=skill_id, skill=skill)
+    except crud.DuplicateNameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if updated_skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
     return updated_skill
@@ -422,22 +517,28 @@ def delete_skill(skill_id: int, db: Session = Depends(get_db)):
 # Startup endpoints
 @app.post("/startups/", response_model=schemas.Startup)
 def create_startup(startup: schemas.StartupCreate, db: Session = Depends(get_db)):
-    return crud.create_startup(db=db, startup=startup)
+    try:
+        return crud.create_startup(db=db, startup=startup)
+    except crud.DuplicateNameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @app.get("/startups/", response_model=List[schemas.Startup])
-def read_startups(skip: int = 0, limit: int = 1000, db: Session = Depends(get_db)):
-    return crud.get_startups(db, skip=skip, limit=limit)
+async def read_startups(skip: int = 0, limit: int = 1000, db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_startups(db, skip=skip, limit=limit)
 
 @app.get("/startups/{startup_id}", response_model=schemas.Startup)
-def read_startup(startup_id: int, db: Session = Depends(get_db)):
-    startup = crud.get_startup(db, startup_id=startup_id)
+async def read_startup(startup_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    startup = await async_crud.get_startup(db, startup_id=startup_id)
     if startup is None:
         raise HTTPException(status_code=404, detail="Startup not found")
     return startup
 
 @app.put("/startups/{startup_id}", response_model=schemas.Startup)
 def update_startup(startup_id: int, startup: schemas.StartupCreate, db: Session = Depends(get_db)):
-    updated_startup = crud.update_startup(db, startup_id=startup_id, startup=startup)
+    try:
+        updated_startup = crud.update_startup(db, startup_id=startup_id, startup=startup)
+    except crud.DuplicateNameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if updated_startup is None:
         raise HTTPException(status_code=404, detail="Startup not found")
     return updated_startup
@@ -450,13 +551,13 @@ def delete_startup(startup_id: int, db: Session = Depends(get_db)):
     return {"message": "Startup deleted successfully"}
 
 @app.get("/startups/{startup_id}/founders", response_model=List[schemas.Founder])
-def get_startup_founders(startup_id: int, db: Session = Depends(get_db)):
+async def get_startup_founders(startup_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get all founders associated with a specific startup."""
-    startup = crud.get_startup(db, startup_id=startup_id)
+    startup = await async_crud.get_startup(db, startup_id=startup_id)
     if startup is None:
         raise HTTPException(status_code=404, detail="Startup not found")
     
-    founders = crud.get_founders_by_startup_id(db, startup_id=startup_id)
+    founders = await async_crud.get_founders_by_startup_id(db, startup_id=startup_id)
     return founders
 
 # Help Request endpoints
@@ -465,11 +566,11 @@ def create_help_request(help_request: schemas.HelpRequestCreate, db: Session = D
     return crud.create_help_request(db=db, help_request=help_request)
 
 @app.get("/help-requests/", response_model=List[schemas.HelpRequest])
-def read_help_requests(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_help_requests(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     return crud.get_help_requests(db, skip=skip, limit=limit)
 
 @app.get("/help-requests/{help_request_id}", response_model=schemas.HelpRequest)
-def read_help_request(help_request_id: int, db: Session = Depends(get_db)):
+def read_help_request(help_request_id: int, db: Session = Depends(get_read_db)):
     help_request = crud.get_help_request(db, help_request_id=help_request_id)
     if help_request is None:
         raise HTTPException(status_code=404, detail="Help request not found")
@@ -492,14 +593,17 @@ def delete_help_request(help_request_id: int, db: Session = Depends(get_db)):
 # Hobby endpoints
 @app.post("/hobbies/", response_model=schemas.Hobby)
 def create_hobby(hobby: schemas.HobbyCreate, db: Session = Depends(get_db)):
-    return crud.create_hobby(db=db, hobby=hobby)
+    try:
+        return crud.create_hobby(db=db, hobby=hobby)
+    except crud.DuplicateNameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @app.get("/hobbies/", response_model=List[schemas.Hobby])
-def read_hobbies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_hobbies(db, skip=skip, limit=limit)
+async def read_hobbies(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_hobbies(db, skip=skip, limit=limit)
 
 @app.get("/hobbies/{hobby_id}", response_model=schemas.Hobby)
-def read_hobby(hobby_id: int, db: Session = Depends(get_db)):
+def read_hobby(hobby_id: int, db: Session = Depends(get_read_db)):
     hobby = crud.get_hobby(db, hobby_id=hobby_id)
     if hobby is None:
         raise HTTPException(status_code=404, detail="Hobby not found")
@@ -507,7 +611,10 @@ def read_hobby(hobby_id: int, db: Session = Depends(get_db)):
 
 @app.put("/hobbies/{hobby_id}", response_model=schemas.Hobby)
 def update_hobby(hobby_id: int, hobby: schemas.HobbyCreate, db: Session = Depends(get_db)):
-    updated_hobby = crud.update_hobby(db, hobby_id=hobby_id, hobby=hobby)
+    try:
+        updated_hobby = crud.update_hobby(db, hobby_id=hobby_id, hobby=hobby)
+    except crud.DuplicateNameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if updated_hobby is None:
         raise HTTPException(status_code=404, detail="Hobby not found")
     return updated_hobby
@@ -525,11 +632,11 @@ def create_event(event: schemas.EventCreate, db: Session = Depends(get_db), curr
     return crud.create_event(db=db, event=event)
 
 @app.get("/events/", response_model=List[schemas.Event])
-def read_events(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_events(db, skip=skip, limit=limit)
+async def read_events(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_events(db, skip=skip, limit=limit)
 
 @app.get("/events/{event_id}", response_model=schemas.Event)
-def read_event(event_id: int, db: Session = Depends(get_db)):
+def read_event(event_id: int, db: Session = Depends(get_read_db)):
     event = crud.get_event(db, event_id=event_id)
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -596,7 +703,7 @@ def claim_profile(founder_id: int, current_user: dict = Depends(get_current_user
         raise HTTPException(status_code=400, detail="Profile has already been claimed")
     
     # Check if email matches
-    if founder.email.lower() != user_email.lower():
+    if founder.email_normalized != models.normalize_email(user_email):
         raise HTTPException(status_code=403, detail="Email does not match profile")
     
     # Claim the profile
@@ -1,14 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Boolean, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from database import Base
 
+def normalize_name_key(name: str) -> str:
+    """Lookup key for names: lowercased, trimmed and whitespace-collapsed."""
+    return " ".join((name or "").split()).lower()
+
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address used for identity lookups."""
+    return (email or "").strip().lower()
+
 # Many-to-many relationship tables
 founder_skills = Table(
     'founder_skills',
     Base.metadata,
     Column('founder_id', Integer, ForeignKey('founders.id'), primary_key=True),
     Column('skill_id', Integer, ForeignKey('skills.id'), primary_key=True),
+    Index('ix_founder_skills_skill_id', 'skill_id'),  # the PK only covers founder_id-first lookups
     extend_existing=True
 )
 
@@ -17,6 +26,7 @@ founder_hobbies = Table(
     Base.metadata,
     Column('founder_id', Integer, ForeignKey('founders.id'), primary_key=True),
     Column('hobby_id', Integer, ForeignKey('hobbies.id'), primary_key=True),
+    Index('ix_founder_hobbies_hobby_id', 'hobby_id'),  # the PK only covers founder_id-first lookups
     extend_existing=True
 )
 
@@ -27,15 +37,16 @@ class Founder(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False)
+    email_normalized = Column(String(100), unique=True, index=True, nullable=False)  # lookup key for email matching
     bio = Column(Text)
     location = Column(String(100))
     linkedin_url = Column(String(200), nullable=False)
     twitter_url = Column(String(200))
     github_url = Column(String(200))
-    profile_image_url = Column(String(500))
-    profile_visible = Column(Boolean, default=True, nullable=False)
+    profile_image_url = Column(String(500), index=True)
+    profile_visible = Column(Boolean, default=True, nullable=False, index=True)
     auth0_user_id = Column(String(100), unique=True, nullable=True)  # Links founder to Auth0 user
-    startup_id = Column(Integer, ForeignKey('startups.id'), nullable=True)
+    startup_id = Column(Integer, ForeignKey('startups.id'), nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
@@ -45,12 +56,18 @@ class Founder(Base):
     startup = relationship("Startup", back_populates="founders")
     hobbies = relationship("Hobby", secondary=founder_hobbies, back_populates="founders")
 
+    @validates('email')
+    def _sync_email_normalized(self, key, value):
+        self.email_normalized = normalize_email(value)
+        return value
+
 class Skill(Base):
     __tablename__ = "skills"
     __table_args__ = {'extend_existing': True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, nullable=False)
+    name_key = Column(String(100), unique=True, index=True, nullable=False)  # normalized name for lookups
     category = Column(String(50))  # e.g., "Technical", "Marketing", "Business"
     description = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
@@ -58,12 +75,17 @@ class Skill(Base):
     # Relationships
     founders = relationship("Founder", secondary=founder_skills, back_populates="skills")
 
+    @validates('name')
+    def _sync_name_key(self, key, value):
+        self.name_key = normalize_name_key(value)
+        return value
+
 class HelpRequest(Base):
     __tablename__ = "help_requests"
     __table_args__ = {'extend_existing': True}
     
     id = Column(Integer, primary_key=True, index=True)
-    founder_id = Column(Integer, ForeignKey('founders.id'), nullable=False)
+    founder_id = Column(Integer, ForeignKey('founders.id'), nullable=False, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
     category = Column(String(50))  # e.g., "Technical", "Marketing", "Funding"
@@ -81,24 +103,31 @@ class Startup(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
+    name_key = Column(String(100), unique=True, index=True, nullable=False)  # normalized name for lookups
     description = Column(Text)
     industry = Column(String(100))
     stage = Column(String(50))  # e.g., "Idea", "MVP", "Seed", "Series A"
     website_url = Column(String(200))
     target_market = Column(String(200))
     revenue_arr = Column(String(100))  # Annual Recurring Revenue as string to allow formats like "$1M", "Pre-revenue", etc.
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     founders = relationship("Founder", back_populates="startup")
 
+    @validates('name')
+    def _sync_name_key(self, key, value):
+        self.name_key = normalize_name_key(value)
+        return value
+
 class Hobby(Base):
     __tablename__ = "hobbies"
     __table_args__ = {'extend_existing': True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, nullable=False)
+    name_key = Column(String(100), unique=True, index=True, nullable=False)  # normalized name for lookups
     category = Column(String(50))  # e.g., "Sports", "Games", "Arts", "Outdoor", "Indoor"
     description = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
@@ -106,6 +135,11 @@ class Hobby(Base):
     # Relationships
     founders = relationship("Founder", secondary=founder_hobbies, back_populates="hobbies")
 
+    @validates('name')
+    def _sync_name_key(self, key, value):
+        self.name_key = normalize_name_key(value)
+        return value
+
 class Event(Base):
     __tablename__ = "events"
     __table_args__ = {'extend_existing': True}
@@ -113,10 +147,25 @@ class Event(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text)
-    date_time = Column(DateTime, nullable=False)
+    date_time = Column(DateTime, nullable=False, index=True)
     location = Column(String(200))
     attendees = Column(Text)  # Store as text for now
     theme = Column(String(50))  # hiking, poker, basketball, pickleball, roundtable, group dinner
     link = Column(String(500))  # Link to Luma, Partiful, etc.
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class StoredImage(Base):
+    """Manifest of files in the upload store, kept in step with Founder.profile_image_url."""
+    __tablename__ = "stored_images"
+    __table_args__ = {'extend_existing': True}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), unique=True, index=True, nullable=False)  # storage key of the original
+    url = Column(String(500), unique=True, index=True, nullable=False)  # what Founder.profile_image_url stores
+    size = Column(Integer, nullable=False)
+    sha256 = Column(String(64))  # None for uploads from before content addressing
+    content_type = Column(String(100))
+    ref_count = Column(Integer, default=0, nullable=False)  # founders whose profile_image_url is this url
+    uploaded_at = Column(DateTime, server_default=func.now(), nullable=False)  # refreshed on deduplicated re-upload
+    orphaned_at = Column(DateTime, index=True)  # set while ref_count is 0; the GC deletes after a grace period
@@ -0,0 +1,180 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Optional
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
+import auth
+
+# Set PROFILER_ENABLED=false to leave the middleware out entirely
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_STORE_SIZE = int(os.getenv("PROFILE_STORE_SIZE", "50"))
+
+# Opt in per request with this header or query parameter (admins only)
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = "_profile=1"
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+_STDLIB_DIR = os.path.dirname(os.__file__)
+# run_in_threadpool workers: WorkerThread.run in this file, idle inside queue.get
+_ANYIO_WORKER_FILE = os.path.join("anyio", "_backends", "_asyncio.py")
+_QUEUE_FILE = os.sep + "queue.py"
+
+# id -> profile dict, oldest first
+profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+# One profiled request at a time, so samples of other threads are not mixed between profiles
+_active = threading.Lock()
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for root in (BACKEND_DIR, _STDLIB_DIR):
+        if filename.startswith(root):
+            filename = filename[len(root) + 1:]
+            break
+    else:
+        filename = filename.split("site-packages" + os.sep, 1)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+def _busy_worker(codes) -> bool:
+    """Whether a root-first stack is an AnyIO worker thread running a call (not parked in queue.get)."""
+    for index, code in enumerate(codes[:-1]):
+        if code.co_name == "run" and code.co_filename.endswith(_ANYIO_WORKER_FILE):
+            return not codes[index + 1].co_filename.endswith(_QUEUE_FILE)
+    return False
+
+class Sampler(threading.Thread):
+    """Samples the stacks of the request's threads every PROFILE_INTERVAL_MS into folded-stack counts.
+
+    The event loop thread is always sampled; threadpool workers (which run sync endpoints and
+    dependencies) only while they are executing a call rather than waiting for one. Other requests
+    served concurrently by this process can show up in the worker stacks.
+    """
+
+    def __init__(self, loop_thread_id: int, interval: float = PROFILE_INTERVAL_SECONDS, max_seconds: float = PROFILE_MAX_SECONDS):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        deadline = time.monotonic() + self.max_seconds
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval) and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                if thread_id != self.loop_thread_id and not _busy_worker(codes):
+                    continue
+                stack = [names.get(thread_id, str(thread_id)).replace(";", ":")] + [_frame_label(code) for code in codes]
+                self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self) -> str:
+        """Brendan Gregg's folded format ("root;...;leaf count"), readable by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def save_profile(profile: dict):
+    with _profiles_lock:
+        profiles[profile["id"]] = profile
+        while len(profiles) > PROFILE_STORE_SIZE:
+            profiles.popitem(last=False)
+
+def get_profile(profile_id: str) -> Optional[dict]:
+    with _profiles_lock:
+        return profiles.get(profile_id)
+
+def list_profiles():
+    """Summaries of stored profiles, newest first."""
+    with _profiles_lock:
+        stored = list(profiles.values())
+    return [{key: value for key, value in profile.items() if key != "folded"} for profile in reversed(stored)]
+
+def requested(scope) -> bool:
+    if PROFILE_QUERY_FLAG in scope.get("query_string", b"").decode("latin-1").split("&"):
+        return True
+    return any(name == PROFILE_HEADER for name, _ in scope.get("headers", ()))
+
+def _is_admin(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user = auth.get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    except Exception:
+        return False
+    return auth.is_admin_user(user.get("email", ""))
+
+async def authorized(scope) -> bool:
+    """Whether the caller's bearer token belongs to an admin (only checked for flagged requests)."""
+    authorization = next((value.decode("latin-1") for name, value in scope.get("headers", ()) if name == b"authorization"), "")
+    return await run_in_threadpool(_is_admin, authorization)
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware that runs admin-flagged requests under the sampling profiler.
+
+    Unflagged requests only pay for the flag check. A profiled response carries X-Profile-Id;
+    the folded stacks are then served by GET /admin/profiles/{id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not await authorized(scope) or not _active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        sampler = Sampler(threading.get_ident())
+        started_at = time.time()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            _active.release()
+            query = scope.get("query_string", b"").decode("latin-1")
+            save_profile({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"] + (f"?{query}" if query else ""),
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status_code,
+                "started_at": started_at,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "interval_ms": sampler.interval * 1000,
+                "samples": sampler.samples,
+                "folded": sampler.folded(),
+            })
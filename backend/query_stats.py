@@ -0,0 +1,155 @@
+import logging
+import os
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy import event
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# A request running the same statement shape more often than this is flagged as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+SLOW_QUERY_SECONDS = float(os.getenv("SQL_SLOW_QUERY_MS", "200")) / 1000
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SQL_SLOW_QUERY_LOG_SIZE", "200"))
+
+DB_QUERIES = metrics.REGISTRY.counter(
+    "db_queries_total", "SQL statements executed, by statement type.", ("operation",))
+DB_QUERY_LATENCY = metrics.REGISTRY.histogram(
+    "db_query_duration_seconds", "SQL statement latency, by statement type.", ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+DB_QUERIES_PER_REQUEST = metrics.REGISTRY.histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request, by route template.", ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+DB_N_PLUS_ONE = metrics.REGISTRY.counter(
+    "db_n_plus_one_total", "Requests that repeated one statement shape more than SQL_N_PLUS_ONE_THRESHOLD times.", ("route",))
+DB_SLOW_QUERIES = metrics.REGISTRY.counter(
+    "db_slow_queries_total", "SQL statements slower than SQL_SLOW_QUERY_MS.", ("operation",))
+
+# Most recent slow statements, newest last (see /admin/metrics/slow-queries)
+slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+class RequestQueryStats:
+    """SQL statements run on behalf of one HTTP request."""
+
+    __slots__ = ("count", "seconds", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        """(normalized statement, count) pairs that ran more than `threshold` times."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+def current() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\]|\$\d+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\]|\$\d+)\s*\)")
+_SPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Statement shape: whitespace collapsed, literals replaced and IN-lists folded to one placeholder."""
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _LITERALS.sub("?", shape)
+    return _PLACEHOLDER_LISTS.sub("(?...)", shape)
+
+def _operation(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+
+def _bind_count(parameters, executemany: bool) -> int:
+    if executemany and parameters:
+        return sum(len(row) for row in parameters)
+    return len(parameters) if parameters else 0
+
+def instrument_engine(engine):
+    """Time every statement on a (sync) engine and attribute it to the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        record(statement, parameters, executemany, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement gets no after_cursor_execute; drop its start time
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+def record(statement: str, parameters, executemany: bool, elapsed: float):
+    operation = _operation(statement)
+    DB_QUERIES.inc(operation)
+    DB_QUERY_LATENCY.observe(operation, value=elapsed)
+
+    stats = _current.get()
+    shape = None
+    if stats is not None:
+        shape = normalize_sql(statement)
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.shapes[shape] += 1
+
+    if elapsed >= SLOW_QUERY_SECONDS:
+        DB_SLOW_QUERIES.inc(operation)
+        entry = {
+            "at": time.time(),
+            "duration_ms": round(elapsed * 1000, 2),
+            "sql": shape or normalize_sql(statement),
+            "binds": _bind_count(parameters, executemany),
+            "executemany": executemany,
+        }
+        slow_queries.append(entry)
+        logger.warning("Slow query (%s ms, %s binds): %s", entry["duration_ms"], entry["binds"], entry["sql"],
+                       extra={"duration_ms": entry["duration_ms"], "binds": entry["binds"]})
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware that collects SQL stats per request.
+
+    Adds `Server-Timing: db;dur=<ms>;desc="<n> queries"` and `X-DB-Query-Count` to the response,
+    feeds the per-route query histogram and flags statement shapes repeated past the N+1 threshold.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode()))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None) or metrics.UNMATCHED_ROUTE
+            DB_QUERIES_PER_REQUEST.observe(route, value=stats.count)
+            repeated = stats.repeated()
+            if repeated:
+                DB_N_PLUS_ONE.inc(route)
+                shape, count = repeated[0]
+                logger.warning("Possible N+1 in %s %s: %sx %s", scope["method"], route, count, shape,
+                               extra={"route": route, "repeats": count})
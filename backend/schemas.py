@@ -115,6 +115,8 @@ class Founder(FounderBase):
 class FounderUploadResponse(BaseModel):
     message: str
     created_count: int
+    updated_count: int = 0
+    unchanged_count: int = 0
     errors: List[str]
 
 # Event schemas
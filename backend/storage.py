@@ -0,0 +1,221 @@
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+# "local" keeps uploads in UPLOAD_DIR on this container; "s3" uses any S3-compatible bucket
+# (AWS S3, MinIO, R2, ...) so every API replica sees the same images
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
+
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_PREFIX = os.getenv("S3_PREFIX", "uploads/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_REGION = os.getenv("S3_REGION") or None
+# Public base URL (bucket website, CDN) to redirect to; presigned URLs are used when unset
+S3_PUBLIC_BASE_URL = os.getenv("S3_PUBLIC_BASE_URL", "").rstrip("/")
+S3_PRESIGN_SECONDS = int(os.getenv("S3_PRESIGN_SECONDS", "3600"))
+# Files above this size are uploaded in parallel multipart chunks
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+# How long a positive HEAD result is reused; other replicas may delete the key meanwhile (0 disables)
+S3_STAT_CACHE_SECONDS = float(os.getenv("S3_STAT_CACHE_SECONDS", "5"))
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    mtime: float
+
+class LocalStorage:
+    """Uploads as plain files under UPLOAD_DIR; keys are paths relative to it."""
+
+    is_local = True
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def temp_dir(self) -> Path:
+        # Same filesystem as the destination so put_file is an atomic rename
+        return self.root
+
+    def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            st = os.stat(self.path(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return StoredObject(key, st.st_size, st.st_mtime)
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def put_file(self, local_path: str, key: str, content_type: str):
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(local_path, target)
+
+    def touch(self, key: str) -> bool:
+        """Refresh the mtime; False if the file no longer exists."""
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def read(self, key: str) -> bytes:
+        return self.path(key).read_bytes()
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        """Plain files directly under `prefix` (non-recursive, like an S3 delimiter listing)."""
+        directory = self.root / prefix if prefix else self.root
+        if not directory.is_dir():
+            return
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    st = entry.stat()
+                    yield StoredObject(f"{prefix}{entry.name}", st.st_size, st.st_mtime)
+
+    def redirect_url(self, key: str) -> Optional[str]:
+        # Served by the API itself (uploads.file_response)
+        return None
+
+class S3Storage:
+    """Uploads in an S3-compatible bucket; keys are object names below S3_PREFIX."""
+
+    is_local = False
+
+    # Positive HEAD results are cached briefly: content never changes under a key, but any replica
+    # may delete it (release/GC), and only the deleting replica forgets its own entry
+    STAT_CACHE_SIZE = 10_000
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None, region: Optional[str] = None,
+                 stat_cache_seconds: float = S3_STAT_CACHE_SECONDS):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.exceptions import ClientError
+
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.transfer_config = TransferConfig(multipart_threshold=S3_MULTIPART_THRESHOLD)
+        self.ClientError = ClientError
+        self.stat_cache_seconds = stat_cache_seconds
+        # key -> (expires at, StoredObject)
+        self._stat_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def object_name(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def temp_dir(self) -> Path:
+        return Path(tempfile.gettempdir())
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._stat_cache.pop(key, None)
+
+    def _is_missing(self, error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def stat(self, key: str) -> Optional[StoredObject]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._stat_cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self.object_name(key))
+        except self.ClientError as e:
+            if self._is_missing(e):
+                self._forget(key)
+                return None
+            raise
+        stored = StoredObject(key, head["ContentLength"], head["LastModified"].timestamp())
+        if self.stat_cache_seconds > 0:
+            with self._lock:
+                self._stat_cache[key] = (now + self.stat_cache_seconds, stored)
+                self._stat_cache.move_to_end(key)
+                if len(self._stat_cache) > self.STAT_CACHE_SIZE:
+                    self._stat_cache.popitem(last=False)
+        return stored
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    def put_file(self, local_path: str, key: str, content_type: str):
+        # upload_file streams from disk and switches to parallel multipart above the threshold
+        try:
+            self.client.upload_file(
+                local_path, self.bucket, self.object_name(key),
+                ExtraArgs={"ContentType": content_type, "CacheControl": "public, max-age=31536000, immutable"},
+                Config=self.transfer_config,
+            )
+        finally:
+            os.unlink(local_path)
+        self._forget(key)
+
+    def touch(self, key: str) -> bool:
+        """Refresh LastModified; False if the object no longer exists (deleted by another replica)."""
+        # S3 has no utime; copying an object onto itself (with replaced metadata) refreshes LastModified
+        name = self.object_name(key)
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket, Key=name, CopySource={"Bucket": self.bucket, "Key": name},
+                MetadataDirective="REPLACE",
+                ContentType=mimetypes.guess_type(key)[0] or "application/octet-stream",
+                CacheControl="public, max-age=31536000, immutable",
+            )
+        except self.ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+        finally:
+            self._forget(key)
+        return True
+
+    def read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=self.object_name(key))["Body"].read()
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_name(key))
+        self._forget(key)
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        strip = len(self.prefix)
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.object_name(prefix), Delimiter="/"):
+            for obj in page.get("Contents", []):
+                yield StoredObject(obj["Key"][strip:], obj["Size"], obj["LastModified"].timestamp())
+
+    def redirect_url(self, key: str) -> Optional[str]:
+        if S3_PUBLIC_BASE_URL:
+            return f"{S3_PUBLIC_BASE_URL}/{self.object_name(key)}"
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": self.object_name(key)}, ExpiresIn=S3_PRESIGN_SECONDS,
+        )
+
+def make_storage():
+    if STORAGE_BACKEND == "local":
+        return LocalStorage(UPLOAD_DIR)
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL, S3_REGION)
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r} (expected 'local' or 's3')")
+
+backend = make_storage()
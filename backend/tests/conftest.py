@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Tests import backend modules as top-level modules, like main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Module-level settings are read at import time; keep them away from the developer's data
+_tmp = tempfile.mkdtemp(prefix="scrappy-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/test.db")
+os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="scrappy-test-uploads-"))
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
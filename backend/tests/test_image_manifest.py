@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import images
+import models
+
+URL = "/uploads/shared.png"
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def add_founder(db, image_url):
+    db.add(models.Founder(
+        name="Ada", email="ada@example.com", linkedin_url="https://linkedin.com/in/ada", profile_image_url=image_url,
+    ))
+    db.commit()
+
+def test_unreferenced_upload_is_orphaned(db):
+    crud.record_stored_image(db, "shared.png", URL, 10, None, "image/png")
+    image = crud.get_stored_image_by_url(db, URL)
+    assert image.ref_count == 0
+    assert image.orphaned_at is not None
+
+def test_upload_already_referenced_is_not_orphaned(db):
+    add_founder(db, URL)
+    crud.record_stored_image(db, "shared.png", URL, 10, None, "image/png")
+    image = crud.get_stored_image_by_url(db, URL)
+    assert image.ref_count == 1
+    assert image.orphaned_at is None
+
+def test_orphaned_images_skip_referenced_rows(db):
+    crud.record_stored_image(db, "shared.png", URL, 10, None, "image/png")
+    crud.record_stored_image(db, "lonely.png", "/uploads/lonely.png", 10, None, "image/png")
+    # A referenced row with a stale orphaned_at must not be handed to the collector
+    image = crud.get_stored_image_by_url(db, URL)
+    image.ref_count = 1
+    db.commit()
+
+    cutoff = datetime.utcnow() + timedelta(seconds=1)
+    assert [image.filename for image in crud.get_orphaned_images(db, cutoff)] == ["lonely.png"]
+
+def test_gc_keeps_referenced_image_with_stale_ref_count(db):
+    crud.record_stored_image(db, "shared.png", URL, 10, None, "image/png")
+    add_founder(db, URL)
+    # A lost concurrent update left ref_count at 0 while a founder points at the image
+    image = crud.get_stored_image_by_url(db, URL)
+    assert image.ref_count == 0
+
+    cutoff = datetime.utcnow() + timedelta(seconds=1)
+    assert not crud.delete_stored_image_if_orphaned(db, image.id, cutoff)
+    db.rollback()
+    assert crud.get_stored_image_by_url(db, URL) is not None
+
+def test_collect_orphans_repairs_stale_ref_count(db, monkeypatch):
+    monkeypatch.setattr(images, "RELEASE_GRACE_SECONDS", -1)
+    crud.record_stored_image(db, "shared.png", URL, 10, None, "image/png")
+    add_founder(db, URL)
+
+    assert images.collect_orphans(db, batch_size=1) == 0
+    image = crud.get_stored_image_by_url(db, URL)
+    assert image.ref_count == 1
+    assert image.orphaned_at is None
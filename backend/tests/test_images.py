@@ -0,0 +1,56 @@
+import pytest
+
+import images
+import storage
+
+FORMATS = [
+    ("avif", "image/avif", "AVIF", {}),
+    ("webp", "image/webp", "WEBP", {}),
+    ("jpg", "image/jpeg", "JPEG", {}),
+]
+
+class KeySet:
+    """Storage stand-in that only answers exists()."""
+
+    def __init__(self, keys):
+        self.keys = set(keys)
+
+    def exists(self, key):
+        return key in self.keys
+
+@pytest.fixture
+def all_derivatives(monkeypatch):
+    monkeypatch.setattr(images, "ENABLED_FORMATS", FORMATS)
+    keys = [images.derivative_key("a.png", 256, ext) for ext, _, _, _ in FORMATS]
+    monkeypatch.setattr(storage, "backend", KeySet(keys))
+
+def media_type(accept):
+    found = images.negotiate("a.png", 256, accept)
+    return found and found[1]
+
+def test_parse_accept():
+    assert images.parse_accept("image/avif;q=0, image/webp ; q=0.8,*/*;q=bad, IMAGE/*") == {
+        "image/avif": 0.0, "image/webp": 0.8, "image/*": 1.0,
+    }
+
+def test_prefers_server_order_at_equal_quality(all_derivatives):
+    assert media_type("image/avif,image/webp,image/apng,image/*,*/*;q=0.8") == "image/avif"
+
+def test_q_values_order_formats(all_derivatives):
+    assert media_type("image/avif;q=0.5,image/webp;q=0.9") == "image/webp"
+
+def test_q_zero_excludes_format(all_derivatives):
+    assert media_type("image/avif;q=0,image/webp;q=0,*/*") == "image/jpeg"
+    assert media_type("image/avif;q=0,image/webp;q=0,image/jpeg;q=0") is None
+
+def test_no_substring_matches(all_derivatives):
+    assert media_type("image/avif-sequence,image/webpx,*/*") == "image/jpeg"
+
+def test_modern_formats_need_explicit_listing(all_derivatives):
+    assert media_type("*/*") == "image/jpeg"
+    assert media_type("") == "image/jpeg"
+
+def test_skips_missing_derivatives(monkeypatch):
+    monkeypatch.setattr(images, "ENABLED_FORMATS", FORMATS)
+    monkeypatch.setattr(storage, "backend", KeySet([images.derivative_key("a.png", 256, "jpg")]))
+    assert images.negotiate("a.png", 256, "image/avif,image/webp,*/*") == (images.derivative_key("a.png", 256, "jpg"), "image/jpeg")
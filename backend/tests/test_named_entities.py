@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import models
+import schemas
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    crud.clear_name_cache()
+    yield session
+    session.close()
+    crud.clear_name_cache()
+
+def test_create_startup_case_variant_is_a_duplicate(db):
+    acme = crud.create_startup(db, schemas.StartupCreate(name="Acme"))
+    with pytest.raises(crud.DuplicateNameError) as excinfo:
+        crud.create_startup(db, schemas.StartupCreate(name="ACME "))
+    assert excinfo.value.existing.id == acme.id
+    assert "Acme" in str(excinfo.value)
+    # The session is usable after the failed insert
+    assert [startup.name for startup in db.query(models.Startup)] == ["Acme"]
+
+def test_rename_onto_existing_name_is_a_duplicate(db):
+    crud.create_skill(db, schemas.SkillCreate(name="Python"))
+    rust = crud.create_skill(db, schemas.SkillCreate(name="Rust"))
+    with pytest.raises(crud.DuplicateNameError):
+        crud.update_skill(db, rust.id, schemas.SkillCreate(name="python"))
+    assert crud.get_skill(db, rust.id).name == "Rust"
+
+def test_hobby_case_variant_is_a_duplicate(db):
+    crud.create_hobby(db, schemas.HobbyCreate(name="Hiking"))
+    with pytest.raises(crud.DuplicateNameError):
+        crud.create_hobby(db, schemas.HobbyCreate(name="hiking"))
+
+def test_get_or_create_reuses_case_variant(db):
+    acme = crud.create_startup(db, schemas.StartupCreate(name="Acme"))
+    assert crud.get_or_create_startup_id(db, "acme", {}) == acme.id
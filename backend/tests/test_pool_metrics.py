@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+import time
+
+import database
+
+def slow_creator(delay):
+    def create():
+        time.sleep(delay)
+        return sqlite3.connect(":memory:", check_same_thread=False)
+    return create
+
+def make_pool(delay=0.0, **kwargs):
+    pool = database.InstrumentedQueuePool(slow_creator(delay), **kwargs)
+    pool.metrics = database.PoolMetrics("test")
+    return pool
+
+def test_connect_time_is_not_counted_as_checkout_wait():
+    pool = make_pool(delay=0.2, pool_size=1, max_overflow=0)
+    pool.connect().close()
+
+    metrics = pool.metrics
+    assert metrics.checkout_waits == 1
+    assert metrics.checkout_wait_max < 0.1
+    assert metrics.connect_time_max >= 0.2
+
+def test_queue_wait_is_counted():
+    pool = make_pool(pool_size=1, max_overflow=0, timeout=5)
+    held = pool.connect()
+    threading.Timer(0.2, held.close).start()
+    pool.connect().close()
+
+    assert pool.metrics.checkout_wait_max >= 0.15
+    assert pool.metrics.timeouts == 0
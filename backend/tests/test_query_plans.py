@@ -0,0 +1,8 @@
+from sqlalchemy import create_engine
+
+import check_query_plans
+
+def test_filtered_crud_queries_use_an_index(tmp_path):
+    results = check_query_plans.audit(create_engine(f"sqlite:///{tmp_path}/query_plans.db"))
+    assert results
+    assert check_query_plans.unexpected_scans(results) == []
@@ -0,0 +1,15 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+import query_stats
+
+def test_failed_statements_do_not_leak_start_times():
+    engine = create_engine("sqlite://")
+    query_stats.instrument_engine(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("query_start") == []
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import database
+
+# A replica URL that fails on first use, like a replica that has gone away
+DOWN_REPLICA = "sqlite:////nonexistent-dir/replica.db"
+
+class FakeMonitor:
+    def __init__(self):
+        self.errors = []
+
+    def mark_down(self, error):
+        self.errors.append(error)
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = FakeMonitor()
+    monkeypatch.setattr(database, "replica_monitor", monitor)
+    return monitor
+
+def test_failed_replica_read_retries_on_primary(monitor):
+    primary = create_engine("sqlite://")
+    session = database.ReplicaSession(bind=create_engine(DOWN_REPLICA), info={"primary_bind": primary})
+    try:
+        assert session.execute(text("SELECT 1")).scalar() == 1
+        assert session.scalar(text("SELECT 2")) == 2
+    finally:
+        session.close()
+    assert session.bind is primary
+    assert len(monitor.errors) == 1
+
+def test_failed_async_replica_read_retries_on_primary(monitor):
+    async def run():
+        primary = create_async_engine("sqlite+aiosqlite://")
+        session = AsyncSession(
+            create_async_engine(f"sqlite+aiosqlite:///{DOWN_REPLICA[len('sqlite:///'):]}"),
+            sync_session_class=database.ReplicaSession, info={"primary_bind": primary.sync_engine},
+        )
+        async with session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            assert await session.scalar(text("SELECT 2")) == 2
+
+    asyncio.run(run())
+    assert len(monitor.errors) == 1
+
+def test_replica_error_without_primary_is_raised(monitor):
+    session = database.ReplicaSession(bind=create_engine(DOWN_REPLICA))
+    with pytest.raises(OperationalError):
+        session.execute(text("SELECT 1"))
+    session.close()
+    assert monitor.errors == []
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import tempfile
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from moto import mock_s3
+from starlette.requests import Request
+
+import storage
+import uploads
+
+BUCKET = "scrappy-test"
+PREFIX = "uploads/"
+
+@pytest.fixture
+def s3():
+    with mock_s3():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield
+
+@pytest.fixture
+def store(s3):
+    return storage.S3Storage(BUCKET, PREFIX, region="us-east-1")
+
+@pytest.fixture
+def active_store(store, monkeypatch):
+    monkeypatch.setattr(storage, "backend", store)
+    return store
+
+def temp_file(content: bytes) -> str:
+    fd, path = tempfile.mkstemp()
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    return path
+
+def get(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""})
+
+def test_put_file_stat_and_read(store):
+    path = temp_file(b"png bytes")
+    store.put_file(path, "k.png", "image/png")
+
+    assert not os.path.exists(path)
+    stored = store.stat("k.png")
+    assert (stored.key, stored.size) == ("k.png", 9)
+    assert store.read("k.png") == b"png bytes"
+    head = store.client.head_object(Bucket=BUCKET, Key="uploads/k.png")
+    assert head["ContentType"] == "image/png"
+    assert "immutable" in head["CacheControl"]
+
+def test_put_file_multipart(store):
+    store.transfer_config = TransferConfig(multipart_threshold=5 * 1024 * 1024, multipart_chunksize=5 * 1024 * 1024)
+    content = os.urandom(11 * 1024 * 1024)
+    store.put_file(temp_file(content), "big.png", "image/png")
+
+    assert store.stat("big.png").size == len(content)
+    assert store.read("big.png") == content
+    # Multipart uploads get an ETag of the form "<md5>-<parts>"
+    assert "-" in store.client.head_object(Bucket=BUCKET, Key="uploads/big.png")["ETag"]
+
+def test_stat_missing(store):
+    assert store.stat("missing.png") is None
+    assert not store.exists("missing.png")
+
+def test_touch_refreshes_and_reports_missing(store):
+    store.put_file(temp_file(b"x"), "k.png", "image/png")
+
+    assert store.touch("k.png") is True
+    assert store.read("k.png") == b"x"
+    assert store.touch("gone.png") is False
+
+def test_delete(store):
+    store.put_file(temp_file(b"x"), "k.png", "image/png")
+    assert store.exists("k.png")
+
+    store.delete("k.png")
+    assert not store.exists("k.png")
+    store.delete("k.png")  # deleting a missing key is not an error
+
+def test_list_is_non_recursive(store):
+    for key in ("a.png", "b.png", "thumbs/a-64.webp"):
+        store.put_file(temp_file(b"x"), key, "image/png")
+
+    assert sorted(obj.key for obj in store.list()) == ["a.png", "b.png"]
+    assert [obj.key for obj in store.list("thumbs/")] == ["thumbs/a-64.webp"]
+
+def test_delete_on_another_replica(s3):
+    replica_a = storage.S3Storage(BUCKET, PREFIX, region="us-east-1")
+    replica_b = storage.S3Storage(BUCKET, PREFIX, region="us-east-1")
+    replica_a.put_file(temp_file(b"x"), "k.png", "image/png")
+    assert replica_a.exists("k.png")
+
+    replica_b.delete("k.png")
+
+    # A's positive HEAD may still be cached, but touch() sees the object is gone
+    assert replica_a.touch("k.png") is False
+    assert not replica_a.exists("k.png")
+
+def test_stat_cache_expires(s3):
+    replica_a = storage.S3Storage(BUCKET, PREFIX, region="us-east-1", stat_cache_seconds=0)
+    replica_b = storage.S3Storage(BUCKET, PREFIX, region="us-east-1")
+    replica_a.put_file(temp_file(b"x"), "k.png", "image/png")
+    assert replica_a.exists("k.png")
+
+    replica_b.delete("k.png")
+    assert not replica_a.exists("k.png")
+
+def test_reupload_after_delete_on_another_replica(active_store, s3):
+    other = storage.S3Storage(BUCKET, PREFIX, region="us-east-1")
+    assert uploads._commit_temp(temp_file(b"image"), "k.png", "image/png") is True
+    assert active_store.exists("k.png")
+
+    other.delete("k.png")
+    path = temp_file(b"image")
+    uploads._commit_temp(path, "k.png", "image/png")
+
+    assert not os.path.exists(path)
+    assert active_store.read("k.png") == b"image"
+
+def test_reupload_of_existing_object_is_deduplicated(active_store):
+    assert uploads._commit_temp(temp_file(b"image"), "k.png", "image/png") is True
+    path = temp_file(b"image")
+
+    assert uploads._commit_temp(path, "k.png", "image/png") is False
+    assert not os.path.exists(path)
+
+def test_serve_key_redirects_to_presigned_url(active_store, monkeypatch):
+    monkeypatch.setattr(storage, "S3_PUBLIC_BASE_URL", "")
+    active_store.put_file(temp_file(b"x"), "k.png", "image/png")
+
+    response = asyncio.run(uploads.serve_key(get("/uploads/k.png"), "k.png", "image/png"))
+
+    assert response.status_code == 302
+    location = response.headers["location"]
+    assert f"{BUCKET}" in location and "uploads/k.png" in location and "Signature" in location
+    assert response.headers["cache-control"] == f"private, max-age={storage.S3_PRESIGN_SECONDS // 2}"
+
+def test_serve_key_redirects_to_public_base_url(active_store, monkeypatch):
+    monkeypatch.setattr(storage, "S3_PUBLIC_BASE_URL", "https://cdn.example.com")
+    active_store.put_file(temp_file(b"x"), "k.png", "image/png")
+
+    response = asyncio.run(uploads.serve_key(get("/uploads/k.png"), "k.png", "image/png"))
+
+    assert response.status_code == 302
+    assert response.headers["location"] == "https://cdn.example.com/uploads/k.png"
+    assert response.headers["cache-control"] == uploads.CACHE_CONTROL
+
+def test_serve_key_missing_object_is_404(active_store):
+    with pytest.raises(uploads.HTTPException) as excinfo:
+        asyncio.run(uploads.serve_key(get("/uploads/missing.png"), "missing.png", "image/png"))
+    assert excinfo.value.status_code == 404
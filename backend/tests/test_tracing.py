@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+import tracing
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+def test_incoming_trace_id_is_kept_when_sampled(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_SAMPLE_RATIO", 1.0)
+    assert tracing._new_root(f"00-{TRACE_ID}-{PARENT_ID}-00") == (TRACE_ID, PARENT_ID)
+    assert tracing._new_root(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID)
+
+def test_ratio_applies_to_sampled_incoming_traces(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_SAMPLE_RATIO", 0.0)
+    assert tracing._new_root(f"00-{TRACE_ID}-{PARENT_ID}-01") is None
+    assert tracing._new_root("") is None
+
+def test_ratio_is_decided_by_trace_id(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_SAMPLE_RATIO", 0.5)
+    low, high = "0" * 16 + "1" * 16, "0" * 16 + "f" * 16
+    assert tracing._new_root(f"00-{low}-{PARENT_ID}-00") == (low, PARENT_ID)
+    assert tracing._new_root(f"00-{high}-{PARENT_ID}-01") is None
+
+def test_new_trace_without_traceparent(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_SAMPLE_RATIO", 1.0)
+    trace_id, parent_id = tracing._new_root("not-a-traceparent")
+    assert len(trace_id) == 32 and parent_id is None
+
+def test_failed_statements_do_not_leak_start_times(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    engine = create_engine("sqlite://")
+    tracing.instrument_engine(engine)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("trace_start") == []
@@ -0,0 +1,69 @@
+import asyncio
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+import uploads
+
+LIMIT = 100_000
+CHUNK = b"x" * 65536
+
+def make_app():
+    app = FastAPI()
+
+    @app.post(uploads.UPLOAD_PATH)
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(uploads.UploadSizeLimitMiddleware, limit=LIMIT)
+    return app
+
+def multipart(payload: bytes) -> bytes:
+    return (
+        b"--abc\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+        b"Content-Type: image/png\r\n\r\n" + payload + b"\r\n--abc--\r\n"
+    )
+
+HEADERS = {"content-type": "multipart/form-data; boundary=abc"}
+
+def test_small_upload_passes():
+    response = TestClient(make_app()).post(uploads.UPLOAD_PATH, content=multipart(b"png"), headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json() == {"size": 3}
+
+def test_content_length_over_limit_is_rejected():
+    response = TestClient(make_app()).post(uploads.UPLOAD_PATH, content=multipart(b"x" * LIMIT), headers=HEADERS)
+    assert response.status_code == 413
+
+def test_chunked_upload_over_limit_is_rejected():
+    def body():
+        yield multipart(b"")[:-9]
+        for _ in range(300):
+            yield CHUNK
+
+    response = TestClient(make_app()).post(uploads.UPLOAD_PATH, content=body(), headers=HEADERS)
+    assert response.status_code == 413
+
+def test_chunked_body_stops_being_read_at_the_limit():
+    """The body is cut off as it streams, not after the whole request has been spooled."""
+    chunks_total = 300
+    consumed = 0
+    sent = []
+
+    async def receive():
+        nonlocal consumed
+        consumed += 1
+        body = multipart(b"")[:-9] if consumed == 1 else CHUNK
+        return {"type": "http.request", "body": body, "more_body": consumed < chunks_total}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": uploads.UPLOAD_PATH, "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=abc"), (b"transfer-encoding", b"chunked")],
+    }
+    asyncio.run(make_app()(scope, receive, send))
+    assert sent[0]["status"] == 413
+    # the preamble, then the chunks up to and including the one that crosses the limit
+    assert consumed <= LIMIT // len(CHUNK) + 2
@@ -0,0 +1,364 @@
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import requests
+from sqlalchemy import event
+import query_stats
+
+logger = logging.getLogger(__name__)
+
+# "none" (default), "file" (JSON lines in TRACING_FILE) or "otlp" (OTLP/HTTP JSON to a collector)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").strip().lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318").rstrip("/")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "scrappy-kb-api")
+# Fraction of requests recorded, decided from the trace id (the caller's, if it sent one) so the
+# decision does not depend on the caller's sampled flag
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+TRACING_BATCH_SIZE = int(os.getenv("TRACING_BATCH_SIZE", "512"))
+TRACING_FLUSH_SECONDS = float(os.getenv("TRACING_FLUSH_SECONDS", "5"))
+TRACING_QUEUE_SIZE = int(os.getenv("TRACING_QUEUE_SIZE", "4096"))
+
+ENABLED = TRACING_EXPORTER != "none"
+
+# W3C trace-context: version-traceid-parentid-flags
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+SPAN_KIND_INTERNAL, SPAN_KIND_SERVER, SPAN_KIND_CLIENT = 1, 2, 3
+
+class Span:
+    """One timed operation; finished spans are handed to the exporter."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "status", "status_message", "events")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int = SPAN_KIND_INTERNAL, attributes: Optional[dict] = None):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.status = "unset"
+        self.status_message = ""
+        self.events = []
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException):
+        self.status = "error"
+        self.status_message = str(error)
+        self.events.append({
+            "name": "exception",
+            "time_ns": time.time_ns(),
+            "attributes": {"exception.type": type(error).__name__, "exception.message": str(error)},
+        })
+
+    def end(self, end_ns: Optional[int] = None):
+        self.end_ns = end_ns or time.time_ns()
+        _processor.submit(self)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "status_message": self.status_message,
+            "events": self.events,
+        }
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def span(name: str, attributes: Optional[dict] = None, kind: int = SPAN_KIND_INTERNAL):
+    """Child span of the current span; a no-op outside a recorded trace or with tracing off."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, parent.trace_id, parent.span_id, kind, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+def traced(func=None, *, name: Optional[str] = None):
+    """Decorator wrapping each call of a sync or async function in a span."""
+    if func is None:
+        return functools.partial(traced, name=name)
+    span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            with span(span_name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current_span.get() is None:
+            return func(*args, **kwargs)
+        with span(span_name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def instrument_module(module_name: str):
+    """Wrap every public function defined in a module (e.g. crud) with @traced, in place.
+
+    Generator functions are left alone: their span would close before any work happened.
+    """
+    if not ENABLED:
+        return
+    module = sys.modules[module_name]
+    for attr, value in list(vars(module).items()):
+        if (inspect.isfunction(value) and value.__module__ == module_name and not attr.startswith("_")
+                and not inspect.isgeneratorfunction(value)):
+            setattr(module, attr, traced(value))
+
+def instrument_engine(engine):
+    """One client span per SQL statement, parented to whatever span issued it."""
+    if not ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("trace_start", []).append(time.time_ns())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start_ns = conn.info["trace_start"].pop()
+        parent = _current_span.get()
+        if parent is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        sql_span = Span(f"db.{operation}", parent.trace_id, parent.span_id, SPAN_KIND_CLIENT, {
+            "db.system": engine.dialect.name,
+            "db.statement": query_stats.normalize_sql(statement),
+            "db.executemany": executemany,
+        })
+        sql_span.start_ns = start_ns
+        sql_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement gets no after_cursor_execute; drop its start time
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("trace_start"):
+            conn.info["trace_start"].pop()
+
+def _sampled(trace_id: str) -> bool:
+    """TRACING_SAMPLE_RATIO applied to the low 64 bits of the trace id, like OTel's TraceIdRatioBased."""
+    return int(trace_id[16:], 16) < TRACING_SAMPLE_RATIO * (1 << 64)
+
+def _new_root(traceparent: str) -> Optional[tuple]:
+    """(trace_id, parent_span_id) for a request, or None when it is not sampled."""
+    match = TRACEPARENT.match(traceparent.strip().lower()) if traceparent else None
+    if match and match.group(1) != "0" * 32:
+        trace_id, parent_id = match.group(1), match.group(2)
+    else:
+        trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+    return (trace_id, parent_id) if _sampled(trace_id) else None
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a server span per request.
+
+    Continues the caller's trace when a W3C `traceparent` header is present (the frontend sends
+    one) and returns the server span's context in `traceresponse`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = next((value.decode("latin-1") for name, value in scope.get("headers", ()) if name == b"traceparent"), "")
+        root = _new_root(traceparent)
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        server_span = Span(f"{scope['method']} {scope['path']}", root[0], root[1], SPAN_KIND_SERVER, {
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        })
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                server_span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    server_span.status = "error"
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"traceresponse", server_span.traceparent.encode())]}
+            await send(message)
+
+        token = _current_span.set(server_span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            server_span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                server_span.name = f"{scope['method']} {route}"
+                server_span.set_attribute("http.route", route)
+            server_span.end()
+
+class FileExporter:
+    """Finished spans as JSON lines, for inspecting traces without a collector."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for finished in spans:
+                f.write(json.dumps({"service": SERVICE_NAME, **finished.to_dict()}, default=str) + "\n")
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_attributes(attributes: dict) -> list:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+class OtlpHttpExporter:
+    """OTLP/HTTP with JSON encoding (POST {endpoint}/v1/traces), accepted by the OpenTelemetry Collector, Jaeger and Tempo."""
+
+    STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+    def __init__(self, endpoint: str):
+        self.url = f"{endpoint}/v1/traces"
+        self.session = requests.Session()
+
+    def export(self, spans):
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": "scrappy-kb"},
+                "spans": [{
+                    "traceId": finished.trace_id,
+                    "spanId": finished.span_id,
+                    "parentSpanId": finished.parent_id or "",
+                    "name": finished.name,
+                    "kind": finished.kind,
+                    "startTimeUnixNano": str(finished.start_ns),
+                    "endTimeUnixNano": str(finished.end_ns),
+                    "attributes": _otlp_attributes(finished.attributes),
+                    "events": [
+                        {"name": e["name"], "timeUnixNano": str(e["time_ns"]), "attributes": _otlp_attributes(e["attributes"])}
+                        for e in finished.events
+                    ],
+                    "status": {"code": self.STATUS_CODES[finished.status], "message": finished.status_message},
+                } for finished in spans],
+            }],
+        }]}
+        response = self.session.post(self.url, json=payload, timeout=10)
+        response.raise_for_status()
+
+class BatchProcessor:
+    """Queues finished spans and exports them in batches from a background thread."""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.queue = queue.Queue(TRACING_QUEUE_SIZE)
+        self.dropped = 0
+        self._wake = threading.Event()
+        self._export_lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, finished: Span):
+        if self.exporter is None:
+            return
+        try:
+            self.queue.put_nowait(finished)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._thread is None:
+            with self._export_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+        if self.queue.qsize() >= TRACING_BATCH_SIZE:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(TRACING_FLUSH_SECONDS)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Export everything queued so far, in batches of TRACING_BATCH_SIZE."""
+        if self.exporter is None:
+            return
+        with self._export_lock:
+            while True:
+                batch = []
+                while len(batch) < TRACING_BATCH_SIZE:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                try:
+                    self.exporter.export(batch)
+                except Exception as e:
+                    logger.warning("Exporting %s span(s) failed: %s", len(batch), e)
+
+def make_exporter():
+    if TRACING_EXPORTER == "none":
+        return None
+    if TRACING_EXPORTER == "file":
+        return FileExporter(TRACING_FILE)
+    if TRACING_EXPORTER == "otlp":
+        return OtlpHttpExporter(OTLP_ENDPOINT)
+    raise RuntimeError(f"Unknown TRACING_EXPORTER {TRACING_EXPORTER!r} (expected 'none', 'file' or 'otlp')")
+
+_processor = BatchProcessor(make_exporter())
+atexit.register(_processor.flush)
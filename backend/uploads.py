@@ -0,0 +1,339 @@
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+import tempfile
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
+from starlette.concurrency import run_in_threadpool
+import storage
+
+UPLOAD_DIR = storage.UPLOAD_DIR
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Room for the multipart boundary and part headers around the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+# Leading bytes of each accepted image format -> (extension, media type)
+IMAGE_SIGNATURES = [
+    (0, b"\xff\xd8\xff", ("jpg", "image/jpeg")),
+    (0, b"\x89PNG\r\n\x1a\n", ("png", "image/png")),
+    (0, b"GIF87a", ("gif", "image/gif")),
+    (0, b"GIF89a", ("gif", "image/gif")),
+    (8, b"WEBP", ("webp", "image/webp")),
+    (4, b"ftypavif", ("avif", "image/avif")),
+    (4, b"ftypavis", ("avif", "image/avif")),
+]
+
+# Uploads are named after the sha256 of their content, so a URL's bytes never change and may be cached forever
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET",
+    "Access-Control-Allow-Headers": "*",
+}
+
+# Plain file names only: no separators, no leading dot, so nothing outside the upload store is reachable
+SAFE_FILENAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,254}$")
+
+# <sha256 hex>.<ext>; older uploads keep their uuid names
+CONTENT_ADDRESSED_NAME = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+$")
+
+URL_PREFIX = "/uploads/"
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+@lru_cache(maxsize=64)
+def content_type_for(filename: str) -> str:
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+def make_etag(path: Path, st: os.stat_result) -> str:
+    # The content hash is stable across re-uploads and replicas; otherwise fall back to mtime-size
+    match = CONTENT_ADDRESSED_NAME.match(path.name)
+    if match:
+        return f'"{match.group(1)}"'
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+def upload_url(filename: str) -> str:
+    return f"{URL_PREFIX}{filename}"
+
+def filename_from_url(url: Optional[str]) -> Optional[str]:
+    """The upload file name behind a stored profile_image_url, or None for external URLs."""
+    if not url or not url.startswith(URL_PREFIX):
+        return None
+    filename = url[len(URL_PREFIX):]
+    return filename if SAFE_FILENAME.match(filename) else None
+
+def not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the file's validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into an inclusive (start, end); None if it cannot be satisfied.
+
+    Multi-range requests raise ValueError so the caller can fall back to the full body.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        raise ValueError(header)
+    first, last = match.groups()
+    if not first and not last:
+        raise ValueError(header)
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+def read_slice(path: Path, start: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+def check_filename(filename: str):
+    if not SAFE_FILENAME.match(filename):
+        raise HTTPException(status_code=404, detail="File not found", headers=CORS_HEADERS)
+
+def stat_file(path: Path) -> os.stat_result:
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        # 404 still carries CORS headers so the frontend can handle it gracefully
+        raise HTTPException(status_code=404, detail="File not found", headers=CORS_HEADERS)
+    return st
+
+async def call_storage(fn, *args):
+    """Run a storage call inline for local disk, on the threadpool for network-backed stores."""
+    if storage.backend.is_local:
+        return fn(*args)
+    return await run_in_threadpool(fn, *args)
+
+async def serve_upload(request: Request, filename: str) -> Response:
+    """Serve one uploaded file with a single stat() and long-lived cache validators."""
+    check_filename(filename)
+    return await serve_key(request, filename, content_type_for(filename))
+
+async def serve_key(request: Request, key: str, media_type: str,
+                    cache_control: str = CACHE_CONTROL, extra_headers: Optional[dict] = None) -> Response:
+    """Serve a stored object: from local disk directly, or by redirecting to the object store."""
+    backend = storage.backend
+    if backend.is_local:
+        path = backend.path(key)
+        return await file_response(request, path, stat_file(path), media_type, cache_control, extra_headers)
+
+    if await call_storage(backend.stat, key) is None:
+        raise HTTPException(status_code=404, detail="File not found", headers=CORS_HEADERS)
+    url = await call_storage(backend.redirect_url, key)
+    if not storage.S3_PUBLIC_BASE_URL:
+        # Presigned URLs expire; the redirect itself must not outlive them
+        cache_control = f"private, max-age={storage.S3_PRESIGN_SECONDS // 2}"
+    return RedirectResponse(url, status_code=302, headers={**CORS_HEADERS, "Cache-Control": cache_control, **(extra_headers or {})})
+
+async def file_response(request: Request, path: Path, st: os.stat_result, media_type: str,
+                        cache_control: str = CACHE_CONTROL, extra_headers: Optional[dict] = None) -> Response:
+    """Answer a GET for an already-stat()ed file: 304, 206/416 for a byte range, or the full body."""
+    etag = make_etag(path, st)
+    headers = {
+        **CORS_HEADERS,
+        "Cache-Control": cache_control,
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        **(extra_headers or {}),
+    }
+
+    if not_modified(request, etag, st.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, st.st_size)
+        except ValueError:
+            byte_range = ()
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{st.st_size}"})
+        if byte_range:
+            start, end = byte_range
+            body = await run_in_threadpool(read_slice, path, start, end - start + 1)
+            return Response(
+                content=body,
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{st.st_size}"},
+            )
+
+    # Passing stat_result stops FileResponse from stat()ing the file a second time
+    return FileResponse(path, stat_result=st, media_type=media_type, headers=headers)
+
+def detect_image_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """Identify an image from its magic bytes; the client's content_type and file name are not trusted."""
+    for offset, signature, image_type in IMAGE_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if signature == b"WEBP" and not head.startswith(b"RIFF"):
+                continue
+            return image_type
+    return None
+
+UPLOAD_PATH = "/upload-image/"
+
+class UploadTooLarge(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=413, detail=f"Image exceeds the {UPLOAD_MAX_BYTES} byte limit")
+
+def declared_too_large(headers, limit: int) -> bool:
+    """True if the request's Content-Length alone is over limit (chunked requests have none)."""
+    for name, value in headers:
+        if name == b"content-length":
+            try:
+                return int(value) > limit
+            except ValueError:
+                return False
+    return False
+
+class UploadSizeLimitMiddleware:
+    """Pure ASGI middleware capping the request body of POST /upload-image/.
+
+    Content-Length is checked before the body is read, and the body is counted as it streams in,
+    so a chunked request is cut off at the same limit instead of being spooled in full by the
+    multipart parser (which runs before auth).
+    """
+
+    def __init__(self, app, limit: Optional[int] = None):
+        self.app = app
+        self.limit = limit if limit is not None else UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != UPLOAD_PATH:
+            await self.app(scope, receive, send)
+            return
+        if declared_too_large(scope.get("headers", ()), self.limit):
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.limit:
+                    raise UploadTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            # FastAPI normally turns it into the 413 itself; this covers reads outside its handlers
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope, receive, send):
+        error = UploadTooLarge()
+        await JSONResponse(status_code=error.status_code, content={"detail": error.detail})(scope, receive, send)
+
+def open_temp() -> Tuple[int, str]:
+    # Dot-prefixed so a partial file can never match SAFE_FILENAME and be served
+    fd, path = tempfile.mkstemp(dir=storage.backend.temp_dir(), prefix=".upload-", suffix=".part")
+    # mkstemp creates 0600 files; uploads are public once renamed
+    os.fchmod(fd, 0o644)
+    return fd, path
+
+def discard(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+class SavedUpload(NamedTuple):
+    filename: str
+    size: int
+    sha256: str
+    content_type: str
+    created: bool  # False when identical content was already stored
+
+def _write_chunk(out, hasher, chunk: bytes):
+    hasher.update(chunk)
+    out.write(chunk)
+
+def _commit_temp(temp_path: str, filename: str, content_type: str) -> bool:
+    """Move a finished upload into the store; False if identical content was already stored."""
+    # Refresh mtime so the release grace period protects the re-upload too; touch() fails if the
+    # object was deleted since exists() looked (e.g. GC on another replica), so store it again
+    if storage.backend.exists(filename) and storage.backend.touch(filename):
+        discard(temp_path)
+        return False
+    storage.backend.put_file(temp_path, filename, content_type)
+    return True
+
+async def save_upload(file: UploadFile) -> SavedUpload:
+    """Stream an uploaded image to the upload store in chunks.
+
+    Disk I/O and hashing run on the threadpool so large uploads never block the event loop.
+    The size limit is enforced while streaming. The file is named after its sha256, so
+    re-uploading the same image reuses the stored copy and its URL. A new file only appears
+    under its final name once it is complete (an atomic rename locally, a multipart put on S3).
+    """
+    fd, temp_path = await run_in_threadpool(open_temp)
+    out = os.fdopen(fd, "wb")
+    hasher = hashlib.sha256()
+    try:
+        size = 0
+        image_type = None
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > UPLOAD_MAX_BYTES:
+                raise UploadTooLarge()
+            if image_type is None:
+                image_type = detect_image_type(chunk)
+                if image_type is None:
+                    raise HTTPException(status_code=400, detail="File must be a JPEG, PNG, GIF, WebP or AVIF image")
+            await run_in_threadpool(_write_chunk, out, hasher, chunk)
+        if image_type is None:
+            raise HTTPException(status_code=400, detail="File is empty")
+        await run_in_threadpool(out.close)
+
+        sha256 = hasher.hexdigest()
+        filename = f"{sha256}.{image_type[0]}"
+        created = await run_in_threadpool(_commit_temp, temp_path, filename, image_type[1])
+        return SavedUpload(filename, size, sha256, image_type[1], created)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(discard, temp_path)
+        raise
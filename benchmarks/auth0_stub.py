@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Local Auth0 stand-in for load-testing authenticated endpoints offline.
+
+Generates an RSA key pair, serves /.well-known/jwks.json and /userinfo over HTTP, and mints RS256
+access tokens with configurable claims. Start the API with AUTH0_DOMAIN set to the stand-in's URL
+(and the same AUTH0_AUDIENCE) and backend/auth.py verifies its tokens exactly like Auth0's,
+including the JWKS fetch and the /userinfo lookup for tokens without an email claim.
+
+As a library (benchmarks/endpoint_suite.py):
+    with Auth0Stub() as auth0:
+        env = auth0.env()                      # AUTH0_DOMAIN / AUTH0_AUDIENCE for the API process
+        token = auth0.mint("auth0|bench-1", email="someone@example.com")
+
+Standalone:
+    python benchmarks/auth0_stub.py [--port 9400] [--email admin@scrappyfounders.com] [--claim key=value ...]
+"""
+
+import argparse
+import base64
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwt
+
+DEFAULT_AUDIENCE = "http://localhost:8000"
+DEFAULT_ADMIN_EMAIL = "admin@scrappyfounders.com"
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+class Auth0Stub:
+    """JWKS and /userinfo server on 127.0.0.1 plus a token minter sharing its key."""
+
+    def __init__(self, port: int = 0, audience: str = DEFAULT_AUDIENCE, lifetime: int = 3600):
+        self.audience = audience
+        self.lifetime = lifetime
+        self.kid = uuid.uuid4().hex[:16]
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._private_pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+        numbers = key.public_key().public_numbers()
+        self.jwks = {"keys": [{
+            "kty": "RSA", "kid": self.kid, "use": "sig", "alg": "RS256",
+            "n": _b64url_uint(numbers.n), "e": _b64url_uint(numbers.e),
+        }]}
+        self.requests = {"jwks": 0, "userinfo": 0}
+        # sub -> email served by /userinfo for tokens minted without an email claim
+        self.users = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def issuer(self) -> str:
+        return f"{self.url}/"
+
+    def env(self) -> dict:
+        """Environment for an API process that should trust this stand-in."""
+        return {"AUTH0_DOMAIN": self.url, "AUTH0_AUDIENCE": self.audience}
+
+    def mint(self, sub: str, email: Optional[str] = None, email_in_token: bool = False, expires_in: Optional[int] = None, **claims) -> str:
+        """RS256 access token for `sub`.
+
+        Like Auth0 access tokens, the email is left out of the token by default and served from
+        /userinfo instead; pass email_in_token=True to embed it. Extra claims are added as given.
+        """
+        now = int(time.time())
+        payload = {
+            "iss": self.issuer, "sub": sub, "aud": self.audience,
+            "iat": now, "exp": now + (expires_in if expires_in is not None else self.lifetime),
+            "scope": "openid profile email",
+        }
+        if email is not None:
+            if email_in_token:
+                payload["email"] = email
+            else:
+                self.users[sub] = email
+        payload.update(claims)
+        return jwt.encode(payload, self._private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+    def _userinfo(self, token: str) -> Optional[dict]:
+        try:
+            payload = jwt.decode(token, self.jwks["keys"][0], algorithms=["RS256"], audience=self.audience, issuer=self.issuer)
+        except JWTError:
+            return None
+        email = payload.get("email") or self.users.get(payload["sub"], "")
+        return {"sub": payload["sub"], "email": email, "email_verified": True}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/.well-known/jwks.json":
+                    stub.requests["jwks"] += 1
+                    self._send(200, stub.jwks)
+                elif self.path == "/userinfo":
+                    stub.requests["userinfo"] += 1
+                    scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+                    userinfo = stub._userinfo(token) if scheme.lower() == "bearer" else None
+                    if userinfo is None:
+                        self._send(401, {"error": "invalid_token"})
+                    else:
+                        self._send(200, userinfo)
+                else:
+                    self._send(404, {"error": "not_found"})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="auth0-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9400)
+    parser.add_argument("--audience", default=DEFAULT_AUDIENCE)
+    parser.add_argument("--sub", default="auth0|local-admin")
+    parser.add_argument("--email", default=DEFAULT_ADMIN_EMAIL)
+    parser.add_argument("--email-in-token", action="store_true", help="embed the email claim instead of serving it from /userinfo")
+    parser.add_argument("--expires-in", type=int, default=24 * 3600)
+    parser.add_argument("--claim", action="append", default=[], metavar="KEY=VALUE", help="extra claim (repeatable)")
+    args = parser.parse_args()
+
+    claims = dict(item.split("=", 1) for item in args.claim)
+    with Auth0Stub(port=args.port, audience=args.audience) as stub:
+        token = stub.mint(args.sub, email=args.email, email_in_token=args.email_in_token, expires_in=args.expires_in, **claims)
+        print(f"🔐 Auth0 stand-in on {stub.url}")
+        print("Start the API with:")
+        print(f"   AUTH0_DOMAIN={stub.url} AUTH0_AUDIENCE={stub.audience} uvicorn main:app --port 8080")
+        print(f"\nBearer token for {args.email}:\n{token}\n")
+        print("Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
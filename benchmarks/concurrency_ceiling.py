@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Concurrent-request ceiling for the API's read endpoints.
+
+Fires GET requests at a running backend with an increasing number of concurrent clients
+and reports throughput, p95 latency and errors per level. The async read routes (founders,
+startups, skills, hobbies, events) are served on the event loop; routes that are still
+sync `def` (help requests, single skill/hobby/event) run on Starlette's threadpool, so
+comparing the two shows where each one stops scaling.
+
+Usage:
+    cd backend && uvicorn main:app --port 8000 &
+    python benchmarks/concurrency_ceiling.py [--url http://localhost:8000] [--levels 10,50,100,200]
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ["/skills/", "/help-requests/"]
+
+def run_level(base, path: str, clients: int, seconds: float) -> dict:
+    stop = threading.Event()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def client():
+        nonlocal errors
+        conn = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+        local, failed = [], 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    p95 = statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) >= 2 else 0.0
+    return {"rps": len(latencies) / elapsed, "p95_ms": p95, "errors": errors}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--paths", default=",".join(DEFAULT_PATHS), help="comma-separated GET paths")
+    parser.add_argument("--levels", default="10,50,100,200", help="comma-separated client counts")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    base = urlsplit(args.url)
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(f"{'path':<24}{'clients':>9}{'req/s':>10}{'p95 ms':>10}{'errors':>9}")
+    for path in args.paths.split(","):
+        for clients in levels:
+            r = run_level(base, path, clients, args.seconds)
+            print(f"{path:<24}{clients:>9}{r['rps']:>10.0f}{r['p95_ms']:>10.1f}{r['errors']:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark for the embedded SQLite database.
+
+Runs the same mixed workload twice against a fresh database file: once with SQLite's
+defaults (rollback journal) and once with the tuning profile from backend/database.py
+(WAL, synchronous=NORMAL, mmap, cache, busy_timeout, temp_store). Writers insert founders
+one transaction at a time like API writes do; readers page through the founder list and
+fetch single founders by id.
+
+Usage:
+    python benchmarks/sqlite_concurrency.py [--seconds 10] [--writers 2] [--readers 8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Add backend to path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, backend_path)
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.exc import OperationalError
+import database
+import models
+
+founders = models.Founder.__table__
+
+def make_engine(path: str, tuned: bool, pool_size: int):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    if tuned:
+        event.listen(engine, "connect", lambda conn, record: database.apply_sqlite_profile(conn))
+    return engine
+
+def seed(engine, rows: int):
+    with engine.begin() as conn:
+        conn.execute(insert(founders), [
+            {
+                "name": f"Seed Founder {i}", "email": f"seed{i}@example.com",
+                "email_normalized": f"seed{i}@example.com",
+                "linkedin_url": f"https://linkedin.com/in/seed{i}", "profile_visible": True,
+            }
+            for i in range(rows)
+        ])
+
+def run_workload(tuned: bool, seconds: float, writers: int, readers: int, seed_rows: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = make_engine(path, tuned, pool_size=writers + readers)
+    models.Base.metadata.create_all(engine)
+    seed(engine, seed_rows)
+
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def writer(worker: int):
+        n = 0
+        while not stop.is_set():
+            n += 1
+            email = f"w{worker}-{n}@example.com"
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(founders).values(
+                        name=f"Writer {worker}", email=email, email_normalized=email,
+                        linkedin_url="https://linkedin.com/in/writer", profile_visible=True,
+                    ))
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def reader(worker: int):
+        rng = random.Random(worker)
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    if rng.random() < 0.5:
+                        conn.execute(select(founders).limit(100).offset(rng.randrange(seed_rows))).fetchall()
+                    else:
+                        conn.execute(select(founders).where(founders.c.id == rng.randrange(1, seed_rows))).fetchall()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    return {
+        "profile": "tuned" if tuned else "default",
+        "reads_per_sec": counts["reads"] / elapsed,
+        "writes_per_sec": counts["writes"] / elapsed,
+        "errors": counts["errors"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = [run_workload(tuned, args.seconds, args.writers, args.readers, args.seed_rows) for tuned in (False, True)]
+
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'errors':>10}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['reads_per_sec']:>12.0f}{r['writes_per_sec']:>12.0f}{r['errors']:>10}")
+
+    default, tuned = results
+    for key in ("reads_per_sec", "writes_per_sec"):
+        if default[key]:
+            print(f"{key.replace('_per_sec', '')} speedup: {tuned[key] / default[key]:.1f}x")
+
+if __name__ == "__main__":
+    main()
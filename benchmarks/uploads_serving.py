@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Image serving benchmark for GET /uploads/{filename}.
+
+Fills a scratch upload directory with --files uuid-named files (100k by default) and
+measures requests/second for:
+  legacy       the previous handler (exists() checks, a directory glob and FileResponse)
+  current      uploads.serve_upload (one stat, cache validators)
+  revalidate   uploads.serve_upload answering If-None-Match with 304
+
+Usage:
+    python benchmarks/uploads_serving.py [--files 100000] [--requests 2000]
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import redirect_stdout
+from pathlib import Path
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--files", type=int, default=100_000)
+parser.add_argument("--requests", type=int, default=2000)
+args = parser.parse_args()
+
+# uploads.py reads UPLOAD_DIR at import time
+upload_dir = Path(tempfile.mkdtemp())
+os.environ["UPLOAD_DIR"] = str(upload_dir)
+
+# Add backend to path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, backend_path)
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+from fastapi.testclient import TestClient
+import uploads
+
+app = FastAPI()
+
+@app.get("/legacy/{filename}")
+async def legacy(filename: str):
+    file_path = upload_dir / filename
+    print(f"Looking for file: {file_path}")
+    print(f"File exists: {file_path.exists()}")
+    print(f"Upload directory contents: {list(upload_dir.glob('*'))}")
+    return FileResponse(path=file_path, headers=uploads.CORS_HEADERS)
+
+@app.get("/uploads/{filename}")
+async def current(filename: str, request: Request):
+    return await uploads.serve_upload(request, filename)
+
+def populate(count: int) -> list:
+    payload = os.urandom(4096)
+    names = []
+    for _ in range(count):
+        name = f"{uuid.uuid4()}.jpg"
+        (upload_dir / name).write_bytes(payload)
+        names.append(name)
+    return names
+
+def measure(client: TestClient, prefix: str, names: list, requests: int, headers=None) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        name = names[i % len(names)]
+        request_headers = headers(name) if headers else None
+        response = client.get(f"{prefix}/{name}", headers=request_headers)
+        assert response.status_code in (200, 304), response.status_code
+    return requests / (time.perf_counter() - start)
+
+def main():
+    print(f"Creating {args.files} files in {upload_dir} ...")
+    try:
+        names = populate(args.files)
+        run(names)
+    finally:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+def run(names: list):
+    client = TestClient(app)
+    etags = {}
+
+    def if_none_match(name):
+        if name not in etags:
+            etags[name] = client.get(f"/uploads/{name}").headers["etag"]
+        return {"If-None-Match": etags[name]}
+
+    sample = names[:200]
+    for name in sample:
+        if_none_match(name)
+
+    # The legacy handler is orders of magnitude slower; keep its run short
+    legacy_requests = max(args.requests // 100, 5)
+    with redirect_stdout(io.StringIO()):
+        legacy_rps = measure(client, "/legacy", sample, legacy_requests)
+    current_rps = measure(client, "/uploads", sample, args.requests)
+    revalidate_rps = measure(client, "/uploads", sample, args.requests, headers=if_none_match)
+
+    print(f"{'handler':<12}{'req/s':>10}")
+    print(f"{'legacy':<12}{legacy_rps:>10.1f}")
+    print(f"{'current':<12}{current_rps:>10.1f}")
+    print(f"{'revalidate':<12}{revalidate_rps:>10.1f}")
+    print(f"speedup: {current_rps / legacy_rps:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 import axios from 'axios';
 import { Founder, FounderCreate, Skill, SkillCreate, Startup, StartupCreate, HelpRequest, HelpRequestCreate, Hobby, HobbyCreate, Event, EventCreate } from './types';
+import { addTraceContext } from './utils/tracing';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
 
-const api = axios.create({
+const api = addTraceContext(axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
   },
-});
+}));
 
 // Founder API
 export const founderAPI = {
@@ -1,4 +1,5 @@
 import axios, { AxiosInstance } from 'axios';
+import { addTraceContext } from './tracing';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
 
@@ -28,13 +29,13 @@ export const createAuthenticatedAPI = (getAccessToken: () => Promise<string>): A
     }
   );
 
-  return api;
+  return addTraceContext(api);
 };
 
 // Create unauthenticated API instance for public endpoints
-export const publicAPI = axios.create({
+export const publicAPI = addTraceContext(axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
   },
-});
\ No newline at end of file
+}));
\ No newline at end of file
@@ -0,0 +1,23 @@
+import { AxiosInstance } from 'axios';
+
+// W3C trace-context (https://www.w3.org/TR/trace-context/): each API call starts a new trace,
+// so the backend's request span (and its auth, crud and SQL children) share the id the browser
+// generated and can be looked up from the network tab. The sampled flag is left unset: the
+// backend decides with TRACING_SAMPLE_RATIO and answers with `traceresponse` when it records.
+const randomHex = (bytes: number): string => {
+  const values = new Uint8Array(bytes);
+  crypto.getRandomValues(values);
+  return Array.from(values, (value) => value.toString(16).padStart(2, '0')).join('');
+};
+
+export const createTraceparent = (): string => `00-${randomHex(16)}-${randomHex(8)}-00`;
+
+export const addTraceContext = (instance: AxiosInstance): AxiosInstance => {
+  instance.interceptors.request.use((config) => {
+    if (!config.headers.traceparent) {
+      config.headers.traceparent = createTraceparent();
+    }
+    return config;
+  });
+  return instance;
+};
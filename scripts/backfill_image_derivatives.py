@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Generate thumbnail derivatives for images uploaded before the derivative pipeline existed.
+
+Lists the upload store once (UPLOAD_DIR, or the S3 bucket with STORAGE_BACKEND=s3) and
+renders every missing size/format (see backend/images.py) on a worker pool. Files that
+already have all derivatives are skipped unless --force is given. Use the same storage
+environment variables as the API.
+
+Usage:
+    UPLOAD_DIR=backend/uploads python scripts/backfill_image_derivatives.py [--workers 4] [--force]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add backend to path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend')
+sys.path.insert(0, backend_path)
+
+import images
+import logging_setup
+import storage
+import uploads
+
+logger = logging.getLogger("backfill_image_derivatives")
+
+def originals():
+    """Uploaded originals: top-level objects in the store, skipping temp files and derived/."""
+    for stored in storage.backend.list():
+        if uploads.SAFE_FILENAME.match(stored.key):
+            yield stored.key
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--force", action="store_true", help="re-render derivatives that already exist")
+    args = parser.parse_args()
+    logging_setup.setup_logging(default_format="console")
+
+    pending = [name for name in originals() if args.force or not images.is_complete(name)]
+    logger.info("🖼️  %s image(s) need derivatives (%s)", len(pending), ', '.join(ext for ext, _, _, _ in images.ENABLED_FORMATS))
+
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(images.generate_derivatives, name, args.force): name for name in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                done += 1
+            except Exception as e:
+                failed += 1
+                logger.error("❌ %s: %s", futures[future], e)
+
+    logger.info("✅ Generated derivatives for %s image(s), %s failed", done, failed)
+
+if __name__ == "__main__":
+    main()
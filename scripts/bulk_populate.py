@@ -4,8 +4,10 @@ Production-ready script to bulk populate skills, hobbies, startups, founders, an
 Can be used with different database environments
 """
 
+import logging
 import os
 import sys
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -22,21 +24,55 @@ from populate_hobbies import populate_hobbies
 from populate_startups import populate_startups
 from populate_founders import populate_founders
 from populate_requests import populate_help_requests
+from synthetic_data import SyntheticDataset, current_max_ids, write_dataset
+import logging_setup
+
+logger = logging.getLogger("bulk_populate")
 
 def get_database_url():
     """Get database URL from environment or use default"""
     return os.getenv('DATABASE_URL', 'sqlite:///./founders_crm.db')
 
+def create_db_engine(database_url):
+    """Create database engine"""
+    if database_url.startswith("sqlite"):
+        return create_engine(database_url, connect_args={"check_same_thread": False})
+    return create_engine(database_url)
+
 def create_db_session(database_url):
     """Create database session"""
-    if database_url.startswith("sqlite"):
-        engine = create_engine(database_url, connect_args={"check_same_thread": False})
-    else:
-        engine = create_engine(database_url)
-    
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=create_db_engine(database_url))
     return SessionLocal()
 
+def get_option_value(name, default=None):
+    """Value following a command line option (e.g. --synthetic 100000)"""
+    if name not in sys.argv:
+        return default
+    index = sys.argv.index(name)
+    if index + 1 >= len(sys.argv):
+        raise SystemExit(f"{name} needs a value")
+    return sys.argv[index + 1]
+
+def populate_synthetic(database_url, founders, seed=42, batch_size=50_000):
+    """Add `founders` synthetic founders plus proportional startups, skills, hobbies, links,
+    help requests and events (see synthetic_data.py), above the ids already in the database."""
+    engine = create_db_engine(database_url)
+    dataset = SyntheticDataset(founders, seed=seed, id_offsets=current_max_ids(engine))
+    logger.info("Generating %s synthetic founders (seed %s, batches of %s)...", f"{founders:,}", seed, f"{batch_size:,}")
+
+    start = time.perf_counter()
+    def progress(table, rows):
+        logger.info("   • %s: %s rows (%.0fs)", table, f"{rows:,}", time.perf_counter() - start)
+
+    try:
+        written = write_dataset(engine, dataset, batch_size=batch_size, progress=progress)
+    finally:
+        engine.dispose()
+    elapsed = time.perf_counter() - start
+    total = sum(written.values())
+    logger.info("✅ Wrote %s rows in %.1fs (%s rows/s)", f"{total:,}", elapsed, f"{total / elapsed:,.0f}")
+    return written
+
 def main():
     """Main function to populate data"""
     # Get command line arguments
@@ -45,9 +81,10 @@ def main():
     populate_startups_flag = '--startups' in sys.argv or '--sample-data' in sys.argv
     populate_founders_flag = '--founders' in sys.argv or '--sample-data' in sys.argv
     populate_requests_flag = '--requests' in sys.argv or '--sample-data' in sys.argv
+    synthetic_founders = int(get_option_value('--synthetic', 0))
     
     if not any([populate_skills_flag, populate_hobbies_flag, populate_startups_flag, 
-                populate_founders_flag, populate_requests_flag]):
+                populate_founders_flag, populate_requests_flag, synthetic_founders]):
         print("Usage: python bulk_populate.py [OPTIONS]")
         print("")
         print("Data Options:")
@@ -61,16 +98,32 @@ def main():
         print("  --all             Populate skills and hobbies")
         print("  --sample-data     Populate startups, founders, and requests")
         print("")
+        print("Load Testing:")
+        print("  --synthetic N     Add N generated founders with proportional startups, skills, hobbies,")
+        print("                    help requests and events (about 7 rows per founder)")
+        print("  --seed S          RNG seed for --synthetic (default 42)")
+        print("  --batch-size B    Rows per COPY/executemany batch (default 50000)")
+        print("")
         print("Environment variable: DATABASE_URL (optional)")
         print("")
         print("Examples:")
         print("  python bulk_populate.py --sample-data")
         print("  python bulk_populate.py --skills --hobbies")
         print("  DATABASE_URL='postgresql://...' python bulk_populate.py --all")
+        print("  DATABASE_URL='postgresql://...' python bulk_populate.py --synthetic 150000")
         return
     
     database_url = get_database_url()
-    print(f"Connecting to database: {database_url.split('@')[1] if '@' in database_url else database_url}")
+    logger.info("Connecting to database: %s", database_url.split('@')[1] if '@' in database_url else database_url)
+    
+    if synthetic_founders:
+        try:
+            populate_synthetic(database_url, synthetic_founders, seed=int(get_option_value('--seed', 42)),
+                               batch_size=int(get_option_value('--batch-size', 50_000)))
+        except Exception as e:
+            logger.error("❌ Error: %s", e)
+            sys.exit(1)
+        return
     
     try:
         db = create_db_session(database_url)
@@ -80,55 +133,56 @@ def main():
         founder_ids = []
         
         if populate_skills_flag:
-            print("Populating skills...")
+            logger.info("Populating skills...")
             skills_added = populate_skills(db)
             total_added += skills_added
-            print(f"Added {skills_added} new skills")
+            logger.info("Added %s new skills", skills_added)
         
         if populate_hobbies_flag:
-            print("Populating hobbies...")
+            logger.info("Populating hobbies...")
             hobbies_added = populate_hobbies(db)
             total_added += hobbies_added
-            print(f"Added {hobbies_added} new hobbies")
+            logger.info("Added %s new hobbies", hobbies_added)
         
         if populate_startups_flag:
-            print("Populating startups...")
+            logger.info("Populating startups...")
             startups_added, startup_ids = populate_startups(db)
             total_added += startups_added
-            print(f"Added {startups_added} new startups")
+            logger.info("Added %s new startups", startups_added)
         
         if populate_founders_flag:
-            print("Populating founders...")
+            logger.info("Populating founders...")
             founders_added, founder_ids = populate_founders(db, startup_ids)
             total_added += founders_added
-            print(f"Added {founders_added} new founders")
+            logger.info("Added %s new founders", founders_added)
         
         if populate_requests_flag:
-            print("Populating help requests...")
+            logger.info("Populating help requests...")
             requests_added = populate_help_requests(db, founder_ids)
             total_added += requests_added
-            print(f"Added {requests_added} new help requests")
+            logger.info("Added %s new help requests", requests_added)
         
         db.commit()
-        print(f"\n✅ Successfully added {total_added} new items to the database!")
+        logger.info("✅ Successfully added %s new items to the database!", total_added)
         
         # Show summary of what was created
         if populate_startups_flag or populate_founders_flag or populate_requests_flag:
-            print("\n📊 Sample Data Summary:")
+            logger.info("📊 Sample Data Summary:")
             if startup_ids:
-                print(f"   • 4 Startups: EcoTrack, DevFlow, HealthLink, EduMentor")
-                print(f"   • EcoTrack has 2 founders (Sarah Chen + Alex Thompson)")
+                logger.info("   • 4 Startups: EcoTrack, DevFlow, HealthLink, EduMentor")
+                logger.info("   • EcoTrack has 2 founders (Sarah Chen + Alex Thompson)")
             if founder_ids:
-                print(f"   • 5 Founders across different industries")
+                logger.info("   • 5 Founders across different industries")
             if populate_requests_flag:
-                print(f"   • 3 Help Requests: Technical, Funding, Legal")
+                logger.info("   • 3 Help Requests: Technical, Funding, Legal")
         
     except Exception as e:
         db.rollback()
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         sys.exit(1)
     finally:
         db.close()
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     main()
\ No newline at end of file
@@ -1,136 +1,129 @@
 #!/usr/bin/env python3
 """
 Script to extract founder data from FoundersDB.xlsx and create a JSON file
+
+Each issue sheet is parsed once from the open workbook; founders appearing in several issues are
+merged by normalized name, with each field taken from the latest issue that has it.
+Use --workers N to parse sheets in N processes when the workbook has many issue sheets.
 """
 
-import pandas as pd
+import argparse
 import json
+import logging
+import os
 import re
-from collections import defaultdict
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Add backend to path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, backend_path)
+
+import logging_setup
+
+logger = logging.getLogger("extract_founders_data")
+
+# Excel column -> JSON field, in output order
+COLUMNS = {
+    'Name': 'name',
+    'My current startup': 'startup',
+    'Website': 'website',
+    'Industry': 'industry',
+    'Customer/User': 'customer_user',
+    "Where I'm now": 'current_stage',
+    'Help I need 🆘': 'help_needed',
+    'Things I can help with (my specialization/passion)': 'can_help_with',
+    'ONE thing I love': 'love',
+    'Who I really am and what I love 💙': 'about_me',
+    'Email': 'email',
+    'LinkedIn': 'linkedin',
+}
+FIELDS = list(COLUMNS.values())
 
 def extract_issue_number(sheet_name):
     """Extract issue number from sheet name for determining recency"""
     match = re.search(r'issue_(\d+)', sheet_name)
     return int(match.group(1)) if match else 0
 
-def normalize_name(name):
-    """Normalize name for matching duplicates"""
-    if pd.isna(name):
-        return None
-    # Convert to lowercase, remove extra spaces, handle common variations
-    normalized = str(name).strip().lower()
-    # Remove parentheses and content inside them (like nicknames)
-    normalized = re.sub(r'\([^)]*\)', '', normalized).strip()
-    return normalized
-
-def clean_value(value):
-    """Clean and normalize values"""
-    if pd.isna(value):
-        return None
-    return str(value).strip() if str(value).strip() else None
-
-def merge_founder_data(existing, new_data, new_issue_num, existing_issue_num):
-    """Merge founder data, preferring more recent information"""
-    merged = existing.copy()
-    
-    # If new data is more recent, prefer new values over existing ones
-    if new_issue_num > existing_issue_num:
-        for key, value in new_data.items():
-            if value is not None:  # Only update if new value exists
-                merged[key] = value
-        merged['_issue_number'] = new_issue_num
-    else:
-        # If existing data is more recent, only fill in missing values
-        for key, value in new_data.items():
-            if value is not None and (key not in merged or merged[key] is None):
-                merged[key] = value
-    
-    return merged
+def clean_column(column):
+    """Strip values; blanks and NaN become missing"""
+    return column.astype('string').str.strip().replace('', pd.NA)
+
+def normalize_names(names):
+    """Normalize names for matching duplicates: lowercase, without parenthesized nicknames"""
+    normalized = names.str.lower().str.replace(r'\([^)]*\)', '', regex=True).str.strip()
+    return normalized.replace('', pd.NA)
+
+def parse_sheet(xl, sheet_name):
+    """One issue sheet as cleaned founder rows with their match key and issue number"""
+    # Header is on row 3 (0-indexed row 2); columns missing from a sheet come back empty
+    df = xl.parse(sheet_name, header=2).reindex(columns=list(COLUMNS)).rename(columns=COLUMNS)
+    df = df.apply(clean_column)
+    df['_key'] = normalize_names(df['name'])
+    return df[df['_key'].notna()].assign(_issue_number=extract_issue_number(sheet_name))
+
+# Per-process workbook for --workers, opened once by the pool initializer
+_workbook = None
+
+def _open_workbook(path):
+    global _workbook
+    _workbook = pd.ExcelFile(path)
+
+def _parse_sheet_in_worker(sheet_name):
+    return parse_sheet(_workbook, sheet_name)
+
+def parse_workbook(path, workers=1):
+    """Cleaned rows of every sheet, in sheet order"""
+    with pd.ExcelFile(path) as xl:
+        sheet_names = xl.sheet_names
+        parallel = workers > 1 and len(sheet_names) > 1
+        if not parallel:
+            frames = [parse_sheet(xl, sheet_name) for sheet_name in sheet_names]
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_open_workbook, initargs=(path,)) as pool:
+            frames = list(pool.map(_parse_sheet_in_worker, sheet_names))
+    # Logged here rather than in the workers: a forked worker inherits logging_setup's queue
+    # but not its writer thread, so records logged there are never written
+    for sheet_name, df in zip(sheet_names, frames):
+        logger.info("Processed %s: %s founders", sheet_name, len(df))
+    return frames
+
+def merge_founders(frames):
+    """One row per founder: each field from the most recent issue that has a value
+    (ties go to the sheet/row seen first), sorted by name"""
+    rows = pd.concat(frames, ignore_index=True)
+    rows = rows.sort_values('_issue_number', ascending=False, kind='stable')
+    # first() takes the first non-missing value per column within each founder
+    merged = rows.groupby('_key', sort=False)[FIELDS].first()
+    merged = merged.sort_values('name', key=lambda names: names.str.lower(), kind='stable')
+    return merged.astype(object).where(merged.notna(), None)
 
 def main():
-    # Read Excel file
-    xl = pd.ExcelFile('FoundersDB.xlsx')
-    
-    # Dictionary to store founders by normalized name
-    founders_dict = {}
-    
-    # Process each sheet
-    for sheet_name in xl.sheet_names:
-        print(f"Processing {sheet_name}...")
-        
-        # Extract issue number for recency determination
-        issue_num = extract_issue_number(sheet_name)
-        
-        # Read sheet starting from row 3 (0-indexed row 2)
-        df = pd.read_excel('FoundersDB.xlsx', sheet_name=sheet_name, header=2)
-        
-        # Process each row
-        for _, row in df.iterrows():
-            name = clean_value(row.get('Name'))
-            if not name:
-                continue
-                
-            normalized_name = normalize_name(name)
-            if not normalized_name:
-                continue
-            
-            # Extract data from row
-            founder_data = {
-                'name': name,
-                'startup': clean_value(row.get('My current startup')),
-                'website': clean_value(row.get('Website')),
-                'industry': clean_value(row.get('Industry')),
-                'customer_user': clean_value(row.get('Customer/User')),
-                'current_stage': clean_value(row.get("Where I'm now")),
-                'help_needed': clean_value(row.get('Help I need 🆘')),
-                'can_help_with': clean_value(row.get('Things I can help with (my specialization/passion)')),
-                'love': clean_value(row.get('ONE thing I love')),
-                'about_me': clean_value(row.get('Who I really am and what I love 💙')),
-                'email': clean_value(row.get('Email')),
-                'linkedin': clean_value(row.get('LinkedIn')),
-                '_sheet_name': sheet_name,
-                '_issue_number': issue_num
-            }
-            
-            # Merge with existing data if founder already exists
-            if normalized_name in founders_dict:
-                existing_issue_num = founders_dict[normalized_name].get('_issue_number', 0)
-                founders_dict[normalized_name] = merge_founder_data(
-                    founders_dict[normalized_name], 
-                    founder_data, 
-                    issue_num, 
-                    existing_issue_num
-                )
-            else:
-                founders_dict[normalized_name] = founder_data
-    
-    # Convert to list and remove internal fields
-    founders_list = []
-    for founder_data in founders_dict.values():
-        # Remove internal tracking fields
-        clean_data = {k: v for k, v in founder_data.items() if not k.startswith('_')}
-        founders_list.append(clean_data)
-    
-    # Sort by name for consistency
-    founders_list.sort(key=lambda x: x.get('name', '').lower())
-    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default="FoundersDB.xlsx", help="workbook with one sheet per issue")
+    parser.add_argument("--output", default="founders_data.json")
+    parser.add_argument("--workers", type=int, default=1, help="processes for parsing sheets in parallel")
+    args = parser.parse_args()
+    logging_setup.setup_logging(default_format="console")
+
+    frames = parse_workbook(args.input, workers=args.workers)
+    founders = merge_founders(frames)
+    founders_list = founders.to_dict('records')
+
     # Write to JSON file
-    output_file = 'founders_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(founders_list, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n✅ Successfully extracted {len(founders_list)} unique founders to {output_file}")
-    print(f"📊 Processed {len(xl.sheet_names)} sheets")
-    
+
+    logger.info("✅ Successfully extracted %s unique founders to %s", len(founders_list), args.output)
+    logger.info("📊 Processed %s sheets (%s rows)", len(frames), sum(len(frame) for frame in frames))
+
     # Show some statistics
-    founders_with_email = sum(1 for f in founders_list if f.get('email'))
-    founders_with_linkedin = sum(1 for f in founders_list if f.get('linkedin'))
-    founders_with_startup = sum(1 for f in founders_list if f.get('startup'))
-    
-    print(f"📈 Statistics:")
-    print(f"   - Founders with email: {founders_with_email}")
-    print(f"   - Founders with LinkedIn: {founders_with_linkedin}")
-    print(f"   - Founders with startup info: {founders_with_startup}")
+    logger.info("📈 Statistics:")
+    logger.info("   - Founders with email: %s", founders['email'].notna().sum())
+    logger.info("   - Founders with LinkedIn: %s", founders['linkedin'].notna().sum())
+    logger.info("   - Founders with startup info: %s", founders['startup'].notna().sum())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,6 +3,7 @@
 Script to populate the database with sample founder data
 """
 
+import logging
 import sys
 import os
 
@@ -11,6 +12,9 @@ backend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend
 sys.path.insert(0, backend_path)
 
 import models
+import logging_setup
+
+logger = logging.getLogger("populate_founders")
 
 def populate_founders(db, startup_ids=None):
     """Populate sample founder data"""
@@ -78,7 +82,7 @@ def populate_founders(db, startup_ids=None):
     founder_ids = []
     
     for founder_data in founders_data:
-        existing_founder = db.query(models.Founder).filter(models.Founder.email == founder_data["email"]).first()
+        existing_founder = db.query(models.Founder).filter(models.Founder.email_normalized == models.normalize_email(founder_data["email"])).first()
         if not existing_founder:
             founder = models.Founder(**founder_data)
             db.add(founder)
@@ -91,6 +95,7 @@ def populate_founders(db, startup_ids=None):
     return founders_added, founder_ids
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
     
@@ -109,10 +114,10 @@ if __name__ == "__main__":
     try:
         founders_added, founder_ids = populate_founders(db)
         db.commit()
-        print(f"✅ Successfully added {founders_added} new founders to the database!")
-        print(f"Founder IDs: {founder_ids}")
+        logger.info("✅ Successfully added %s new founders to the database!", founders_added)
+        logger.info("Founder IDs: %s", founder_ids)
     except Exception as e:
         db.rollback()
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
     finally:
         db.close()
\ No newline at end of file
@@ -4,14 +4,24 @@ Script to populate the database with founder data from FoundersDB.xlsx
 """
 
 import json
+import logging
 import sys
 import os
+import time
+
+from sqlalchemy import bindparam, func, inspect, insert, select, update
 
 # Add backend to path for imports
 backend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend')
 sys.path.insert(0, backend_path)
 
 import models
+import logging_setup
+
+logger = logging.getLogger("populate_from_excel")
+
+# Rows per executemany/IN-list batch
+BATCH_SIZE = 500
 
 # Mapping from Excel column names to Founder model fields
 EXCEL_TO_FOUNDER_MAPPING = {
@@ -92,14 +102,11 @@ def normalize_stage(stage_text):
     else:
         return 'MVP'  # Default fallback
 
-def get_database_columns(db, table_name):
+def get_database_columns(inspector, table_name):
     """Get the actual columns available in the database table"""
-    from sqlalchemy import inspect
-    inspector = inspect(db.bind)
     try:
-        columns = [col['name'] for col in inspector.get_columns(table_name)]
-        return columns
-    except:
+        return [col['name'] for col in inspector.get_columns(table_name)]
+    except Exception:
         return []
 
 def extract_founder_data(excel_data, available_columns=None):
@@ -183,120 +190,122 @@ def load_founders_data(json_file='founders_data.json'):
     with open(json_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def _chunks(items, size=BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _select_ids(db, column, id_column, keys):
+    """Map each of `keys` found in `column` to its row id, one IN query per batch"""
+    ids = {}
+    for chunk in _chunks(list(keys)):
+        ids.update(db.execute(select(column, id_column).where(column.in_(chunk))).all())
+    return ids
+
+def prepare_rows(excel_founders, founder_columns, startup_columns):
+    """Transform Excel rows in memory: founders keyed by normalized email (later rows fill in
+    non-empty values, like re-processing an existing founder would), startups keyed by name_key"""
+    founders = {}
+    startups = {}
+    founder_startups = {}
+    skipped = []
+    for excel_founder in excel_founders:
+        founder_data = extract_founder_data(excel_founder, founder_columns)
+        if not founder_data['email'] or not founder_data['name'] or not founder_data['linkedin_url']:
+            skipped.append(excel_founder.get('name') or excel_founder.get('email') or 'Unknown')
+            continue
+        email_normalized = models.normalize_email(founder_data['email'])
+        founder_data['email_normalized'] = email_normalized
+        values = {k: v for k, v in founder_data.items() if v is not None and (k in founder_columns or k == 'email_normalized')}
+        founders.setdefault(email_normalized, {}).update(values)
+
+        startup_data = extract_startup_data(excel_founder) if startup_columns and 'startup_id' in founder_columns else None
+        if startup_data and startup_data['name'].strip():
+            name = startup_data['name'].strip()
+            name_key = models.normalize_name_key(name)
+            startups.setdefault(name_key, {
+                **{k: v for k, v in startup_data.items() if k in startup_columns},
+                'name': name, 'name_key': name_key,
+            })
+            founder_startups[email_normalized] = name_key
+    return founders, startups, founder_startups, skipped
+
 def populate_founders_from_excel(db, json_file='founders_data.json', limit=None):
-    """Populate database with founders and startups from Excel-derived JSON data"""
+    """Populate database with founders and startups from Excel-derived JSON data.
+
+    Existing founders (by normalized email) and startups (by name key) are preloaded, inserts and
+    updates are worked out in memory and written with batched executemany statements. Nothing is
+    committed here, so the caller's commit makes the whole import one transaction.
+    """
+    start = time.perf_counter()
     excel_founders = load_founders_data(json_file)
     
     # Apply limit for testing purposes
     if limit:
         excel_founders = excel_founders[:limit]
-        print(f"🧪 TEST MODE: Processing only first {limit} founders")
-    
-    # Get available columns for both tables
-    founder_columns = get_database_columns(db, 'founders')
-    startup_columns = get_database_columns(db, 'startups')
-    
-    print(f"📊 Processing {len(excel_founders)} founders from {json_file}")
-    print(f"🔍 Available founder columns: {founder_columns}")
-    print(f"🔍 Available startup columns: {startup_columns}")
-    
-    founders_added = 0
-    startups_added = 0
-    founders_updated = 0
-    founder_ids = []
-    startup_cache = {}  # Cache to avoid duplicate startups
-    
-    # Check if startups table exists and has startup linking capability
-    supports_startups = 'startups' in get_database_columns(db, '') or len(startup_columns) > 0
-    supports_startup_linking = 'startup_id' in founder_columns
-    
-    for i, excel_founder in enumerate(excel_founders, 1):
-        try:
-            print(f"Processing {i}/{len(excel_founders)}: {excel_founder.get('name', 'Unknown')}")
-            
-            # Handle startup creation/linking only if supported
-            startup_id = None
-            if supports_startups and supports_startup_linking:
-                startup_data = extract_startup_data(excel_founder)
-                
-                if startup_data and startup_data['name']:
-                    startup_name = startup_data['name'].strip()
-                    
-                    # Check cache first
-                    if startup_name in startup_cache:
-                        startup_id = startup_cache[startup_name]
-                    else:
-                        # Check if startup exists in database
-                        try:
-                            existing_startup = db.query(models.Startup).filter(
-                                models.Startup.name == startup_name
-                            ).first()
-                            
-                            if existing_startup:
-                                startup_id = existing_startup.id
-                                startup_cache[startup_name] = startup_id
-                                print(f"  ↳ Linked to existing startup: {startup_name}")
-                            else:
-                                # Filter out None values before creating startup
-                                filtered_startup_data = {k: v for k, v in startup_data.items() 
-                                                       if v is not None and k in startup_columns}
-                                if filtered_startup_data:  # Only create if we have data
-                                    startup = models.Startup(**filtered_startup_data)
-                                    db.add(startup)
-                                    db.flush()  # Get ID without committing
-                                    startup_id = startup.id
-                                    startup_cache[startup_name] = startup_id
-                                    startups_added += 1
-                                    print(f"  ↳ Created new startup: {startup_name}")
-                        except Exception as e:
-                            print(f"  ⚠️ Startup creation failed: {e}")
-            
-            # Check if founder already exists
-            existing_founder = db.query(models.Founder).filter(
-                models.Founder.email == excel_founder.get('email')
-            ).first()
-            
-            if existing_founder:
-                # Update existing founder with new information
-                founder_data = extract_founder_data(excel_founder, founder_columns)
-                if supports_startup_linking and startup_id:
-                    founder_data['startup_id'] = startup_id
-                
-                # Update non-null fields that exist in the database
-                for key, value in founder_data.items():
-                    if value is not None and hasattr(existing_founder, key) and key in founder_columns:
-                        setattr(existing_founder, key, value)
-                
-                founder_ids.append(existing_founder.id)
-                founders_updated += 1
-                print(f"  ↳ Updated existing founder")
-            else:
-                # Create new founder
-                founder_data = extract_founder_data(excel_founder, founder_columns)
-                if supports_startup_linking and startup_id:
-                    founder_data['startup_id'] = startup_id
-                
-                # Filter out fields that don't exist in the database schema
-                filtered_founder_data = {k: v for k, v in founder_data.items() 
-                                       if v is not None and k in founder_columns}
-                
-                if filtered_founder_data:  # Only create if we have data
-                    founder = models.Founder(**filtered_founder_data)
-                    db.add(founder)
-                    db.flush()  # Get the ID without committing
-                    founder_ids.append(founder.id)
-                    founders_added += 1
-                    print(f"  ↳ Created new founder")
-                
-        except Exception as e:
-            print(f"  ❌ Error processing {excel_founder.get('name', 'Unknown')}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+        logger.info("🧪 TEST MODE: Processing only first %s founders", limit)
     
-    return founders_added, startups_added, founders_updated, founder_ids
+    # One inspector for both tables
+    inspector = inspect(db.bind)
+    founder_columns = get_database_columns(inspector, 'founders')
+    startup_columns = get_database_columns(inspector, 'startups')
+    
+    logger.info("📊 Processing %s founders from %s", len(excel_founders), json_file)
+    logger.debug("🔍 Available founder columns: %s", founder_columns)
+    logger.debug("🔍 Available startup columns: %s", startup_columns)
+    
+    founders, startups, founder_startups, skipped = prepare_rows(excel_founders, founder_columns, startup_columns)
+    if skipped:
+        logger.warning("⚠️ Skipped %s rows without a name, email or LinkedIn URL: %s", len(skipped), ", ".join(skipped))
+    
+    # --- Startups: link to existing ones, insert the rest ---
+    startup_table = models.Startup.__table__
+    startup_ids = _select_ids(db, startup_table.c.name_key, startup_table.c.id, startups)
+    new_startups = [row for key, row in startups.items() if key not in startup_ids]
+    if new_startups:
+        # executemany needs the same keys in every row
+        keys = sorted({k for row in new_startups for k in row})
+        for chunk in _chunks([{k: row.get(k) for k in keys} for row in new_startups]):
+            db.execute(insert(startup_table), chunk)
+        startup_ids.update(_select_ids(db, startup_table.c.name_key, startup_table.c.id, [row['name_key'] for row in new_startups]))
+    logger.info("🏢 Startups: %s linked to existing, %s new", len(startups) - len(new_startups), len(new_startups))
+    
+    for email_normalized, name_key in founder_startups.items():
+        founders[email_normalized]['startup_id'] = startup_ids[name_key]
+    
+    # --- Founders: update existing ones, insert the rest ---
+    founder_table = models.Founder.__table__
+    existing_ids = _select_ids(db, founder_table.c.email_normalized, founder_table.c.id, founders)
+    to_insert = [row for key, row in founders.items() if key not in existing_ids]
+    to_update = [{**row, 'b_id': existing_ids[key]} for key, row in founders.items() if key in existing_ids]
+    
+    if to_insert:
+        keys = sorted({k for row in to_insert for k in row})
+        for chunk in _chunks([{k: row.get(k) for k in keys} for row in to_insert]):
+            db.execute(insert(founder_table), chunk)
+    
+    if to_update:
+        # Only non-empty values overwrite stored data (COALESCE keeps the current value for NULLs)
+        columns = sorted({k for row in to_update for k in row} - {'b_id', 'email_normalized'})
+        stmt = (
+            update(founder_table)
+            .where(founder_table.c.id == bindparam('b_id'))
+            .values({**{c: func.coalesce(bindparam(f'b_{c}'), founder_table.c[c]) for c in columns}, 'updated_at': func.now()})
+        )
+        for chunk in _chunks(to_update):
+            db.execute(stmt, [{'b_id': row['b_id'], **{f'b_{c}': row.get(c) for c in columns}} for row in chunk])
+    
+    founder_ids = list(existing_ids.values())
+    if to_insert:
+        founder_ids += _select_ids(db, founder_table.c.email_normalized, founder_table.c.id, [row['email_normalized'] for row in to_insert]).values()
+    
+    logger.info(
+        "👤 Founders: %s new, %s updated, %s duplicate rows merged (%.2fs)",
+        len(to_insert), len(to_update), len(excel_founders) - len(skipped) - len(founders), time.perf_counter() - start,
+    )
+    return len(to_insert), len(new_startups), len(to_update), founder_ids
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
     
@@ -316,35 +325,31 @@ if __name__ == "__main__":
         founders_added, startups_added, founders_updated, founder_ids = populate_founders_from_excel(db)
         db.commit()
         
-        print(f"\n🎉 Population completed successfully!")
-        print(f"✅ Added {founders_added} new founders")
-        print(f"✅ Added {startups_added} new startups") 
-        print(f"🔄 Updated {founders_updated} existing founders")
-        print(f"📊 Total processed founder IDs: {len(founder_ids)}")
+        logger.info("🎉 Population completed successfully!")
+        logger.info("✅ Added %s new founders", founders_added)
+        logger.info("✅ Added %s new startups", startups_added)
+        logger.info("🔄 Updated %s existing founders", founders_updated)
+        logger.info("📊 Total processed founder IDs: %s", len(founder_ids))
         
         # Show some sample data
         if founder_ids:
             sample_founder = db.query(models.Founder).filter(models.Founder.id == founder_ids[0]).first()
-            print(f"\n📝 Sample founder: {sample_founder.name}")
-            print(f"   Email: {sample_founder.email}")
-            print(f"   LinkedIn: {sample_founder.linkedin_url}")
+            logger.info("📝 Sample founder: %s", sample_founder.name)
+            logger.info("   Email: %s", sample_founder.email)
+            logger.info("   LinkedIn: %s", sample_founder.linkedin_url)
             if sample_founder.bio:
                 bio_preview = sample_founder.bio[:150] + "..." if len(sample_founder.bio) > 150 else sample_founder.bio
-                print(f"   Bio: {bio_preview}")
+                logger.info("   Bio: %s", bio_preview)
             if sample_founder.startup:
-                print(f"   Startup: {sample_founder.startup.name} ({sample_founder.startup.stage})")
+                logger.info("   Startup: %s (%s)", sample_founder.startup.name, sample_founder.startup.stage)
         
         # Database statistics
         total_founders = db.query(models.Founder).count()
         total_startups = db.query(models.Startup).count()
-        print(f"\n📈 Database totals:")
-        print(f"   Total founders: {total_founders}")
-        print(f"   Total startups: {total_startups}")
+        logger.info("📈 Database totals: %s founders, %s startups", total_founders, total_startups)
         
     except Exception as e:
         db.rollback()
-        print(f"❌ Error during population: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error during population: %s", e)
     finally:
         db.close()
\ No newline at end of file
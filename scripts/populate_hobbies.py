@@ -3,6 +3,7 @@
 Script to populate the database with initial hobby data
 """
 
+import logging
 import sys
 import os
 
@@ -13,6 +14,9 @@ sys.path.insert(0, backend_path)
 from sqlalchemy.orm import Session
 from database import SessionLocal
 import models
+import logging_setup
+
+logger = logging.getLogger("populate_hobbies")
 
 def populate_hobbies(db=None):
     if db is None:
@@ -85,7 +89,7 @@ def populate_hobbies(db=None):
     try:
         for hobby_data in hobbies_data:
             # Check if hobby already exists
-            existing_hobby = db.query(models.Hobby).filter(models.Hobby.name == hobby_data["name"]).first()
+            existing_hobby = db.query(models.Hobby).filter(models.Hobby.name_key == models.normalize_name_key(hobby_data["name"])).first()
             if not existing_hobby:
                 hobby = models.Hobby(**hobby_data)
                 db.add(hobby)
@@ -93,21 +97,23 @@ def populate_hobbies(db=None):
         
         if should_close:
             db.commit()
-            print(f"Successfully populated {hobbies_added} hobbies!")
+            logger.info("Successfully populated %s hobbies!", hobbies_added)
             
-            # Print all hobbies by category
+            # List all hobbies by category
             all_hobbies = db.query(models.Hobby).order_by(models.Hobby.category, models.Hobby.name).all()
             current_category = None
+            lines = []
             for hobby in all_hobbies:
                 if hobby.category != current_category:
                     current_category = hobby.category
-                    print(f"\n{current_category}:")
-                print(f"  - {hobby.name}")
+                    lines.append(f"\n{current_category}:")
+                lines.append(f"  - {hobby.name}")
+            logger.info("%s", "\n".join(lines))
                 
     except Exception as e:
         if should_close:
             db.rollback()
-            print(f"Error populating hobbies: {e}")
+            logger.error("Error populating hobbies: %s", e)
         else:
             raise e
     finally:
@@ -117,4 +123,5 @@ def populate_hobbies(db=None):
     return hobbies_added
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     populate_hobbies()
\ No newline at end of file
@@ -3,6 +3,7 @@
 Script to populate the database with sample help request data
 """
 
+import logging
 import sys
 import os
 
@@ -11,6 +12,9 @@ backend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend
 sys.path.insert(0, backend_path)
 
 import models
+import logging_setup
+
+logger = logging.getLogger("populate_requests")
 
 def populate_help_requests(db, founder_ids=None):
     """Populate sample help request data"""
@@ -60,6 +64,7 @@ def populate_help_requests(db, founder_ids=None):
     return requests_added
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
     
@@ -78,9 +83,9 @@ if __name__ == "__main__":
     try:
         requests_added = populate_help_requests(db)
         db.commit()
-        print(f"✅ Successfully added {requests_added} new help requests to the database!")
+        logger.info("✅ Successfully added %s new help requests to the database!", requests_added)
     except Exception as e:
         db.rollback()
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
     finally:
         db.close()
\ No newline at end of file
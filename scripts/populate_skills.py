@@ -3,6 +3,7 @@
 Script to populate the database with initial skill data
 """
 
+import logging
 import sys
 import os
 
@@ -13,6 +14,9 @@ sys.path.insert(0, backend_path)
 from sqlalchemy.orm import Session
 from database import SessionLocal
 import models
+import logging_setup
+
+logger = logging.getLogger("populate_skills")
 
 def populate_skills(db=None):
     if db is None:
@@ -91,7 +95,7 @@ def populate_skills(db=None):
     try:
         for skill_data in skills_data:
             # Check if skill already exists
-            existing_skill = db.query(models.Skill).filter(models.Skill.name == skill_data["name"]).first()
+            existing_skill = db.query(models.Skill).filter(models.Skill.name_key == models.normalize_name_key(skill_data["name"])).first()
             if not existing_skill:
                 skill = models.Skill(**skill_data)
                 db.add(skill)
@@ -99,21 +103,23 @@ def populate_skills(db=None):
         
         if should_close:
             db.commit()
-            print(f"Successfully populated {skills_added} skills!")
+            logger.info("Successfully populated %s skills!", skills_added)
             
-            # Print all skills by category
+            # List all skills by category
             all_skills = db.query(models.Skill).order_by(models.Skill.category, models.Skill.name).all()
             current_category = None
+            lines = []
             for skill in all_skills:
                 if skill.category != current_category:
                     current_category = skill.category
-                    print(f"\n{current_category}:")
-                print(f"  - {skill.name}")
+                    lines.append(f"\n{current_category}:")
+                lines.append(f"  - {skill.name}")
+            logger.info("%s", "\n".join(lines))
                 
     except Exception as e:
         if should_close:
             db.rollback()
-            print(f"Error populating skills: {e}")
+            logger.error("Error populating skills: %s", e)
         else:
             raise e
     finally:
@@ -123,4 +129,5 @@ def populate_skills(db=None):
     return skills_added
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     populate_skills()
\ No newline at end of file
@@ -3,6 +3,7 @@
 Script to populate the database with sample startup data
 """
 
+import logging
 import sys
 import os
 
@@ -11,6 +12,9 @@ backend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend
 sys.path.insert(0, backend_path)
 
 import models
+import logging_setup
+
+logger = logging.getLogger("populate_startups")
 
 def populate_startups(db):
     """Populate sample startup data"""
@@ -57,7 +61,7 @@ def populate_startups(db):
     startup_ids = []
     
     for startup_data in startups_data:
-        existing_startup = db.query(models.Startup).filter(models.Startup.name == startup_data["name"]).first()
+        existing_startup = db.query(models.Startup).filter(models.Startup.name_key == models.normalize_name_key(startup_data["name"])).first()
         if not existing_startup:
             startup = models.Startup(**startup_data)
             db.add(startup)
@@ -70,6 +74,7 @@ def populate_startups(db):
     return startups_added, startup_ids
 
 if __name__ == "__main__":
+    logging_setup.setup_logging(default_format="console")
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
     
@@ -88,10 +93,10 @@ if __name__ == "__main__":
     try:
         startups_added, startup_ids = populate_startups(db)
         db.commit()
-        print(f"✅ Successfully added {startups_added} new startups to the database!")
-        print(f"Startup IDs: {startup_ids}")
+        logger.info("✅ Successfully added %s new startups to the database!", startups_added)
+        logger.info("Startup IDs: %s", startup_ids)
     except Exception as e:
         db.rollback()
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
     finally:
         db.close()
\ No newline at end of file
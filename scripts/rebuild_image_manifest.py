@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Rebuild the stored_images manifest from the upload store.
+
+Lists the store once (UPLOAD_DIR, or the S3 bucket with STORAGE_BACKEND=s3), adds a row for
+every original that has none, and recounts founder references for every row. Run it once
+after `alembic upgrade head` creates the table, and any time files were added or removed
+outside the API. Rows whose file is gone are reported, and deleted with --prune-missing.
+
+Usage:
+    python scripts/rebuild_image_manifest.py [--prune-missing]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add backend to path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend')
+sys.path.insert(0, backend_path)
+
+import crud
+import database
+import logging_setup
+import models
+import storage
+import uploads
+
+logger = logging.getLogger("rebuild_image_manifest")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prune-missing", action="store_true", help="delete manifest rows whose file no longer exists")
+    args = parser.parse_args()
+    logging_setup.setup_logging(default_format="console")
+
+    db = database.SessionLocal()
+    try:
+        stored = {obj.key: obj for obj in storage.backend.list() if uploads.SAFE_FILENAME.match(obj.key)}
+        known = {filename for (filename,) in db.query(models.StoredImage.filename)}
+
+        added = 0
+        for key in sorted(stored.keys() - known):
+            match = uploads.CONTENT_ADDRESSED_NAME.match(key)
+            crud.record_stored_image(
+                db, key, uploads.upload_url(key), stored[key].size,
+                match.group(1) if match else None, uploads.content_type_for(key),
+            )
+            added += 1
+        logger.info("📦 %s file(s) in storage, %s added to the manifest", len(stored), added)
+
+        missing = []
+        for image in db.query(models.StoredImage).order_by(models.StoredImage.filename):
+            crud.sync_image_refs(db, image.url)
+            if image.filename not in stored:
+                missing.append(image)
+        db.commit()
+
+        for image in missing:
+            logger.error("❌ %s is in the manifest but not in storage (%s reference(s))", image.filename, image.ref_count)
+            if args.prune_missing:
+                db.delete(image)
+        db.commit()
+        logger.info("✅ Reference counts refreshed; %s missing file(s)%s", len(missing), " pruned" if args.prune_missing and missing else "")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
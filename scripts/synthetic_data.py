@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic founders, startups, skills, hobbies, help requests and events at any scale.
+
+Every table is generated from its own RNG stream (seed + table name), so a given seed and
+founder count always produce the same rows, and rows are streamed rather than held in memory.
+Ids are assigned here, above the current maximum of each table, so links between tables need
+no round-trips. Used by benchmarks/endpoint_suite.py and `bulk_populate.py --synthetic N`.
+
+Usage (as a library):
+    from synthetic_data import SyntheticDataset, write_dataset
+    write_dataset(engine, SyntheticDataset(10_000, seed=42))
+"""
+
+import csv
+import io
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Add backend to path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, backend_path)
+
+from sqlalchemy import func, select, text
+import models
+
+FIRST_NAMES = [
+    "Sarah", "Alex", "Maria", "James", "Priya", "Wei", "Fatima", "Diego", "Olivia", "Noah", "Aisha", "Liam",
+    "Sofia", "Ethan", "Yuki", "Mateo", "Amara", "Lucas", "Chloe", "Omar", "Hannah", "Ravi", "Elena", "Kwame",
+]
+LAST_NAMES = [
+    "Chen", "Thompson", "Garcia", "Patel", "Kim", "Nguyen", "Okafor", "Rossi", "Schmidt", "Silva", "Cohen",
+    "Haddad", "Ivanova", "Johnson", "Kowalski", "Larsen", "Martin", "Nakamura", "Osei", "Park", "Singh",
+]
+CITIES = [
+    "San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA", "Los Angeles, CA",
+    "Denver, CO", "Chicago, IL", "Miami, FL", "Toronto, ON", "London, UK", "Berlin, DE", "Remote",
+]
+INDUSTRIES = ["Climate Tech", "Developer Tools", "Healthcare", "EdTech", "Fintech", "E-commerce", "AI/ML", "Biotech", "Consumer", "Logistics"]
+STAGES = ["Idea", "MVP", "Pre-seed", "Seed", "Series A", "Series B"]
+REVENUE = ["Pre-revenue", "$10K", "$50K", "$250K", "$1M", "$5M"]
+MARKETS = ["SMBs", "Enterprise IT teams", "Consumers", "Hospitals", "Universities", "Developers", "Retailers"]
+NAME_PARTS = (
+    ["Eco", "Dev", "Health", "Edu", "Fin", "Data", "Cloud", "Bio", "Green", "Quantum", "Pixel", "Smart", "Open", "Bright"],
+    ["Track", "Flow", "Link", "Mentor", "Stack", "Forge", "Pulse", "Nest", "Wave", "Loop", "Labs", "Works", "Hub", "Base"],
+)
+SKILL_AREAS = {
+    "Technical": ["Python", "React", "Machine Learning", "DevOps", "Data Engineering", "Mobile", "Security", "Cloud Architecture"],
+    "Business": ["Fundraising", "Sales", "Pricing", "Operations", "Hiring", "Legal", "Finance", "Partnerships"],
+    "Marketing": ["Growth", "SEO", "Content", "Brand", "Community", "Paid Acquisition", "PR", "Product Marketing"],
+    "Design": ["UX Research", "UI Design", "Prototyping", "Design Systems"],
+}
+HOBBY_AREAS = {
+    "Sports": ["Basketball", "Pickleball", "Tennis", "Running", "Cycling", "Climbing", "Surfing"],
+    "Games": ["Poker", "Chess", "Board Games", "Video Games"],
+    "Outdoor": ["Hiking", "Camping", "Skiing", "Sailing"],
+    "Arts": ["Guitar", "Painting", "Photography", "Dancing", "Writing"],
+}
+HELP_CATEGORIES = ["Technical", "Marketing", "Funding", "Legal", "Hiring", "Product"]
+HELP_TOPICS = ["Need help scaling our {}", "Looking for advice on {}", "Intro wanted: {}", "Feedback on our {}"]
+HELP_SUBJECTS = ["database", "pricing page", "seed round", "GTM plan", "first sales hire", "onboarding flow", "SOC 2 audit"]
+URGENCIES = ["Low", "Medium", "High"]
+STATUSES = ["Open", "Open", "In Progress", "Resolved"]
+EVENT_THEMES = ["hiking", "poker", "basketball", "pickleball", "roundtable", "group dinner"]
+
+def default_counts(founders: int) -> Dict[str, int]:
+    """Row counts proportional to the number of founders."""
+    return {
+        "startups": max(1, founders // 3),
+        "skills": max(40, founders // 100),
+        "hobbies": max(30, founders // 200),
+        "help_requests": founders // 2,
+        "events": max(1, founders // 50),
+        "skills_per_founder": 3,
+        "hobbies_per_founder": 2,
+    }
+
+def _catalog_name(areas: Dict[str, List[str]], index: int) -> Tuple[str, str]:
+    """(name, category) for the index-th catalog entry; names repeat with a numeric suffix once exhausted."""
+    flat = [(name, category) for category, names in areas.items() for name in names]
+    name, category = flat[index % len(flat)]
+    return (name if index < len(flat) else f"{name} {index // len(flat) + 1}"), category
+
+class SyntheticDataset:
+    """Deterministic rows for every table, generated lazily."""
+
+    def __init__(self, founders: int, seed: int = 42, id_offsets: Optional[Dict[str, int]] = None, counts: Optional[Dict[str, int]] = None):
+        self.founders = founders
+        self.seed = seed
+        self.counts = {**default_counts(founders), **(counts or {})}
+        # Existing max id per table; generated ids start above it
+        self.offsets = id_offsets or {}
+        self.now = datetime(2025, 1, 1)
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{self.offsets.get(table, 0)}")
+
+    def _ids(self, table: str, count: int) -> range:
+        start = self.offsets.get(table, 0) + 1
+        return range(start, start + count)
+
+    def skills(self) -> Iterator[dict]:
+        rng = self._rng("skills")
+        for index, skill_id in enumerate(self._ids("skills", self.counts["skills"]), self.offsets.get("skills", 0)):
+            name, category = _catalog_name(SKILL_AREAS, index)
+            yield {"id": skill_id, "name": name, "name_key": models.normalize_name_key(name), "category": category,
+                   "description": f"{name} ({rng.choice(['beginner', 'practitioner', 'expert'])} level)"}
+
+    def hobbies(self) -> Iterator[dict]:
+        for index, hobby_id in enumerate(self._ids("hobbies", self.counts["hobbies"]), self.offsets.get("hobbies", 0)):
+            name, category = _catalog_name(HOBBY_AREAS, index)
+            yield {"id": hobby_id, "name": name, "name_key": models.normalize_name_key(name), "category": category, "description": None}
+
+    def startups(self) -> Iterator[dict]:
+        rng = self._rng("startups")
+        for startup_id in self._ids("startups", self.counts["startups"]):
+            name = f"{rng.choice(NAME_PARTS[0])}{rng.choice(NAME_PARTS[1])} {startup_id}"
+            industry = rng.choice(INDUSTRIES)
+            yield {
+                "id": startup_id, "name": name, "name_key": models.normalize_name_key(name),
+                "description": f"{industry} platform for {rng.choice(MARKETS).lower()}",
+                "industry": industry, "stage": rng.choice(STAGES),
+                "website_url": f"https://{name.replace(' ', '').lower()}.example.com",
+                "target_market": rng.choice(MARKETS), "revenue_arr": rng.choice(REVENUE),
+            }
+
+    def founder_row(self, founder_id: int, rng: random.Random) -> dict:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        handle = f"{first}{last}{founder_id}".lower()
+        startups = self._ids("startups", self.counts["startups"])
+        email = f"{first}.{last}.{founder_id}@founders.example.com".lower()
+        return {
+            "id": founder_id, "name": f"{first} {last}", "email": email, "email_normalized": models.normalize_email(email),
+            "bio": f"Building in {rng.choice(INDUSTRIES).lower()}; previously at {rng.choice(NAME_PARTS[0])}{rng.choice(NAME_PARTS[1])}.",
+            "location": rng.choice(CITIES),
+            "linkedin_url": f"https://www.linkedin.com/in/{handle}",
+            "twitter_url": f"https://twitter.com/{handle}" if rng.random() < 0.5 else None,
+            "github_url": f"https://github.com/{handle}" if rng.random() < 0.3 else None,
+            "profile_image_url": None,
+            "profile_visible": rng.random() < 0.9,
+            "auth0_user_id": None,
+            "startup_id": rng.choice(startups) if rng.random() < 0.7 else None,
+        }
+
+    def founders_rows(self) -> Iterator[dict]:
+        rng = self._rng("founders")
+        for founder_id in self._ids("founders", self.founders):
+            yield self.founder_row(founder_id, rng)
+
+    def _links(self, table: str, targets: range, per_founder: int) -> Iterator[dict]:
+        rng = self._rng(table)
+        key = "skill_id" if table == "founder_skills" else "hobby_id"
+        for founder_id in self._ids("founders", self.founders):
+            for target_id in rng.sample(targets, min(per_founder, len(targets))):
+                yield {"founder_id": founder_id, key: target_id}
+
+    def founder_skills(self) -> Iterator[dict]:
+        return self._links("founder_skills", self._ids("skills", self.counts["skills"]), self.counts["skills_per_founder"])
+
+    def founder_hobbies(self) -> Iterator[dict]:
+        return self._links("founder_hobbies", self._ids("hobbies", self.counts["hobbies"]), self.counts["hobbies_per_founder"])
+
+    def help_requests(self) -> Iterator[dict]:
+        rng = self._rng("help_requests")
+        founders = self._ids("founders", self.founders)
+        for request_id in self._ids("help_requests", self.counts["help_requests"]):
+            subject = rng.choice(HELP_SUBJECTS)
+            yield {
+                "id": request_id, "founder_id": rng.choice(founders),
+                "title": rng.choice(HELP_TOPICS).format(subject),
+                "description": f"We are working on our {subject} and would love to talk to someone who has done it before.",
+                "category": rng.choice(HELP_CATEGORIES), "urgency": rng.choice(URGENCIES), "status": rng.choice(STATUSES),
+            }
+
+    def events(self) -> Iterator[dict]:
+        rng = self._rng("events")
+        for event_id in self._ids("events", self.counts["events"]):
+            theme = rng.choice(EVENT_THEMES)
+            yield {
+                "id": event_id, "title": f"Founder {theme} #{event_id}", "description": f"Monthly {theme} meetup",
+                "date_time": self.now + timedelta(days=rng.randint(-365, 180), hours=rng.randint(8, 20)),
+                "location": rng.choice(CITIES),
+                "attendees": ", ".join(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(rng.randint(3, 12))),
+                "theme": theme, "link": f"https://lu.ma/synthetic-{event_id}",
+            }
+
+    def tables(self) -> List[Tuple[object, Callable[[], Iterator[dict]]]]:
+        """(Table, row generator) pairs in foreign-key order."""
+        return [
+            (models.Skill.__table__, self.skills),
+            (models.Hobby.__table__, self.hobbies),
+            (models.Startup.__table__, self.startups),
+            (models.Founder.__table__, self.founders_rows),
+            (models.founder_skills, self.founder_skills),
+            (models.founder_hobbies, self.founder_hobbies),
+            (models.HelpRequest.__table__, self.help_requests),
+            (models.Event.__table__, self.events),
+        ]
+
+    def upload_csv(self, batch: int, rows: int = 50) -> bytes:
+        """CSV body for POST /founders/upload-csv with founders not in the dataset (unique per batch)."""
+        rng = random.Random(f"{self.seed}:csv:{batch}")
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["Name", "Email", "LinkedIn URL", "Location", "Startup Name", "Where are you now (stage)?"])
+        for row in range(rows):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            handle = f"csv-{self.seed}-{batch}-{row}"
+            writer.writerow([f"{first} {last}", f"{handle}@upload.example.com", f"https://www.linkedin.com/in/{handle}",
+                             rng.choice(CITIES), f"Upload {handle}", rng.choice(STAGES)])
+        return out.getvalue().encode()
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def current_max_ids(engine) -> Dict[str, int]:
+    """Highest id per table, so a dataset can be added to a database that already has rows."""
+    with engine.connect() as conn:
+        return {
+            table.name: conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar()
+            for table in (models.Skill.__table__, models.Hobby.__table__, models.Startup.__table__,
+                          models.Founder.__table__, models.HelpRequest.__table__, models.Event.__table__)
+        }
+
+def reset_sequences(conn, tables):
+    """Move Postgres id sequences past the explicitly inserted ids."""
+    for table in tables:
+        if "id" in table.c and table.c.id.primary_key:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+            ))
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+def _copy_batches(conn, table, batches: Iterator[List[dict]]) -> Iterator[int]:
+    """Postgres (psycopg2): stream each batch through COPY ... FROM STDIN as CSV."""
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        for batch in batches:
+            columns = list(batch[0])
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([_copy_value(row[column]) for column in columns] for row in batch)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+            yield len(batch)
+    finally:
+        cursor.close()
+
+def _executemany_batches(conn, table, batches: Iterator[List[dict]]) -> Iterator[int]:
+    """SQLite: plain DB-API executemany with tuples, skipping per-row Core parameter processing."""
+    for batch in batches:
+        columns = list(batch[0])
+        sql = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        conn.exec_driver_sql(sql, [tuple(row[column] for column in columns) for row in batch])
+        yield len(batch)
+
+def _core_batches(conn, table, batches: Iterator[List[dict]]) -> Iterator[int]:
+    for batch in batches:
+        conn.execute(table.insert(), batch)
+        yield len(batch)
+
+def write_dataset(engine, dataset: SyntheticDataset, batch_size: int = 50_000, progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """Insert every table in one transaction; returns rows written per table.
+
+    Postgres with psycopg2 loads through COPY, SQLite through executemany, anything else through
+    Core inserts, all in batches of `batch_size`. `progress(table, rows so far)` runs per batch.
+    """
+    if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2":
+        writer = _copy_batches
+    elif engine.dialect.name == "sqlite":
+        writer = _executemany_batches
+    else:
+        writer = _core_batches
+    written = {}
+    with engine.begin() as conn:
+        for table, rows in dataset.tables():
+            count = 0
+            for rows_written in writer(conn, table, _batches(rows(), batch_size)):
+                count += rows_written
+                if progress:
+                    progress(table.name, count)
+            written[table.name] = count
+        if engine.dialect.name == "postgresql":
+            reset_sequences(conn, [table for table, _ in dataset.tables()])
+    return written